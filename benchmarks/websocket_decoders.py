@@ -0,0 +1,70 @@
+"""Compare the generated websocket message decoders with dacite on recorded Lavalink v4 payloads.
+
+Run with ``python benchmarks/websocket_decoders.py [iterations]`` from an environment where PyLav is installed.
+"""
+
+from __future__ import annotations
+
+import sys
+import timeit
+
+from dacite import from_dict
+
+from pylav.compat import json
+from pylav.nodes.api.decoders import EVENT_DECODERS, PLAYER_UPDATE_DECODER, READY_DECODER, STATS_DECODER, Decoder
+
+_TRACK = (
+    '{"encoded":"QAAAjQIAJVJpY2sgQXN0bGV5IC0gTmV2ZXIgR29ubmEgR2l2ZSBZb3UgVXAADlJpY2tBc3RsZXlWRVZPAAAAAAADPCAAC2RRd'
+    'zR3OVdnWGNRAAEAK2h0dHBzOi8vd3d3LnlvdXR1YmUuY29tL3dhdGNoP3Y9ZFF3NHc5V2dYY1EAB3lvdXR1YmUAAAAAAAAAAA==",'
+    '"info":{"identifier":"dQw4w9WgXcQ","isSeekable":true,"author":"RickAstleyVEVO","length":212000,'
+    '"isStream":false,"position":0,"title":"Rick Astley - Never Gonna Give You Up",'
+    '"uri":"https://www.youtube.com/watch?v=dQw4w9WgXcQ",'
+    '"artworkUrl":"https://i.ytimg.com/vi/dQw4w9WgXcQ/maxresdefault.jpg","isrc":null,"sourceName":"youtube"},'
+    '"pluginInfo":{},"userData":{}}'
+)
+
+PAYLOADS: dict[str, tuple[Decoder, str]] = {
+    "playerUpdate": (
+        PLAYER_UPDATE_DECODER,
+        '{"op":"playerUpdate","guildId":"817089356421857280",'
+        '"state":{"time":1500467109,"position":60000,"connected":true,"ping":50}}',
+    ),
+    "stats": (
+        STATS_DECODER,
+        '{"op":"stats","players":1,"playingPlayers":1,"uptime":123456789,'
+        '"memory":{"free":123456789,"used":123456789,"allocated":123456789,"reservable":123456789},'
+        '"cpu":{"cores":4,"systemLoad":0.5,"lavalinkLoad":0.5},"frameStats":{"sent":6000,"nulled":10,"deficit":-3010}}',
+    ),
+    "ready": (READY_DECODER, '{"op":"ready","resumed":false,"sessionId":"la3kfsdf5eafe848"}'),
+    "TrackStartEvent": (
+        EVENT_DECODERS["TrackStartEvent"],
+        f'{{"op":"event","type":"TrackStartEvent","guildId":"817089356421857280","track":{_TRACK}}}',
+    ),
+    "TrackEndEvent": (
+        EVENT_DECODERS["TrackEndEvent"],
+        f'{{"op":"event","type":"TrackEndEvent","guildId":"817089356421857280","track":{_TRACK},"reason":"finished"}}',
+    ),
+    "WebSocketClosedEvent": (
+        EVENT_DECODERS["WebSocketClosedEvent"],
+        '{"op":"event","type":"WebSocketClosedEvent","guildId":"817089356421857280","code":4006,'
+        '"reason":"Your session is no longer valid.","byRemote":true}',
+    ),
+}
+
+
+def main(iterations: int = 20000) -> None:
+    print(f"{'message':<24}{'dacite (us)':>14}{'generated (us)':>16}{'speedup':>10}")
+    for name, (decoder, payload) in PAYLOADS.items():
+        data = json.loads(payload)
+        if decoder(data) != from_dict(data_class=decoder.data_class, data=data):
+            raise AssertionError(f"The decoders disagree on {name}")
+        dacite_time = timeit.timeit(lambda: from_dict(data_class=decoder.data_class, data=data), number=iterations)
+        generated_time = timeit.timeit(lambda: decoder(data), number=iterations)
+        print(
+            f"{name:<24}{dacite_time / iterations * 1e6:>14.2f}{generated_time / iterations * 1e6:>16.2f}"
+            f"{dacite_time / generated_time:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:2]))
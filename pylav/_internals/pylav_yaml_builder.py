@@ -17,6 +17,7 @@ LOGGER = getLogger("PyLav.Environment")
 
 def build_from_envvars() -> None:
     from pylav.constants.config.env_var import (
+        COMPACT_PLAYER_STATE,
         DATA_FOLDER,
         DEFAULT_SEARCH_SOURCE,
         EXTERNAL_UNMANAGED_HOST,
@@ -34,12 +35,18 @@ def build_from_envvars() -> None:
         MANAGED_NODE_SPOTIFY_CLIENT_SECRET,
         MANAGED_NODE_SPOTIFY_COUNTRY_CODE,
         MANAGED_NODE_YANDEX_MUSIC_ACCESS_TOKEN,
+        NODE_MAX_CONCURRENT_LOADS,
+        PLAYER_RESTORE_CONCURRENCY,
+        PLAYER_RESTORE_NODE_RATE,
         POSTGRES_DATABASE,
         POSTGRES_PASSWORD,
         POSTGRES_PORT,
         POSTGRES_SOCKET,
         POSTGRES_USER,
+        QUERY_CACHE_MEMORY_SIZE_MB,
         READ_CACHING_ENABLED,
+        READ_CACHING_MAX_SIZE_MB,
+        READ_CACHING_SHARED_ADDRESS,
         REDIS_FULL_ADDRESS_RESPONSE_CACHE,
         TASK_TIMER_UPDATE_BUNDLED_EXTERNAL_PLAYLISTS_DAYS,
         TASK_TIMER_UPDATE_BUNDLED_PLAYLISTS_DAYS,
@@ -68,6 +75,13 @@ def build_from_envvars() -> None:
         "PYLAV__TASK_TIMER_UPDATE_BUNDLED_EXTERNAL_PLAYLISTS_DAYS": TASK_TIMER_UPDATE_BUNDLED_EXTERNAL_PLAYLISTS_DAYS,
         "PYLAV__TASK_TIMER_UPDATE_EXTERNAL_PLAYLISTS_DAYS": TASK_TIMER_UPDATE_EXTERNAL_PLAYLISTS_DAYS,
         "PYLAV__READ_CACHING_ENABLED": READ_CACHING_ENABLED,
+        "PYLAV__READ_CACHING_MAX_SIZE_MB": READ_CACHING_MAX_SIZE_MB,
+        "PYLAV__READ_CACHING_SHARED_ADDRESS": READ_CACHING_SHARED_ADDRESS,
+        "PYLAV__QUERY_CACHE_MEMORY_SIZE_MB": QUERY_CACHE_MEMORY_SIZE_MB,
+        "PYLAV__NODE_MAX_CONCURRENT_LOADS": NODE_MAX_CONCURRENT_LOADS,
+        "PYLAV__COMPACT_PLAYER_STATE": COMPACT_PLAYER_STATE,
+        "PYLAV__PLAYER_RESTORE_CONCURRENCY": PLAYER_RESTORE_CONCURRENCY,
+        "PYLAV__PLAYER_RESTORE_NODE_RATE": PLAYER_RESTORE_NODE_RATE,
         "PYLAV__DEFAULT_SEARCH_SOURCE": DEFAULT_SEARCH_SOURCE,
         "PYLAV__MANAGED_NODE_SPOTIFY_CLIENT_ID": MANAGED_NODE_SPOTIFY_CLIENT_ID,
         "PYLAV__MANAGED_NODE_SPOTIFY_CLIENT_SECRET": MANAGED_NODE_SPOTIFY_CLIENT_SECRET,
@@ -34,6 +34,7 @@ if not ENV_FILE.exists():
         ENV_FILE,
     )
     build_from_envvars()
+    from pylav.constants.config.env_var import COMPACT_PLAYER_STATE as COMPACT_PLAYER_STATE
     from pylav.constants.config.env_var import DATA_FOLDER as DATA_FOLDER
     from pylav.constants.config.env_var import DEFAULT_PLAYER_VOLUME as DEFAULT_PLAYER_VOLUME
     from pylav.constants.config.env_var import DEFAULT_SEARCH_SOURCE as DEFAULT_SEARCH_SOURCE
@@ -57,6 +58,9 @@ if not ENV_FILE.exists():
     from pylav.constants.config.env_var import (
         MANAGED_NODE_YANDEX_MUSIC_ACCESS_TOKEN as MANAGED_NODE_YANDEX_MUSIC_ACCESS_TOKEN,
     )
+    from pylav.constants.config.env_var import NODE_MAX_CONCURRENT_LOADS as NODE_MAX_CONCURRENT_LOADS
+    from pylav.constants.config.env_var import PLAYER_RESTORE_CONCURRENCY as PLAYER_RESTORE_CONCURRENCY
+    from pylav.constants.config.env_var import PLAYER_RESTORE_NODE_RATE as PLAYER_RESTORE_NODE_RATE
     from pylav.constants.config.env_var import POSTGRES_CONNECTIONS as POSTGRES_CONNECTIONS
     from pylav.constants.config.env_var import POSTGRES_DATABASE as POSTGRES_DATABASE
     from pylav.constants.config.env_var import POSTGRES_HOST as POSTGRES_HOST
@@ -64,7 +68,10 @@ if not ENV_FILE.exists():
     from pylav.constants.config.env_var import POSTGRES_PORT as POSTGRES_PORT
     from pylav.constants.config.env_var import POSTGRES_SOCKET as POSTGRES_SOCKET
     from pylav.constants.config.env_var import POSTGRES_USER as POSTGRES_USER
+    from pylav.constants.config.env_var import QUERY_CACHE_MEMORY_SIZE_MB as QUERY_CACHE_MEMORY_SIZE_MB
     from pylav.constants.config.env_var import READ_CACHING_ENABLED as READ_CACHING_ENABLED
+    from pylav.constants.config.env_var import READ_CACHING_MAX_SIZE_MB as READ_CACHING_MAX_SIZE_MB
+    from pylav.constants.config.env_var import READ_CACHING_SHARED_ADDRESS as READ_CACHING_SHARED_ADDRESS
     from pylav.constants.config.env_var import REDIS_FULL_ADDRESS_RESPONSE_CACHE as REDIS_FULL_ADDRESS_RESPONSE_CACHE
     from pylav.constants.config.env_var import (
         TASK_TIMER_UPDATE_BUNDLED_EXTERNAL_PLAYLISTS_DAYS as TASK_TIMER_UPDATE_BUNDLED_EXTERNAL_PLAYLISTS_DAYS,
@@ -80,6 +87,7 @@ else:
     LOGGER.info("%s exist - Environment variables will be read from it", ENV_FILE)
     # Apply environment variables overrides if they exist
     from pylav.constants.config import overrides
+    from pylav.constants.config.file import COMPACT_PLAYER_STATE as COMPACT_PLAYER_STATE
     from pylav.constants.config.file import DATA_FOLDER as DATA_FOLDER
     from pylav.constants.config.file import DEFAULT_PLAYER_VOLUME as DEFAULT_PLAYER_VOLUME
     from pylav.constants.config.file import DEFAULT_SEARCH_SOURCE as DEFAULT_SEARCH_SOURCE
@@ -103,6 +111,9 @@ else:
     from pylav.constants.config.file import (
         MANAGED_NODE_YANDEX_MUSIC_ACCESS_TOKEN as MANAGED_NODE_YANDEX_MUSIC_ACCESS_TOKEN,
     )
+    from pylav.constants.config.file import NODE_MAX_CONCURRENT_LOADS as NODE_MAX_CONCURRENT_LOADS
+    from pylav.constants.config.file import PLAYER_RESTORE_CONCURRENCY as PLAYER_RESTORE_CONCURRENCY
+    from pylav.constants.config.file import PLAYER_RESTORE_NODE_RATE as PLAYER_RESTORE_NODE_RATE
     from pylav.constants.config.file import POSTGRES_CONNECTIONS as POSTGRES_CONNECTIONS
     from pylav.constants.config.file import POSTGRES_DATABASE as POSTGRES_DATABASE
     from pylav.constants.config.file import POSTGRES_HOST as POSTGRES_HOST
@@ -110,7 +121,10 @@ else:
     from pylav.constants.config.file import POSTGRES_PORT as POSTGRES_PORT
     from pylav.constants.config.file import POSTGRES_SOCKET as POSTGRES_SOCKET
     from pylav.constants.config.file import POSTGRES_USER as POSTGRES_USER
+    from pylav.constants.config.file import QUERY_CACHE_MEMORY_SIZE_MB as QUERY_CACHE_MEMORY_SIZE_MB
     from pylav.constants.config.file import READ_CACHING_ENABLED as READ_CACHING_ENABLED
+    from pylav.constants.config.file import READ_CACHING_MAX_SIZE_MB as READ_CACHING_MAX_SIZE_MB
+    from pylav.constants.config.file import READ_CACHING_SHARED_ADDRESS as READ_CACHING_SHARED_ADDRESS
     from pylav.constants.config.file import REDIS_FULL_ADDRESS_RESPONSE_CACHE as REDIS_FULL_ADDRESS_RESPONSE_CACHE
     from pylav.constants.config.file import (
         TASK_TIMER_UPDATE_BUNDLED_EXTERNAL_PLAYLISTS_DAYS as TASK_TIMER_UPDATE_BUNDLED_EXTERNAL_PLAYLISTS_DAYS,
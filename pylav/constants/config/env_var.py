@@ -42,6 +42,13 @@ EXTERNAL_UNMANAGED_SSL = bool(int(os.getenv("PYLAV__EXTERNAL_UNMANAGED_SSL", 0))
 EXTERNAL_UNMANAGED_NAME = os.getenv("PYLAV__EXTERNAL_UNMANAGED_NAME") or "ENVAR Node (Unmanaged)"
 
 READ_CACHING_ENABLED = bool(int(os.getenv("PYLAV__READ_CACHING_ENABLED", "0")))
+READ_CACHING_MAX_SIZE_MB = max(int(os.getenv("PYLAV__READ_CACHING_MAX_SIZE_MB", "128")), 1)
+READ_CACHING_SHARED_ADDRESS = os.getenv("PYLAV__READ_CACHING_SHARED_ADDRESS")
+QUERY_CACHE_MEMORY_SIZE_MB = max(int(os.getenv("PYLAV__QUERY_CACHE_MEMORY_SIZE_MB", "64")), 0)
+NODE_MAX_CONCURRENT_LOADS = max(int(os.getenv("PYLAV__NODE_MAX_CONCURRENT_LOADS", "8")), 1)
+COMPACT_PLAYER_STATE = bool(int(os.getenv("PYLAV__COMPACT_PLAYER_STATE", "0")))
+PLAYER_RESTORE_CONCURRENCY = max(int(os.getenv("PYLAV__PLAYER_RESTORE_CONCURRENCY", "10")), 1)
+PLAYER_RESTORE_NODE_RATE = max(float(os.getenv("PYLAV__PLAYER_RESTORE_NODE_RATE", "5")), 0.1)
 
 TASK_TIMER_UPDATE_BUNDLED_PLAYLISTS_DAYS = max(
     int(os.getenv("PYLAV__TASK_TIMER_UPDATE_BUNDLED_PLAYLISTS_DAYS", "1")), 1
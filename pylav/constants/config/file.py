@@ -65,6 +65,27 @@ if (REDIS_FULL_ADDRESS_RESPONSE_CACHE := data.get("PYLAV__REDIS_FULL_ADDRESS_RES
 if (READ_CACHING_ENABLED := data.get("PYLAV__READ_CACHING_ENABLED")) is None:
     READ_CACHING_ENABLED = bool(int(os.getenv("PYLAV__READ_CACHING_ENABLED", "0")))
     data_new["PYLAV__READ_CACHING_ENABLED"] = READ_CACHING_ENABLED
+if (READ_CACHING_MAX_SIZE_MB := data.get("PYLAV__READ_CACHING_MAX_SIZE_MB")) is None:
+    READ_CACHING_MAX_SIZE_MB = max(int(os.getenv("PYLAV__READ_CACHING_MAX_SIZE_MB", "128")), 1)
+    data_new["PYLAV__READ_CACHING_MAX_SIZE_MB"] = READ_CACHING_MAX_SIZE_MB
+if (READ_CACHING_SHARED_ADDRESS := data.get("PYLAV__READ_CACHING_SHARED_ADDRESS")) is None:
+    READ_CACHING_SHARED_ADDRESS = os.getenv("PYLAV__READ_CACHING_SHARED_ADDRESS")
+    data_new["PYLAV__READ_CACHING_SHARED_ADDRESS"] = READ_CACHING_SHARED_ADDRESS
+if (QUERY_CACHE_MEMORY_SIZE_MB := data.get("PYLAV__QUERY_CACHE_MEMORY_SIZE_MB")) is None:
+    QUERY_CACHE_MEMORY_SIZE_MB = max(int(os.getenv("PYLAV__QUERY_CACHE_MEMORY_SIZE_MB", "64")), 0)
+    data_new["PYLAV__QUERY_CACHE_MEMORY_SIZE_MB"] = QUERY_CACHE_MEMORY_SIZE_MB
+if (NODE_MAX_CONCURRENT_LOADS := data.get("PYLAV__NODE_MAX_CONCURRENT_LOADS")) is None:
+    NODE_MAX_CONCURRENT_LOADS = max(int(os.getenv("PYLAV__NODE_MAX_CONCURRENT_LOADS", "8")), 1)
+    data_new["PYLAV__NODE_MAX_CONCURRENT_LOADS"] = NODE_MAX_CONCURRENT_LOADS
+if (COMPACT_PLAYER_STATE := data.get("PYLAV__COMPACT_PLAYER_STATE")) is None:
+    COMPACT_PLAYER_STATE = bool(int(os.getenv("PYLAV__COMPACT_PLAYER_STATE", "0")))
+    data_new["PYLAV__COMPACT_PLAYER_STATE"] = COMPACT_PLAYER_STATE
+if (PLAYER_RESTORE_CONCURRENCY := data.get("PYLAV__PLAYER_RESTORE_CONCURRENCY")) is None:
+    PLAYER_RESTORE_CONCURRENCY = max(int(os.getenv("PYLAV__PLAYER_RESTORE_CONCURRENCY", "10")), 1)
+    data_new["PYLAV__PLAYER_RESTORE_CONCURRENCY"] = PLAYER_RESTORE_CONCURRENCY
+if (PLAYER_RESTORE_NODE_RATE := data.get("PYLAV__PLAYER_RESTORE_NODE_RATE")) is None:
+    PLAYER_RESTORE_NODE_RATE = max(float(os.getenv("PYLAV__PLAYER_RESTORE_NODE_RATE", "5")), 0.1)
+    data_new["PYLAV__PLAYER_RESTORE_NODE_RATE"] = PLAYER_RESTORE_NODE_RATE
 if (JAVA_EXECUTABLE := data.get("PYLAV__JAVA_EXECUTABLE")) is None:
     JAVA_EXECUTABLE = _get_path(os.getenv("PYLAV__JAVA_EXECUTABLE") or "java")
     data_new["PYLAV__JAVA_EXECUTABLE"] = JAVA_EXECUTABLE
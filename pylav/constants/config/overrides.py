@@ -49,6 +49,25 @@ EXTERNAL_UNMANAGED_NAME = os.getenv("PYLAV__EXTERNAL_UNMANAGED_NAME")
 READ_CACHING_ENABLED = (
     bool(int(envar_value)) if (envar_value := os.getenv("PYLAV__READ_CACHING_ENABLED")) is not None else None
 )
+READ_CACHING_MAX_SIZE_MB = (
+    max(int(envar_value), 1) if (envar_value := os.getenv("PYLAV__READ_CACHING_MAX_SIZE_MB")) is not None else None
+)
+READ_CACHING_SHARED_ADDRESS = os.getenv("PYLAV__READ_CACHING_SHARED_ADDRESS")
+QUERY_CACHE_MEMORY_SIZE_MB = (
+    max(int(envar_value), 0) if (envar_value := os.getenv("PYLAV__QUERY_CACHE_MEMORY_SIZE_MB")) is not None else None
+)
+NODE_MAX_CONCURRENT_LOADS = (
+    max(int(envar_value), 1) if (envar_value := os.getenv("PYLAV__NODE_MAX_CONCURRENT_LOADS")) is not None else None
+)
+COMPACT_PLAYER_STATE = (
+    bool(int(envar_value)) if (envar_value := os.getenv("PYLAV__COMPACT_PLAYER_STATE")) is not None else None
+)
+PLAYER_RESTORE_CONCURRENCY = (
+    max(int(envar_value), 1) if (envar_value := os.getenv("PYLAV__PLAYER_RESTORE_CONCURRENCY")) is not None else None
+)
+PLAYER_RESTORE_NODE_RATE = (
+    max(float(envar_value), 0.1) if (envar_value := os.getenv("PYLAV__PLAYER_RESTORE_NODE_RATE")) is not None else None
+)
 
 TASK_TIMER_UPDATE_BUNDLED_PLAYLISTS_DAYS = (
     max(int(envar_value), 1)
@@ -33,3 +33,29 @@ EQ_BAND_MAPPING = {
 
 
 EPOCH_DT_TZ_AWARE = datetime.datetime(1970, 1, 1, tzinfo=datetime.UTC)
+
+# Number of random lookups made against the auto-play playlist to find a track that is not in the history
+AUTOPLAY_RANDOM_ATTEMPTS = 5
+
+# The idle checks of the players (auto pause, resume and disconnect) run when an event touches the player or when
+# one of its countdowns runs out, every player is also re-checked every PLAYER_CHECK_RECONCILE_INTERVAL seconds
+# to pick up config changes.
+PLAYER_CHECK_RECONCILE_INTERVAL = 60
+# Seconds before a countdown that ran out without its action going through is checked again
+PLAYER_CHECK_RETRY_DELAY = 1
+
+# Messages read from a node websocket waiting to be handled, the reads pause once this many are waiting
+WEBSOCKET_INBOX_SIZE = 1000
+
+# Events received for a guild with no player yet are held until the player is created, at most
+# WEBSOCKET_PENDING_EVENTS_PER_GUILD events for WEBSOCKET_PENDING_EVENTS_GUILDS guilds per node, for
+# WEBSOCKET_PENDING_EVENTS_TTL seconds.
+WEBSOCKET_PENDING_EVENTS_GUILDS = 500
+WEBSOCKET_PENDING_EVENTS_PER_GUILD = 10
+WEBSOCKET_PENDING_EVENTS_TTL = 30
+
+# Events are dispatched from one bounded queue per event type, each drained by EVENT_QUEUE_WORKERS workers
+EVENT_QUEUE_SIZE = 1000
+EVENT_QUEUE_WORKERS = 4
+# Seconds given to the event queues to drain on shutdown
+EVENT_QUEUE_SHUTDOWN_TIMEOUT = 5
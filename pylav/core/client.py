@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 import asyncio
+import collections
 import contextlib
 import datetime
-import itertools
 import operator
 import os
 import pathlib
@@ -49,7 +49,9 @@ from pylav.constants.config import (
     MANAGED_NODE_SPOTIFY_CLIENT_SECRET,
     MANAGED_NODE_SPOTIFY_COUNTRY_CODE,
     MANAGED_NODE_YANDEX_MUSIC_ACCESS_TOKEN,
+    NODE_MAX_CONCURRENT_LOADS,
     POSTGRES_CONNECTIONS,
+    READ_CACHING_ENABLED,
     REDIS_FULL_ADDRESS_RESPONSE_CACHE,
     TASK_TIMER_UPDATE_BUNDLED_EXTERNAL_PLAYLISTS_DAYS,
     TASK_TIMER_UPDATE_BUNDLED_PLAYLISTS_DAYS,
@@ -61,6 +63,11 @@ from pylav.constants.specials import PYLAV_SERVER_ID
 from pylav.core.bot_overrides import get_context, process_commands
 from pylav.core.context import PyLavContext
 from pylav.events.base import PyLavEvent
+from pylav.events.node import WebSocketClosedEvent
+from pylav.events.player import PlayerConnectedEvent, PlayerDisconnectedEvent, PlayerMovedEvent
+from pylav.events.queue import QueueEndEvent
+from pylav.events.track import TrackEndEvent, TrackExceptionEvent, TrackStuckEvent
+from pylav.events.track.track_start import TrackStartEvent
 from pylav.events.manager import DispatchManager
 from pylav.exceptions.client import AnotherClientAlreadyRegisteredException, PyLavInvalidArgumentsException
 from pylav.exceptions.node import NoNodeAvailableException, NoNodeWithRequestFunctionalityAvailableException
@@ -80,7 +87,7 @@ from pylav.nodes.node import Node
 from pylav.players.manager import PlayerController
 from pylav.players.player import Player
 from pylav.players.query.obj import Query
-from pylav.players.tracks.decoder import decode_track
+from pylav.players.tracks.decoder import decode_track, decode_tracks_local
 from pylav.players.tracks.obj import Track
 from pylav.storage.controllers.config import ConfigController
 from pylav.storage.controllers.equalizers import EqualizerController
@@ -90,6 +97,7 @@ from pylav.storage.controllers.players.config import PlayerConfigController
 from pylav.storage.controllers.players.states import PlayerStateController
 from pylav.storage.controllers.playlists import PlaylistController
 from pylav.storage.controllers.queries import QueryController
+from pylav.storage.database.cache.cache import INVALIDATION_BUS, SHARED_CACHE
 from pylav.storage.database.cache.model import CachedModel
 from pylav.storage.database.tables.misc import DATABASE_ENGINE, IS_POSTGRES
 from pylav.storage.models.config import Config
@@ -115,6 +123,19 @@ LOGGER = getLogger("PyLav.Client")
 CACHE = Cache("CLIENT")
 CACHE.setup("mem://?check_interval=10", size=1_000_000, enable=True)
 
+# The events that can start or stop the idle countdowns of their player
+_IDLE_CHECK_EVENTS = (
+    TrackStartEvent,
+    TrackEndEvent,
+    TrackStuckEvent,
+    TrackExceptionEvent,
+    QueueEndEvent,
+    WebSocketClosedEvent,
+    PlayerConnectedEvent,
+    PlayerMovedEvent,
+    PlayerDisconnectedEvent,
+)
+
 
 class Client(metaclass=SingletonClass):
     """
@@ -451,6 +472,8 @@ class Client(metaclass=SingletonClass):
                 await self._wait_until_ready()
                 if IS_POSTGRES:
                     await DATABASE_ENGINE.start_connection_pool(max_size=POSTGRES_CONNECTIONS)
+                    if READ_CACHING_ENABLED:
+                        await INVALIDATION_BUS.start()
                 (
                     spotify_client_id,
                     spotify_client_secret,
@@ -933,7 +956,7 @@ class Client(metaclass=SingletonClass):
             return decode_track(track)
 
     async def decode_tracks(
-        self, tracks: list, feature: str = None, raise_on_failure: bool = False
+        self, tracks: list, feature: str = None, raise_on_failure: bool = False, lazy: bool = False
     ) -> list[Track_namespace_conflict]:
         """|coro|
         Decodes a list of base64-encoded track strings into a dict.
@@ -946,12 +969,23 @@ class Client(metaclass=SingletonClass):
             The feature to decode the tracks for. Defaults to `None`.
         raise_on_failure: Optional[:class:`bool`]
             Whether to raise an exception if the tracks fail to decode. Defaults to `False`.
+        lazy: :class:`bool`
+            Weather to decode within the Bot and only send the tracks that failed to Lavalink. Defaults to `False`.
 
         Returns
         -------
         List[LavalinkTrackObject]
             A list of LavalinkTrackObject representing track information.
         """
+        if lazy:
+            decoded = await decode_tracks_local(tracks)
+            if failed := [track for track, result in zip(tracks, decoded) if result is None]:
+                remote = {
+                    track.encoded: track
+                    for track in await self.decode_tracks(failed, feature=feature, raise_on_failure=raise_on_failure)
+                }
+                decoded = [result or remote.get(track) for track, result in zip(tracks, decoded)]
+            return [track for track in decoded if track is not None]
         if not self.node_manager.available_nodes:
             raise NoNodeAvailableException(_("There are no available nodes!"))
         node = await self.node_manager.find_best_node(feature=feature)
@@ -968,11 +1002,7 @@ class Client(metaclass=SingletonClass):
                 raise TypeError
             return response
         except Exception:  # noqa
-            response_tracks = []
-            for track in tracks:
-                with contextlib.suppress(Exception):
-                    response_tracks.append(decode_track(track))
-            return response_tracks
+            return [track for track in await decode_tracks_local(tracks) if track is not None]
 
     @staticmethod
     async def routeplanner_status(node: Node) -> RoutePlannerStatus:
@@ -1019,35 +1049,9 @@ class Client(metaclass=SingletonClass):
 
     def dispatch_event(self, event: PyLavEvent) -> None:
         """Dispatches the given event to all registered hooks."""
-        asyncio.create_task(self._dispatch_event(event))
-
-    async def _dispatch_event(self, event: PyLavEvent) -> None:
-        """|coro|
-        Dispatches the given event to all registered hooks.
-
-        Parameters
-        ----------
-        event: :class:`Event`
-            The event to dispatch to the hooks.
-        """
-        event_dispatcher = [self._dispatch_manager.dispatch]
-
-        task_list = []
-        for hook in itertools.chain(
-            event_dispatcher,
-        ):
-            task = asyncio.create_task(hook(event))  # type: ignore
-            task.set_name(f"Event hook {hook.__name__}")
-            task.add_done_callback(self.__done_callback)
-            task_list.append(task)
-        await asyncio.gather(*task_list)
-
-    @staticmethod
-    def __done_callback(task: asyncio.Task) -> None:
-        if (exc := task.exception()) is not None:
-            name = task.get_name()
-            LOGGER.warning("Event hook %s encountered an exception!", name)
-            LOGGER.debug("Event hook %s encountered an exception!", name, exc_info=exc)
+        if isinstance(event, _IDLE_CHECK_EVENTS):
+            self._player_manager.schedule_checks(event.player.guild.id)
+        self._dispatch_manager.submit(event)
 
     async def unregister(self, cog: discord.ext.commands.Cog):
         """|coro|
@@ -1081,6 +1085,7 @@ class Client(metaclass=SingletonClass):
                         await self.player_manager.save_all_players()
                         await self.player_manager.shutdown()
                         await self._node_manager.close()
+                        await self._dispatch_manager.shutdown()
                         await self._local_node_manager.shutdown()
                         await self._session.close()
                         await self._cached_session.close()
@@ -1095,6 +1100,10 @@ class Client(metaclass=SingletonClass):
                     if self.__old_get_context is not None:
                         self.bot.get_context = self.__old_get_context
                     del self.bot._pylav_client  # noqa
+                    await INVALIDATION_BUS.stop()
+                    if SHARED_CACHE is not None:
+                        with contextlib.suppress(Exception):
+                            await SHARED_CACHE.close()
                     await DATABASE_ENGINE.close_connection_pool()
                     LOGGER.info("All cogs have been unregistered, PyLav client has been shutdown")
                     # self.__reload_pylav()
@@ -1307,6 +1316,8 @@ class Client(metaclass=SingletonClass):
         """High level interface to get and return all tracks for a list of queries.
 
         This will automatically handle playlists, albums, searches and local files.
+        Queries are resolved concurrently across the available nodes, up to ``PYLAV__NODE_MAX_CONCURRENT_LOADS``
+        loads in flight per node, while the returned tracks keep the order of the queries.
 
         Parameters
         ----------
@@ -1336,71 +1347,86 @@ class Client(metaclass=SingletonClass):
         successful_tracks = []
         queries_failed = []
         track_count = 0
-        for query in queries:
-            try:
-                track_count = await self._get_tracks_single_query(
-                    bypass_cache,
-                    enqueue,
-                    player,
-                    queries_failed,
-                    query,
-                    requester,
-                    successful_tracks,
-                    track_count,
+        pending: collections.deque[asyncio.Task[tuple[list[Track], int, list[Query]]]] = collections.deque()
+        window = NODE_MAX_CONCURRENT_LOADS * max(len(self.node_manager.available_nodes), 1)
+        try:
+            for query in queries:
+                try:
+                    async for sub_query in self._yield_recursive_queries(query):
+                        pending.append(
+                            asyncio.create_task(self._resolve_sub_query(bypass_cache, player, requester, sub_query))
+                        )
+                        # Collect results in order as they become available, so the player can start on the first
+                        # track while the rest are still being resolved
+                        while pending and (len(pending) >= window or pending[0].done()):
+                            track_count += await self._collect_resolved_sub_query(
+                                pending.popleft(), enqueue, player, requester, successful_tracks, queries_failed
+                            )
+                except Exception:
+                    queries_failed.append(query)
+            while pending:
+                track_count += await self._collect_resolved_sub_query(
+                    pending.popleft(), enqueue, player, requester, successful_tracks, queries_failed
                 )
-            except Exception:
-                queries_failed.append(query)
+        finally:
+            for task in pending:
+                task.cancel()
         return successful_tracks, track_count, queries_failed
 
-    async def _get_tracks_single_query(
-        self, bypass_cache, enqueue, player, queries_failed, query, requester, successful_tracks, track_count
-    ):
-        async for sub_query in self._yield_recursive_queries(query):
-            node = await self.node_manager.find_best_node(
-                region=player.region if player else None,
-                coordinates=player.coordinates if player else None,
-                feature=sub_query.requires_capability,
-            )
-            if node is None:
-                queries_failed.append(sub_query)
-                continue
+    async def _collect_resolved_sub_query(
+        self,
+        task: asyncio.Task[tuple[list[Track], int, list[Query]]],
+        enqueue: bool,
+        player: Player | None,
+        requester: discord.Member,
+        successful_tracks: list[Track],
+        queries_failed: list[Query],
+    ) -> int:
+        tracks, track_count, failed = await task
+        queries_failed.extend(failed)
+        for track in tracks:
+            successful_tracks.append(track)
             await self._get_tracks_play_or_enqueue(enqueue, player, requester, successful_tracks)
-            if sub_query.is_search or sub_query.is_single:
-                track_count = await self._get_tracks_search_or_single(
-                    bypass_cache,
-                    node,
-                    player,
-                    queries_failed,
-                    requester,
-                    sub_query,
-                    successful_tracks,
-                    track_count,
-                )
-            elif (
-                (sub_query.is_playlist or sub_query.is_album)
-                and not sub_query.is_local
-                and not sub_query.is_custom_playlist
-            ):
-                track_count = await self._get_tracks_playlist_or_album_no_local(
-                    bypass_cache,
-                    enqueue,
-                    node,
-                    player,
-                    queries_failed,
-                    requester,
-                    sub_query,
-                    successful_tracks,
-                    track_count,
-                )
-            elif (sub_query.is_local or sub_query.is_custom_playlist) and sub_query.is_album:
-                track_count = await self._get_tracks_local_album(
-                    enqueue, node, player, queries_failed, requester, sub_query, successful_tracks, track_count
-                )
-            else:
-                queries_failed.append(sub_query)
-                LOGGER.warning("Unhandled query: %s, %s", sub_query.to_dict(), sub_query.query_identifier)
         return track_count
 
+    async def _resolve_sub_query(
+        self, bypass_cache: bool, player: Player | None, requester: discord.Member, sub_query: Query
+    ) -> tuple[list[Track], int, list[Query]]:
+        tracks = []
+        queries_failed = []
+        node = await self.node_manager.find_best_node(
+            region=player.region if player else None,
+            coordinates=player.coordinates if player else None,
+            feature=sub_query.requires_capability,
+        )
+        if node is None:
+            return tracks, 0, [sub_query]
+        try:
+            # Tracks are played or enqueued in order by the caller, so never enqueue from here
+            async with node.load_limiter:
+                if sub_query.is_search or sub_query.is_single:
+                    track_count = await self._get_tracks_search_or_single(
+                        bypass_cache, node, player, queries_failed, requester, sub_query, tracks, 0
+                    )
+                elif (
+                    (sub_query.is_playlist or sub_query.is_album)
+                    and not sub_query.is_local
+                    and not sub_query.is_custom_playlist
+                ):
+                    track_count = await self._get_tracks_playlist_or_album_no_local(
+                        bypass_cache, False, node, player, queries_failed, requester, sub_query, tracks, 0
+                    )
+                elif (sub_query.is_local or sub_query.is_custom_playlist) and sub_query.is_album:
+                    track_count = await self._get_tracks_local_album(
+                        False, node, player, queries_failed, requester, sub_query, tracks, 0
+                    )
+                else:
+                    LOGGER.warning("Unhandled query: %s, %s", sub_query.to_dict(), sub_query.query_identifier)
+                    return tracks, 0, [sub_query]
+        except Exception:
+            return [], 0, [*queries_failed, sub_query]
+        return tracks, track_count, queries_failed
+
     @staticmethod
     async def _get_tracks_play_or_enqueue(enqueue, player, requester, successful_tracks):
         # Query tracks as the queue builds as this may be a slow operation
@@ -1,16 +1,233 @@
 from __future__ import annotations
 
+import asyncio
+import collections
+import dataclasses
+import enum
 import inspect
+import itertools
+from collections.abc import Awaitable, Callable, Hashable
 from typing import TYPE_CHECKING
 
+from pylav.constants.misc import EVENT_QUEUE_SHUTDOWN_TIMEOUT, EVENT_QUEUE_SIZE, EVENT_QUEUE_WORKERS
 from pylav.events import api, base, node, player, plugins, queue, track
 from pylav.events.plugins import sponsorblock
 from pylav.events.track import track_start
 from pylav.events.utils import get_event_name, get_simple_event_name
+from pylav.logging import getLogger
 
 if TYPE_CHECKING:
     from pylav.core.client import Client
 
+LOGGER = getLogger("PyLav.DispatchManager")
+
+
+class OverflowPolicy(enum.Enum):
+    """What happens to an event submitted while the queue of its type is full"""
+
+    #: The submitted event is dropped
+    DROP_NEWEST = enum.auto()
+    #: The oldest queued event is dropped to make room for the submitted one
+    DROP_OLDEST = enum.auto()
+    #: The submitted event skips the queue and is handed to the bot straight away
+    DISPATCH_NOW = enum.auto()
+    #: The submitted event is queued anyway and the producers waiting on `DispatchManager.wait_for_room` are held
+    #: until the queue is back under its size
+    BLOCK = enum.auto()
+
+
+@dataclasses.dataclass(frozen=True, slots=True, kw_only=True)
+class EventQueueSettings:
+    """How the events of a type are queued and dispatched
+
+    Attributes
+    ----------
+    max_size: int
+        The maximum number of events waiting to be dispatched.
+    workers: int
+        The number of events dispatched concurrently.
+    overflow: OverflowPolicy
+        What happens to events submitted while the queue is full, events are never dropped unless a dropping
+        policy is set explicitly, by default the producers are slowed down instead.
+    coalesce_key: Callable[[base.PyLavEvent], Hashable] | None
+        When set, an event replaces the queued event with the same key instead of being queued after it.
+    """
+
+    max_size: int = EVENT_QUEUE_SIZE
+    workers: int = EVENT_QUEUE_WORKERS
+    overflow: OverflowPolicy = OverflowPolicy.BLOCK
+    coalesce_key: Callable[[base.PyLavEvent], Hashable] | None = None
+
+
+@dataclasses.dataclass(slots=True)
+class EventQueueCounters:
+    """Counters of the events that went through a queue"""
+
+    submitted: int = 0
+    dispatched: int = 0
+    coalesced: int = 0
+    dropped: int = 0
+    failed: int = 0
+
+    def to_dict(self) -> dict[str, int]:
+        """Get the counters as a dict"""
+        return dataclasses.asdict(self)
+
+
+def _player_guild_id(event: base.PyLavEvent) -> int:
+    return event.player.guild.id
+
+
+# A position update supersedes the queued update of the same player, they are frequent and disposable enough to be
+# dropped when the queue is full
+DEFAULT_EVENT_QUEUE_SETTINGS: dict[type[base.PyLavEvent], EventQueueSettings] = {
+    player.PlayerUpdateEvent: EventQueueSettings(overflow=OverflowPolicy.DROP_OLDEST, coalesce_key=_player_guild_id),
+}
+
+
+class EventQueue:
+    """A bounded queue of the events of one type, drained by a pool of workers.
+
+    Parameters
+    ----------
+    settings: EventQueueSettings
+        How the events are queued and dispatched.
+    dispatch: Callable[[base.PyLavEvent], Awaitable[None]]
+        The coroutine function dispatching an event.
+    """
+
+    __slots__ = (
+        "settings",
+        "counters",
+        "_events",
+        "_keys",
+        "_ready",
+        "_room",
+        "_idle",
+        "_pending",
+        "_workers",
+        "_dispatch",
+    )
+
+    def __init__(self, settings: EventQueueSettings, dispatch: Callable[[base.PyLavEvent], Awaitable[None]]) -> None:
+        self.settings = settings
+        self.counters = EventQueueCounters()
+        # Keyed by the coalesce key, or by a unique number for events that are not coalesced
+        self._events: collections.OrderedDict[Hashable, base.PyLavEvent] = collections.OrderedDict()
+        self._keys = itertools.count()
+        self._ready = asyncio.Event()
+        # Set while the queue is under its size, cleared by blocking overflows
+        self._room = asyncio.Event()
+        self._room.set()
+        # Set while no event is queued or being dispatched
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._pending = 0
+        self._workers: set[asyncio.Task] = set()
+        self._dispatch = dispatch
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def put(self, event: base.PyLavEvent) -> bool:
+        """Queue the event.
+
+        Returns
+        -------
+        bool
+            False if the event did not go in the queue, because it was dropped or has to be dispatched right away.
+        """
+        self.counters.submitted += 1
+        if self.settings.coalesce_key is None:
+            key = next(self._keys)
+        elif (key := self.settings.coalesce_key(event)) in self._events:
+            self._events[key] = event
+            self.counters.coalesced += 1
+            return True
+        if len(self._events) >= self.settings.max_size:
+            match self.settings.overflow:
+                case OverflowPolicy.DROP_NEWEST:
+                    self.counters.dropped += 1
+                    return False
+                case OverflowPolicy.DROP_OLDEST:
+                    self._events.popitem(last=False)
+                    self._done()
+                    self.counters.dropped += 1
+                case OverflowPolicy.DISPATCH_NOW:
+                    return False
+                case OverflowPolicy.BLOCK:
+                    self._room.clear()
+        self._events[key] = event
+        self._pending += 1
+        self._idle.clear()
+        self._ready.set()
+        self._start_workers()
+        return True
+
+    def reconfigure(self, settings: EventQueueSettings) -> None:
+        """Apply new settings, workers over the new count exit once they finish their current event"""
+        self.settings = settings
+        self._start_workers()
+        self._ready.set()
+        self._update_room()
+
+    async def wait_for_room(self) -> None:
+        """Wait until the queue is under its size"""
+        await self._room.wait()
+
+    async def join(self) -> None:
+        """Wait until every queued event has been dispatched, including the ones the workers are dispatching"""
+        await self._idle.wait()
+
+    def close(self) -> None:
+        """Stop the workers, the queued events are discarded"""
+        for worker in self._workers:
+            worker.cancel()
+        self._workers.clear()
+        self._events.clear()
+        self._pending = 0
+        self._idle.set()
+        self._room.set()
+
+    def _done(self) -> None:
+        # The workers cancelled by `close` finish after the count was reset
+        if self._pending:
+            self._pending -= 1
+        if not self._pending:
+            self._idle.set()
+
+    def _update_room(self) -> None:
+        if len(self._events) < self.settings.max_size:
+            self._room.set()
+
+    def _start_workers(self) -> None:
+        while len(self._workers) < min(self.settings.workers, len(self._events)):
+            worker = asyncio.create_task(self._worker())
+            worker.set_name("PyLav event queue worker")
+            self._workers.add(worker)
+            worker.add_done_callback(self._workers.discard)
+
+    async def _worker(self) -> None:
+        worker = asyncio.current_task()
+        while True:
+            if len(self._workers) > self.settings.workers:
+                self._workers.discard(worker)
+                return
+            if not self._events:
+                self._ready.clear()
+                await self._ready.wait()
+                continue
+            __, event = self._events.popitem(last=False)
+            self._update_room()
+            try:
+                await self._dispatch(event)
+                self.counters.dispatched += 1
+            except Exception as exc:
+                self.counters.failed += 1
+                LOGGER.warning("Failed to dispatch %s", type(event).__name__, exc_info=exc)
+            finally:
+                self._done()
+
 
 class DispatchManager:
     """
@@ -19,6 +236,9 @@ class DispatchManager:
 
     The method names are the event names.
 
+    Events are dispatched from one bounded queue per event type, see `configure` to change how the events of a
+    type are queued, and `stats` for the counters of each queue.
+
     You can listen to events by adding the following to your client:
 
 
@@ -36,7 +256,7 @@ class DispatchManager:
 
     """
 
-    __slots__ = ("_client", "dispatcher", "mapping")
+    __slots__ = ("_client", "dispatcher", "mapping", "_queue_settings", "_queues", "_closed", "_handoff")
 
     def __init__(self, client: Client) -> None:
         self._client = client
@@ -51,6 +271,11 @@ class DispatchManager:
         self._update_mapper(track_start)
         self._update_mapper(sponsorblock)
         self._update_mapper(api)
+        self._queue_settings: dict[type[base.PyLavEvent], EventQueueSettings] = dict(DEFAULT_EVENT_QUEUE_SETTINGS)
+        self._queues: dict[type[base.PyLavEvent], EventQueue] = {}
+        self._closed = False
+        # Bounds how many events are handed to the bot in the same turn of the event loop
+        self._handoff = asyncio.Semaphore(EVENT_QUEUE_WORKERS)
 
     def _update_mapper(self, module: node | player | queue | track) -> None:  # type: ignore
         """Updates the mapping with the events from the given module."""
@@ -62,10 +287,78 @@ class DispatchManager:
             }
         )
 
+    def submit(self, event: base.PyLavEvent) -> None:
+        """Queues an event to be dispatched by the workers of its type"""
+        if self._closed:
+            self.dispatcher(self.mapping[type(event)], event)
+            return
+        event_type = type(event)
+        if (event_queue := self._queues.get(event_type)) is None:
+            event_queue = self._queues[event_type] = EventQueue(
+                self._queue_settings.get(event_type, EventQueueSettings()), self.dispatch
+            )
+        if event_queue.put(event):
+            return
+        if event_queue.settings.overflow is OverflowPolicy.DISPATCH_NOW:
+            self.dispatcher(self.mapping[event_type], event)
+        else:
+            LOGGER.debug("The %s queue is full, dropping an event", self.mapping[event_type])
+
     async def dispatch(self, event: base.PyLavEvent) -> None:
-        """Dispatches an event to the appropriate handler"""
-        event_name = self.mapping[type(event)]
-        self.dispatcher(event_name, event)
+        """Hands an event to the bot, which schedules its listeners.
+
+        The worker yields to the event loop before handing off the next event so that the listeners of this one
+        get to start first, the queues fill up instead of the loop when events come in faster than that.
+        """
+        async with self._handoff:
+            self.dispatcher(self.mapping[type(event)], event)
+            await asyncio.sleep(0)
+
+    async def wait_for_room(self) -> None:
+        """Waits until every queue is under its size, producers call this before submitting more events so that a
+        storm of events slows them down instead of piling up"""
+        for event_queue in list(self._queues.values()):
+            await event_queue.wait_for_room()
+
+    def configure(self, event_type: type[base.PyLavEvent], settings: EventQueueSettings) -> None:
+        """Changes how the events of the given type are queued and dispatched
+
+        Parameters
+        ----------
+        event_type: type[base.PyLavEvent]
+            The event type to configure.
+        settings: EventQueueSettings
+            The new settings.
+        """
+        self._queue_settings[event_type] = settings
+        if (event_queue := self._queues.get(event_type)) is not None:
+            event_queue.reconfigure(settings)
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """Returns the counters and the current size of the queue of each event type dispatched so far
+
+        Returns
+        -------
+        dict[str, dict[str, int]]
+            The counters keyed by event name.
+        """
+        return {
+            self.mapping[event_type]: {**event_queue.counters.to_dict(), "queued": len(event_queue)}
+            for event_type, event_queue in self._queues.items()
+        }
+
+    async def shutdown(self, timeout: float = EVENT_QUEUE_SHUTDOWN_TIMEOUT) -> None:
+        """Gives the queued events some time to be dispatched then stops the workers, later events are handed to
+        the bot directly"""
+        self._closed = True
+        try:
+            async with asyncio.timeout(timeout):
+                await asyncio.gather(*(event_queue.join() for event_queue in self._queues.values()))
+        except TimeoutError:
+            LOGGER.warning("Some events were not dispatched before shutdown")
+        for event_queue in self._queues.values():
+            event_queue.close()
+        self._queues.clear()
 
     def get_event_names(self) -> set[str]:
         """Returns a set of all event names
@@ -102,6 +102,33 @@ class QueueShuffledEvent(PyLavEvent):
         self.requester = requester
 
 
+class QueueReorderedEvent(PyLavEvent):
+    """This event is dispatched when the queue is reordered.
+
+    Event can be listened to by adding a listener with the name `pylav_queue_reordered_event`.
+
+    Attributes
+    ----------
+    player: :class:`Player`
+        The player whose queue was reordered.
+    requester: :class:`discord.Member`
+        The user who requested the change.
+
+    Parameters
+    ----------
+    player: :class:`Player`
+        The player whose queue was reordered.
+    requester: :class:`discord.Member`
+        The user who requested the change.
+    """
+
+    __slots__ = ("player", "requester")
+
+    def __init__(self, player: Player, requester: discord.Member) -> None:
+        self.player = player
+        self.requester = requester
+
+
 class QueueTracksRemovedEvent(PyLavEvent):
     """This event is dispatched when tracks are removed from the queue.
 
@@ -227,7 +227,6 @@ class PlaylistInfoButton(discord.ui.Button):
         from pylav.extension.red.ui.menus.generic import PaginatingMenu
         from pylav.extension.red.ui.sources.playlist import TrackMappingSource
 
-        tracks = await self.view.playlist.fetch_tracks()
         await PaginatingMenu(
             bot=self.cog.bot,
             cog=self.cog,
@@ -235,7 +234,7 @@ class PlaylistInfoButton(discord.ui.Button):
                 guild_id=interaction.guild.id,
                 cog=self.cog,
                 author=interaction.user,
-                entries=tracks,
+                size=await self.view.playlist.size(),
                 playlist=self.playlist,
             ),
             delete_after_timeout=True,
@@ -399,13 +398,13 @@ class EnqueuePlaylistButton(discord.ui.Button):
             await interaction.response.defer(ephemeral=True)
         context = await self.cog.bot.get_context(interaction)
         if not self.playlist:
-            playlists = await self.cog.pylav.playlist_db_manager.get_all_for_user(
+            listings = await self.cog.pylav.playlist_db_manager.get_all_listings_for_user(
                 requester=context.author.id,
                 vc=rgetattr(context.author, "voice.channel", None),
                 guild=context.guild,
                 channel=context.channel,
             )
-            playlists = list(itertools.chain.from_iterable(playlists))
+            listings = list(itertools.chain.from_iterable(listings))
 
             from pylav.extension.red.ui.menus.playlist import PlaylistPickerMenu
             from pylav.extension.red.ui.selectors.playlist import PlaylistPlaySelector
@@ -418,8 +417,9 @@ class EnqueuePlaylistButton(discord.ui.Button):
                 source=PlaylistPickerSource(
                     guild_id=context.guild.id,
                     cog=self.cog,
-                    pages=playlists,
+                    pages=[listing.playlist for listing in listings],
                     message_str=_("Playlists you can currently play."),
+                    sizes={listing.id: listing.size for listing in listings},
                 ),
                 delete_after_timeout=True,
                 clear_buttons_after=True,
@@ -14,7 +14,7 @@ _ = Translator("PyLav", Path(__file__))
 
 class PlaylistOption(discord.SelectOption):
     @classmethod
-    async def from_playlist(cls, playlist: Playlist, bot: DISCORD_BOT_TYPE, index: int):
+    async def from_playlist(cls, playlist: Playlist, bot: DISCORD_BOT_TYPE, index: int, size: int | None = None):
         return cls(
             label=shorten_string(max_length=100, string=f"{index + 1}. {await playlist.fetch_name()}"),
             description=shorten_string(
@@ -22,7 +22,7 @@ class PlaylistOption(discord.SelectOption):
                 string=_(
                     "Tracks: {playlist_size_variable_do_not_translate} || {playlist_author_name_variable_do_not_translate} || {playlist_scope_variable_do_not_translate}"
                 ).format(
-                    playlist_size_variable_do_not_translate=await playlist.size(),
+                    playlist_size_variable_do_not_translate=await playlist.size() if size is None else size,
                     playlist_author_name_variable_do_not_translate=await playlist.get_author_name(bot, mention=False),
                     playlist_scope_variable_do_not_translate=await playlist.get_scope_name(bot, mention=False),
                 ),
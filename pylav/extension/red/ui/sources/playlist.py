@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import random
+import warnings
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -30,10 +31,18 @@ ASCII_ORDER_SORT = "~" * 100
 
 
 class PlaylistPickerSource(menus.ListPageSource):
-    def __init__(self, guild_id: int, cog: DISCORD_COG_TYPE, pages: list[Playlist], message_str: str):
+    def __init__(
+        self,
+        guild_id: int,
+        cog: DISCORD_COG_TYPE,
+        pages: list[Playlist],
+        message_str: str,
+        sizes: dict[int, int] | None = None,
+    ):
         pages.sort(key=lambda p: p.id)
         super().__init__(entries=pages, per_page=5)
         self.message_str = message_str
+        self.sizes = sizes or {}
         self.per_page = 5
         self.guild_id = guild_id
         self.select_options: list[PlaylistOption] = []
@@ -77,7 +86,11 @@ class PlaylistPickerSource(menus.ListPageSource):
         self.select_options.clear()
         self.select_mapping.clear()
         for i, playlist in enumerate(iter(self.entries[base : base + self.per_page]), start=base):  # noqa: E203
-            self.select_options.append(await PlaylistOption.from_playlist(playlist=playlist, index=i, bot=self.cog.bot))
+            self.select_options.append(
+                await PlaylistOption.from_playlist(
+                    playlist=playlist, index=i, bot=self.cog.bot, size=self.sizes.get(playlist.id)
+                )
+            )
             self.select_mapping[f"{playlist.id}"] = playlist
         return self.entries[base : base + self.per_page]  # noqa: E203
 
@@ -93,18 +106,37 @@ class TrackMappingSource(menus.ListPageSource):
         cog: DISCORD_COG_TYPE,
         playlist: Playlist,
         author: discord.abc.User,
-        entries: list[str],
+        entries: list[str] | None = None,
         per_page: int = 10,
+        *,
+        size: int | None = None,
     ):
-        super().__init__(entries=entries, per_page=per_page)
+        if entries is not None:
+            warnings.warn(
+                "Passing the tracks to TrackMappingSource is deprecated, pass the playlist size with `size=` instead",
+                DeprecationWarning,
+                stacklevel=2,
+            )
+            if size is None:
+                size = len(entries)
+        if size is None:
+            raise TypeError("TrackMappingSource requires the size of the playlist")
+        # The pages are fetched from the playlist on demand, so there are no entries to hand to the base class
+        super().__init__(entries=[], per_page=per_page)
         self.cog = cog
         self.author = author
         self.guild_id = guild_id
         self.playlist = playlist
+        self.size = size
+        self.per_page = per_page
 
     def is_paginating(self) -> bool:
         return True
 
+    async def get_page(self, page_number: int) -> list[JSON_DICT_TYPE]:
+        base = page_number * self.per_page
+        return await self.playlist.fetch_range(base, base + self.per_page)
+
     def get_starting_index_and_page_number(self, menu: PaginatingMenu) -> tuple[int, int]:
         page_num = menu.current_page
         start = page_num * self.per_page
@@ -144,7 +176,7 @@ class TrackMappingSource(menus.ListPageSource):
             messageable=menu.ctx,
         )
 
-        total_number_of_entries = len(self.entries)
+        total_number_of_entries = self.size
         current_page = humanize_number(page_num + 1)
         total_number_of_pages = humanize_number(self.get_max_pages())
 
@@ -167,14 +199,18 @@ class TrackMappingSource(menus.ListPageSource):
 
     def get_max_pages(self):
         """:class:`int`: The maximum number of pages required to paginate this sequence"""
-        return self._max_pages or 1
+        pages, left_over = divmod(self.size, self.per_page)
+        if left_over:
+            pages += 1
+        return pages or 1
 
 
 class PlaylistListSource(menus.ListPageSource):
-    def __init__(self, cog: DISCORD_COG_TYPE, pages: list[Playlist]):
+    def __init__(self, cog: DISCORD_COG_TYPE, pages: list[Playlist], sizes: dict[int, int] | None = None):
         pages.sort(key=lambda p: p.id)
         super().__init__(entries=pages, per_page=5)
         self.cog = cog
+        self.sizes = sizes or {}
 
     def get_starting_index_and_page_number(self, menu: PaginatingMenu) -> tuple[int, int]:
         page_num = menu.current_page
@@ -194,7 +230,9 @@ class PlaylistListSource(menus.ListPageSource):
                     await playlist.get_name_formatted(with_url=True),
                     _("Identifier: {id_variable_do_not_translate}").format(id_variable_do_not_translate=playlist.id),
                     _("Tracks: {num_variable_do_not_translate}").format(
-                        num_variable_do_not_translate=await playlist.size()
+                        num_variable_do_not_translate=(
+                            await playlist.size() if (size := self.sizes.get(playlist.id)) is None else size
+                        )
                     ),
                     _("Author: {name_variable_do_not_translate}").format(name_variable_do_not_translate=author_name),
                     (
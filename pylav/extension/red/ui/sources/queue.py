@@ -1,7 +1,6 @@
 from __future__ import annotations
 
-from collections.abc import Iterable
-from itertools import islice
+from collections.abc import Sequence
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -60,9 +59,9 @@ class QueueSource(menus.ListPageSource):
         self.history = history
 
     @property
-    def entries(self) -> Iterable[Track]:
+    def entries(self) -> Sequence[Track]:
         if player := self.cog.pylav.get_player(self.guild_id):
-            return player.history.raw_queue if self.history else player.queue.raw_queue
+            return player.history if self.history else player.queue
         else:
             return []
 
@@ -71,7 +70,7 @@ class QueueSource(menus.ListPageSource):
 
     async def get_page(self, page_number: int) -> list[Track]:
         base = page_number * self.per_page
-        return list(islice(self.entries, base, base + self.per_page))
+        return list(self.entries[base : base + self.per_page])  # noqa: E203
 
     def get_max_pages(self) -> int:
         player = self.cog.pylav.get_player(self.guild_id)
@@ -133,7 +132,7 @@ class QueuePickerSource(QueueSource):
         base = page_number * self.per_page
         self.select_options.clear()
         self.select_mapping.clear()
-        for i, track in enumerate(islice(self.entries, base, base + self.per_page), start=base):
+        for i, track in enumerate(list(self.entries[base : base + self.per_page]), start=base):  # noqa: E203
             self.select_options.append(await QueueTrackOption.from_track(track=track, index=i))
             self.select_mapping[track.id] = track
         return []
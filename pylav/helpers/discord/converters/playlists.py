@@ -3,10 +3,8 @@ from __future__ import annotations
 from pathlib import Path
 from typing import TYPE_CHECKING, TypeVar
 
-import asyncstdlib
 from discord.app_commands import Choice, Transformer
 from discord.ext import commands
-from rapidfuzz import fuzz
 
 from pylav.exceptions.database import EntryNotFoundException
 from pylav.helpers.format.strings import shorten_string
@@ -63,21 +61,7 @@ else:
                     for e in playlists
                 ][:25]
 
-            try:
-                playlists = await interaction.client.pylav.playlist_db_manager.get_playlist_by_name(current, limit=50)
-            except EntryNotFoundException:
-                return []
-
-            async def _filter(c: PlaylistModel):
-                name = await c.fetch_name()
-                author = await c.fetch_author()
-                return (
-                    fuzz.partial_ratio(name, current, score_cutoff=75),
-                    1 if author == interaction.user.id else 0,
-                    [-ord(i) for i in name],
-                )
-
-            extracted = await asyncstdlib.heapq.nlargest(asyncstdlib.iter(playlists), n=25, key=_filter)
-            return [
-                Choice(name=shorten_string(await e.fetch_name(), max_length=100), value=f"{e.id}") for e in extracted
-            ]
+            matches = await interaction.client.pylav.playlist_db_manager.search_playlists(
+                current, limit=25, requester=interaction.user.id
+            )
+            return [Choice(name=shorten_string(m.name, max_length=100), value=f"{m.id}") for m in matches]
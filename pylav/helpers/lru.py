@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any, Generic
+
+from pylav.type_hints.generics import ANY_GENERIC_TYPE
+
+
+class SizedLRU(Generic[ANY_GENERIC_TYPE]):
+    """A least recently used mapping bounded by the approximate size of its values in bytes.
+
+    Parameters
+    ----------
+    max_bytes: int
+        The approximate amount of memory the values can use, a value of 0 disables the cache.
+    sizer: Callable[[Any], int]
+        The function used to estimate the size of a value in bytes, it is called on every set so it should be cheap.
+    """
+
+    __slots__ = ("_store", "_max_bytes", "_sizer", "_current_bytes", "hits", "misses", "evictions")
+
+    def __init__(self, max_bytes: int, sizer: Callable[[Any], int]) -> None:
+        self._store: OrderedDict[Hashable, tuple[int, ANY_GENERIC_TYPE]] = OrderedDict()
+        self._max_bytes = max_bytes
+        self._sizer = sizer
+        self._current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._store
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the cache can hold any value"""
+        return self._max_bytes > 0
+
+    @property
+    def current_bytes(self) -> int:
+        """The approximate amount of memory used by the values"""
+        return self._current_bytes
+
+    def get(self, key: Hashable, default: ANY_GENERIC_TYPE | None = None) -> ANY_GENERIC_TYPE | None:
+        """Get the value for the key and mark it as the most recently used"""
+        if (entry := self._store.get(key)) is None:
+            self.misses += 1
+            return default
+        self._store.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: Hashable, value: ANY_GENERIC_TYPE) -> None:
+        """Set the value for the key, evicting the least recently used values if over the budget"""
+        if not self.enabled:
+            return
+        self.pop(key)
+        size = self._sizer(value)
+        if size > self._max_bytes:
+            return
+        self._store[key] = (size, value)
+        self._current_bytes += size
+        while self._current_bytes > self._max_bytes:
+            __, (evicted_size, __) = self._store.popitem(last=False)
+            self._current_bytes -= evicted_size
+            self.evictions += 1
+
+    def pop(self, key: Hashable) -> ANY_GENERIC_TYPE | None:
+        """Remove the key and return its value if it was present"""
+        if (entry := self._store.pop(key, None)) is None:
+            return None
+        self._current_bytes -= entry[0]
+        return entry[1]
+
+    def clear(self) -> None:
+        """Remove every value"""
+        self._store.clear()
+        self._current_bytes = 0
+
+    def stats(self) -> dict[str, int]:
+        """Get the current usage counters"""
+        return {
+            "entries": len(self._store),
+            "bytes": self._current_bytes,
+            "max_bytes": self._max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
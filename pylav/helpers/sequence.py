@@ -0,0 +1,316 @@
+from __future__ import annotations
+
+import random
+from collections.abc import Callable, Hashable, Iterable, Iterator, Sequence
+from typing import Generic, overload
+
+from pylav.type_hints.generics import ANY_GENERIC_TYPE
+
+# Target size of each block, blocks are split once they grow to twice this size
+BLOCK_SIZE = 512
+
+
+class BlockSequence(Generic[ANY_GENERIC_TYPE]):
+    """A list split into blocks of at most a few hundred items, indexed by a Fenwick tree of the block lengths.
+
+    Positional access, insertion and removal are ``O(log n)`` plus the cost of moving at most one block worth
+    of items, peeking and popping at either end are ``O(1)``, and slicing returns a view instead of a copy.
+
+    Parameters
+    ----------
+    iterable: Iterable[ANY_GENERIC_TYPE]
+        The initial items.
+    key: Callable[[ANY_GENERIC_TYPE], Hashable] | None
+        A function returning the identity of an item, when set a count of every key is kept so that
+        membership tests are ``O(1)``. Two items must only compare equal if they have the same key.
+    """
+
+    __slots__ = ("_blocks", "_tree", "_len", "_key", "_counts", "_mutations")
+
+    def __init__(
+        self,
+        iterable: Iterable[ANY_GENERIC_TYPE] = (),
+        key: Callable[[ANY_GENERIC_TYPE], Hashable] | None = None,
+    ) -> None:
+        self._blocks: list[list[ANY_GENERIC_TYPE]] = []
+        # Fenwick tree over the block lengths, None when the blocks changed and it has to be rebuilt
+        self._tree: list[int] | None = None
+        self._len = 0
+        self._key = key
+        self._counts: dict[Hashable, int] = {}
+        self._mutations = 0
+        self.extend(iterable)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __bool__(self) -> bool:
+        return self._len > 0
+
+    def __iter__(self) -> Iterator[ANY_GENERIC_TYPE]:
+        mutations = self._mutations
+        for block in self._blocks:
+            yield from block
+            if mutations != self._mutations:
+                raise RuntimeError("Sequence changed during iteration")
+
+    def __reversed__(self) -> Iterator[ANY_GENERIC_TYPE]:
+        mutations = self._mutations
+        for block in reversed(self._blocks):
+            yield from reversed(block)
+            if mutations != self._mutations:
+                raise RuntimeError("Sequence changed during iteration")
+
+    def __contains__(self, value: ANY_GENERIC_TYPE) -> bool:
+        if self._key is None:
+            return any(value in block for block in self._blocks)
+        return self._key(value) in self._counts
+
+    @overload
+    def __getitem__(self, index: int) -> ANY_GENERIC_TYPE: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Sequence[ANY_GENERIC_TYPE]: ...
+
+    def __getitem__(self, index: int | slice) -> ANY_GENERIC_TYPE | Sequence[ANY_GENERIC_TYPE]:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._len)
+            if step == 1:
+                return SequenceView(self, start, max(start, stop))
+            return list(self)[index]
+        block, offset = self._locate(index)
+        return self._blocks[block][offset]
+
+    def __delitem__(self, index: int) -> None:
+        self.pop(index)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self)!r})"
+
+    def count(self, value: ANY_GENERIC_TYPE) -> int:
+        """Return the number of occurrences of the value"""
+        if self._key is None:
+            return sum(block.count(value) for block in self._blocks)
+        return self._counts.get(self._key(value), 0)
+
+    def index(self, value: ANY_GENERIC_TYPE) -> int:
+        """Return the index of the first occurrence of the value.
+
+        Raises ValueError if the value is not present.
+        """
+        if self._key is not None and self._key(value) not in self._counts:
+            raise ValueError(f"{value!r} is not in the sequence")
+        start = 0
+        for block in self._blocks:
+            try:
+                return start + block.index(value)
+            except ValueError:
+                start += len(block)
+        raise ValueError(f"{value!r} is not in the sequence")
+
+    def peekleft(self) -> ANY_GENERIC_TYPE:
+        """Return the first item without removing it, raises IndexError if empty"""
+        if not self._len:
+            raise IndexError("peek from an empty sequence")
+        return self._blocks[0][0]
+
+    def peek(self) -> ANY_GENERIC_TYPE:
+        """Return the last item without removing it, raises IndexError if empty"""
+        if not self._len:
+            raise IndexError("peek from an empty sequence")
+        return self._blocks[-1][-1]
+
+    def append(self, value: ANY_GENERIC_TYPE) -> None:
+        """Add an item to the end"""
+        self.insert_many(self._len, (value,))
+
+    def appendleft(self, value: ANY_GENERIC_TYPE) -> None:
+        """Add an item to the start"""
+        self.insert_many(0, (value,))
+
+    def extend(self, values: Iterable[ANY_GENERIC_TYPE]) -> None:
+        """Add the items to the end"""
+        self.insert_many(self._len, values)
+
+    def insert(self, index: int, value: ANY_GENERIC_TYPE) -> None:
+        """Insert an item before the index, indexes are clamped like `list.insert`"""
+        self.insert_many(index, (value,))
+
+    def insert_many(self, index: int, values: Iterable[ANY_GENERIC_TYPE]) -> None:
+        """Insert the items, in order, before the index, indexes are clamped like `list.insert`"""
+        values = list(values)
+        if not values:
+            return
+        index = self._clamp(index)
+        if not self._blocks:
+            self._blocks.append([])
+            block, offset = 0, 0
+        elif index == self._len:
+            block, offset = len(self._blocks) - 1, len(self._blocks[-1])
+        else:
+            block, offset = self._locate(index)
+        target = self._blocks[block]
+        target[offset:offset] = values
+        self._len += len(values)
+        self._count(values, 1)
+        if len(target) > 2 * BLOCK_SIZE:
+            self._blocks[block : block + 1] = [target[i : i + BLOCK_SIZE] for i in range(0, len(target), BLOCK_SIZE)]
+            self._tree = None
+        else:
+            self._tree_add(block, len(values))
+        self._mutations += 1
+
+    def pop(self, index: int = -1) -> ANY_GENERIC_TYPE:
+        """Remove and return the item at the index, the last one by default"""
+        if not self._len:
+            raise IndexError("pop from an empty sequence")
+        block, offset = self._locate(index)
+        target = self._blocks[block]
+        value = target.pop(offset)
+        self._len -= 1
+        self._count((value,), -1)
+        if target:
+            self._tree_add(block, -1)
+        else:
+            del self._blocks[block]
+            self._tree = None
+        self._mutations += 1
+        return value
+
+    def popleft(self) -> ANY_GENERIC_TYPE:
+        """Remove and return the first item"""
+        return self.pop(0)
+
+    def remove(self, value: ANY_GENERIC_TYPE) -> None:
+        """Remove the first occurrence of the value, raises ValueError if it is not present"""
+        self.pop(self.index(value))
+
+    def clear(self) -> None:
+        """Remove every item"""
+        self._blocks.clear()
+        self._counts.clear()
+        self._tree = None
+        self._len = 0
+        self._mutations += 1
+
+    def reset(self, values: Iterable[ANY_GENERIC_TYPE]) -> None:
+        """Replace every item with the given items"""
+        self.clear()
+        self.extend(values)
+
+    def shuffle(self) -> None:
+        """Shuffle the items in place"""
+        values = list(self)
+        random.shuffle(values)
+        self._blocks = [values[i : i + BLOCK_SIZE] for i in range(0, len(values), BLOCK_SIZE)]
+        self._tree = None
+        self._mutations += 1
+
+    def _clamp(self, index: int) -> int:
+        if index < 0:
+            return max(0, index + self._len)
+        return min(index, self._len)
+
+    def _locate(self, index: int) -> tuple[int, int]:
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("sequence index out of range")
+        # Both ends are the hot paths of a queue, resolve them without touching the tree
+        if index < len(self._blocks[0]):
+            return 0, index
+        if index >= self._len - len(self._blocks[-1]):
+            return len(self._blocks) - 1, index - (self._len - len(self._blocks[-1]))
+        tree = self._build_tree()
+        position = 0
+        step = 1 << (len(self._blocks).bit_length() - 1)
+        while step:
+            if (following := position + step) <= len(self._blocks) and tree[following] <= index:
+                position = following
+                index -= tree[following]
+            step >>= 1
+        return position, index
+
+    def _build_tree(self) -> list[int]:
+        if self._tree is None:
+            tree = [0] * (len(self._blocks) + 1)
+            for i, block in enumerate(self._blocks, start=1):
+                tree[i] += len(block)
+                if (parent := i + (i & -i)) < len(tree):
+                    tree[parent] += tree[i]
+            self._tree = tree
+        return self._tree
+
+    def _tree_add(self, block: int, delta: int) -> None:
+        if (tree := self._tree) is None:
+            return
+        i = block + 1
+        while i < len(tree):
+            tree[i] += delta
+            i += i & -i
+
+    def _count(self, values: Iterable[ANY_GENERIC_TYPE], delta: int) -> None:
+        if self._key is None:
+            return
+        counts = self._counts
+        for value in values:
+            key = self._key(value)
+            if (count := counts.get(key, 0) + delta) > 0:
+                counts[key] = count
+            else:
+                counts.pop(key, None)
+
+
+class SequenceView(Sequence[ANY_GENERIC_TYPE]):
+    """A read-only view of a contiguous range of a `BlockSequence`, no item is copied until it is iterated.
+
+    Like dict views, the view follows the changes made to the sequence and iterating it while the sequence
+    changes raises RuntimeError.
+    """
+
+    __slots__ = ("_sequence", "_start", "_stop")
+
+    def __init__(self, sequence: BlockSequence[ANY_GENERIC_TYPE], start: int, stop: int) -> None:
+        self._sequence = sequence
+        self._start = start
+        self._stop = stop
+
+    def __len__(self) -> int:
+        return max(0, min(self._stop, len(self._sequence)) - self._start)
+
+    def __iter__(self) -> Iterator[ANY_GENERIC_TYPE]:
+        if not (remaining := len(self)):
+            return
+        sequence = self._sequence
+        mutations = sequence._mutations
+        block, offset = sequence._locate(self._start)
+        for items in sequence._blocks[block:]:
+            chunk = items[offset : offset + remaining]
+            yield from chunk
+            if mutations != sequence._mutations:
+                raise RuntimeError("Sequence changed during iteration")
+            if not (remaining := remaining - len(chunk)):
+                return
+            offset = 0
+
+    @overload
+    def __getitem__(self, index: int) -> ANY_GENERIC_TYPE: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Sequence[ANY_GENERIC_TYPE]: ...
+
+    def __getitem__(self, index: int | slice) -> ANY_GENERIC_TYPE | Sequence[ANY_GENERIC_TYPE]:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                return SequenceView(self._sequence, self._start + start, self._start + max(start, stop))
+            return list(self)[index]
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("view index out of range")
+        return self._sequence[self._start + index]
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self)!r})"
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import re
+from collections.abc import Hashable, Iterable
+
+# Same default as the pg_trgm.word_similarity_threshold setting used by the `<%` operator
+WORD_SIMILARITY_THRESHOLD = 0.6
+
+_WORD_SPLIT = re.compile(r"[\W_]+")
+
+
+def trigrams(text: str) -> set[str]:
+    """Split the text into trigrams the way pg_trgm does, each word is lowercased and padded before splitting"""
+    grams = set()
+    for word in _WORD_SPLIT.split(text.lower()):
+        if not word:
+            continue
+        padded = f"  {word} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def word_similarity(needle: str, haystack: str) -> float:
+    """Approximate pg_trgm's ``word_similarity``, the share of the trigrams of needle found in haystack"""
+    if not (needle_grams := trigrams(needle)):
+        return 0.0
+    return len(needle_grams & trigrams(haystack)) / len(needle_grams)
+
+
+class TrigramIndex:
+    """An in-memory inverted trigram index of names, used to rank fuzzy name searches without a database index.
+
+    Each entry carries an owner so that entries belonging to the requester can be ranked first among equal scores.
+    """
+
+    __slots__ = ("_entries", "_postings", "_loaded")
+
+    def __init__(self) -> None:
+        self._entries: dict[Hashable, tuple[str, int | None]] = {}
+        self._postings: dict[str, set[Hashable]] = {}
+        self._loaded = False
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the index has been filled since it was last invalidated"""
+        return self._loaded
+
+    def load(self, entries: Iterable[tuple[Hashable, str | None, int | None]]) -> None:
+        """Replace the content of the index with the given ``(key, name, owner)`` entries"""
+        self._entries.clear()
+        self._postings.clear()
+        for key, name, owner in entries:
+            if not name:
+                continue
+            self._entries[key] = (name, owner)
+            for gram in trigrams(name):
+                self._postings.setdefault(gram, set()).add(key)
+        self._loaded = True
+
+    def invalidate(self) -> None:
+        """Mark the index as outdated so that it is filled again before the next search"""
+        self._loaded = False
+
+    def search(
+        self, query: str, limit: int = 25, owner: int | None = None
+    ) -> list[tuple[Hashable, str, int | None, float]]:
+        """Find the names matching the query.
+
+        Parameters
+        ----------
+        query : str
+            The text to search for.
+        limit : int
+            The maximum number of matches to return.
+        owner : int | None
+            Matches belonging to this owner are ranked first among equal scores.
+
+        Returns
+        -------
+        list[tuple[Hashable, str, int | None, float]]
+            The key, name, owner and score of the best matches, best first.
+        """
+        needle = query.lower()
+        if len(needle) < 3:
+            # Too short to share an inner trigram with a name, fall back to a substring scan
+            candidates = self._entries.keys()
+        else:
+            candidates = set()
+            for gram in trigrams(query):
+                candidates.update(self._postings.get(gram, ()))
+        matches = []
+        for key in candidates:
+            name, entry_owner = self._entries[key]
+            score = word_similarity(query, name)
+            if score < WORD_SIMILARITY_THRESHOLD and needle not in name.lower():
+                continue
+            matches.append((key, name, entry_owner, score))
+        matches.sort(key=lambda m: (-m[3], m[2] != owner, m[1]))
+        return matches[:limit]
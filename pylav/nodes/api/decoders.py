@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import dataclasses
+import types
+import typing
+from collections.abc import Callable
+from typing import Any
+
+from dacite import from_dict
+
+from pylav.nodes.api.responses.plugins import SegmentSkipped, SegmentsLoaded
+from pylav.nodes.api.responses.shared import TrackPluginInfo
+from pylav.nodes.api.responses.track import Track
+from pylav.nodes.api.responses.websocket import (
+    Closed,
+    PlayerUpdate,
+    Ready,
+    Stats,
+    TrackEnd,
+    TrackException,
+    TrackStart,
+    TrackStuck,
+)
+from pylav.type_hints.dict_typing import JSON_DICT_TYPE
+from pylav.type_hints.generics import ANY_GENERIC_TYPE
+
+# Types that cannot be built field by field, the plugin info keeps every key it is given
+_DECODER_OVERRIDES: dict[type, Callable[[Any], Any]] = {
+    TrackPluginInfo: lambda data: TrackPluginInfo(kwargs=data),
+}
+
+# Errors raised by a generated decoder when the payload does not have the expected shape
+_SHAPE_ERRORS = (KeyError, TypeError, AttributeError, ValueError)
+
+
+def _nested_dataclass(hint: Any) -> tuple[type | None, bool]:
+    """Get the dataclass a field holds and whether it can be None, (None, False) for anything else"""
+    if dataclasses.is_dataclass(hint) or hint in _DECODER_OVERRIDES:
+        return hint, False
+    if isinstance(hint, types.UnionType) or typing.get_origin(hint) is typing.Union:
+        args = [arg for arg in typing.get_args(hint) if arg is not type(None)]
+        if len(args) == 1 and len(typing.get_args(hint)) == 2:
+            nested, __ = _nested_dataclass(args[0])
+            return nested, nested is not None
+    return None, False
+
+
+def compile_decoder(data_class: type[ANY_GENERIC_TYPE]) -> Callable[[JSON_DICT_TYPE], ANY_GENERIC_TYPE]:
+    """Generate a function building the dataclass from a dict without going through dacite.
+
+    The function reads each field straight from the dict and calls the decoders of the nested dataclasses,
+    any other value (lists, dicts, unions of several types) is passed through as is. Unlike dacite, the
+    values are not type checked.
+
+    Parameters
+    ----------
+    data_class: type[ANY_GENERIC_TYPE]
+        The dataclass to build.
+
+    Returns
+    -------
+    Callable[[JSON_DICT_TYPE], ANY_GENERIC_TYPE]
+        The decoder, it raises KeyError or TypeError when the dict does not have the shape of the dataclass.
+    """
+    if data_class in _DECODER_OVERRIDES:
+        return _DECODER_OVERRIDES[data_class]
+    hints = typing.get_type_hints(data_class)
+    namespace: dict[str, Any] = {"data_class": data_class, "MISSING": dataclasses.MISSING}
+    arguments = []
+    for i, field in enumerate(dataclasses.fields(data_class)):
+        if not field.init:
+            continue
+        nested, optional = _nested_dataclass(hints[field.name])
+        if nested is None:
+            value = "value"
+        else:
+            namespace[f"decode_{i}"] = compile_decoder(nested)
+            value = f"None if value is None else decode_{i}(value)" if optional else f"decode_{i}(value)"
+        if field.default is dataclasses.MISSING and field.default_factory is dataclasses.MISSING:
+            arguments.append(f"    value = data[{field.name!r}]\n    kwargs[{field.name!r}] = {value}")
+        else:
+            # Leave the missing optional fields out so that the dataclass fills in its own default
+            arguments.append(
+                f"    if (value := data.get({field.name!r}, MISSING)) is not MISSING:\n"
+                f"        kwargs[{field.name!r}] = {value}"
+            )
+    source = "def decode(data):\n    kwargs = {}\n" + "\n".join(arguments) + "\n    return data_class(**kwargs)\n"
+    exec(compile(source, f"<decoder {data_class.__qualname__}>", "exec"), namespace)  # noqa: S102
+    return namespace["decode"]
+
+
+class Decoder:
+    """Builds a dataclass from a dict with a generated decoder, falling back to dacite for unexpected shapes.
+
+    Parameters
+    ----------
+    data_class: type[ANY_GENERIC_TYPE]
+        The dataclass to build.
+    """
+
+    __slots__ = ("data_class", "_decode")
+
+    def __init__(self, data_class: type[ANY_GENERIC_TYPE]) -> None:
+        self.data_class = data_class
+        self._decode = compile_decoder(data_class)
+
+    def __call__(self, data: JSON_DICT_TYPE) -> ANY_GENERIC_TYPE:
+        try:
+            return self._decode(data)
+        except _SHAPE_ERRORS:
+            return from_dict(data_class=self.data_class, data=data)
+
+
+# The decoder of the track objects returned by the Lavalink v4 REST API
+TRACK_DECODER = Decoder(Track)
+# The decoders of the Lavalink v4 websocket messages, keyed by op and then by event type
+PLAYER_UPDATE_DECODER = Decoder(PlayerUpdate)
+STATS_DECODER = Decoder(Stats)
+READY_DECODER = Decoder(Ready)
+EVENT_DECODERS: dict[str, Decoder] = {
+    "TrackStartEvent": Decoder(TrackStart),
+    "TrackEndEvent": Decoder(TrackEnd),
+    "TrackExceptionEvent": Decoder(TrackException),
+    "TrackStuckEvent": Decoder(TrackStuck),
+    "WebSocketClosedEvent": Decoder(Closed),
+    "SegmentsLoaded": Decoder(SegmentsLoaded),
+    "SegmentSkipped": Decoder(SegmentSkipped),
+}
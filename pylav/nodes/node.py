@@ -20,6 +20,7 @@ from yarl import URL
 
 from pylav.compat import json
 from pylav.constants.builtin_nodes import BUNDLED_NODES_IDS_HOST_MAPPING, PYLAV_NODES
+from pylav.constants.config import NODE_MAX_CONCURRENT_LOADS
 from pylav.constants.coordinates import REGION_TO_COUNTRY_COORDINATE_MAPPING
 from pylav.constants.node import GOOD_RESPONSE_RANGE, MAX_SUPPORTED_API_MAJOR_VERSION
 from pylav.constants.node_features import SUPPORTED_FEATURES, SUPPORTED_SOURCES
@@ -36,7 +37,7 @@ from pylav.nodes.api.responses.plugins import lyrics as lyrics_responses
 from pylav.nodes.api.responses.rest_api import PlaylistData
 from pylav.nodes.api.responses.route_planner import Status as RoutePlannerStart
 from pylav.nodes.api.responses.track import Track
-from pylav.nodes.utils import EMPTY_RESPONSE, Stats
+from pylav.nodes.utils import EMPTY_RESPONSE, Stats, detach_response
 from pylav.nodes.websocket import WebSocket
 from pylav.players.filters import (
     ChannelMix,
@@ -170,6 +171,10 @@ class Node:
         self.__cli_flags = getattr("manager._client.bot", "_cli_flags", None)
 
         self._stats = None
+        # Identical loadtracks requests running concurrently on this node share a single request
+        self._loadtracks_in_flight: dict[str, asyncio.Task[rest_api.LoadTrackResponses]] = {}
+        self._loadtracks_coalesced = 0
+        self._load_limiter = asyncio.Semaphore(NODE_MAX_CONCURRENT_LOADS)
 
         self._ready = asyncio.Event()
         self._ws = WebSocket(
@@ -237,6 +242,21 @@ class Node:
                     return
                 await self._unhealthy()
 
+    @property
+    def coalesced_loadtracks(self) -> int:
+        """The number of loadtracks calls that were served by an identical request already in flight."""
+        return self._loadtracks_coalesced
+
+    @property
+    def load_limiter(self) -> asyncio.Semaphore:
+        """Limits how many track loads a bulk resolution can have in flight on this node at once."""
+        return self._load_limiter
+
+    @property
+    def in_flight_loadtracks(self) -> int:
+        """The number of distinct loadtracks requests currently in flight."""
+        return len(self._loadtracks_in_flight)
+
     @property
     def version(self) -> Version | None:
         """The version of the node."""
@@ -989,7 +1009,10 @@ class Node:
         self, query: Query, first: bool = False
     ) -> rest_api.PlaylistResponse | rest_api.SearchResponse | rest_api.TrackResponse | None:
         """Gets a query from the query cache."""
-        response = await self.node_manager.client.query_cache_manager.fetch_query(query)
+        query_cache_manager = self.node_manager.client.query_cache_manager
+        if (parsed := query_cache_manager.fetch_parsed(query, first=first)) is not None:
+            return parsed
+        response = await query_cache_manager.fetch_query(query)
         if not response:
             return
         load_type = "playlist" if query.is_playlist or query.is_album else "search" if query.is_search else "track"
@@ -1004,13 +1027,6 @@ class Node:
         if cached_query is None:
             return
         if tracks := cached_query["tracks"]:
-            try:
-                if tracks and first:
-                    tracks = [tracks[0]]
-            except Exception:  # noqa
-                tracks = []
-                load_type = "error"
-
             data = {"loadType": load_type, "data": None}
             match data["loadType"]:
                 case "playlist":
@@ -1023,12 +1039,9 @@ class Node:
                     data["data"] = tracks
                 case "track":
                     data["data"] = tracks[0]
-                case "empty":
-                    data["data"] = None
-                case "error":
-                    data["data"] = {"cause": "No tracks returned", "severity": "common", "message": "No tracks found"}
-            response = self.parse_loadtrack_response(data)
-            return response
+            parsed = self.parse_loadtrack_response(data)
+            query_cache_manager.cache_parsed(query, parsed)
+            return detach_response(parsed, first=first)
 
     @property
     def base_url(self) -> URL:
@@ -1262,10 +1275,31 @@ class Node:
     async def fetch_loadtracks(self, query: Query) -> rest_api.LoadTrackResponses:
         """|coro|
         Fetches the loadtracks response from the target node.
+
+        Concurrent calls for the same query share a single request, and the response is only cached once.
         """
         if not self.available or not self.has_source(query.requires_capability):
             return dataclasses.replace(EMPTY_RESPONSE)
 
+        key = query.query_identifier
+        if (task := self._loadtracks_in_flight.get(key)) is not None:
+            self._loadtracks_coalesced += 1
+            self._logger.trace("Coalesced loadtracks request for %s", query)
+        else:
+            task = asyncio.create_task(self._fetch_loadtracks(query))
+            self._loadtracks_in_flight[key] = task
+            task.add_done_callback(functools.partial(self._loadtracks_done, key))
+        # Shielded so that a cancelled caller doesn't cancel the request for everyone else waiting on it
+        return await asyncio.shield(task)
+
+    def _loadtracks_done(self, key: str, task: asyncio.Task[rest_api.LoadTrackResponses]) -> None:
+        if self._loadtracks_in_flight.get(key) is task:
+            del self._loadtracks_in_flight[key]
+        if not task.cancelled():
+            # Retrieve the exception so that it isn't reported as unhandled if every caller was cancelled
+            task.exception()
+
+    async def _fetch_loadtracks(self, query: Query) -> rest_api.LoadTrackResponses:
         async with self._session.get(
             self.get_endpoint_loadtracks(),
             params={"identifier": query.query_identifier},
@@ -1274,6 +1308,7 @@ class Node:
                 result = await res.json(loads=json.loads)
                 self._logger.trace("Loaded track: %s response: %s", query, result)
                 response = self.parse_loadtrack_response(result)
+                self.node_manager.client.query_cache_manager.cache_parsed(query, detach_response(response))
                 asyncio.create_task(self.node_manager.client.query_cache_manager.add_query(query, response))
                 self._manager.client.dispatch_event(LavalinkLoadtracksEvent(node=self, response=response))
                 return response
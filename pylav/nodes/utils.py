@@ -1,19 +1,67 @@
 from __future__ import annotations
 
+import dataclasses
 from typing import TYPE_CHECKING
 
+from pylav.nodes.api.responses import rest_api
 from pylav.nodes.api.responses.rest_api import EmptyResponse
 from pylav.nodes.api.responses.websocket import Stats as StatsMessage
 
 if TYPE_CHECKING:
     from pylav.nodes.node import Node
 
+# The approximate memory used by a response and by each of its tracks on top of their encoded strings
+_RESPONSE_OVERHEAD_BYTES = 256
+_TRACK_OVERHEAD_BYTES = 512
+
 
 async def sort_key_nodes(node: Node, region: str = None) -> float:
     """The sort key for nodes."""
     return await node.penalty_with_region(region)
 
 
+def detach_response(response: rest_api.LoadTrackResponses, first: bool = False) -> rest_api.LoadTrackResponses:
+    """Copy the track list of a shared loadtracks response so that it can be handed out safely.
+
+    Parameters
+    ----------
+    response: LoadTrackResponses
+        The response to copy.
+    first: :class:`bool`
+        Whether to only keep the first track of the response.
+    """
+    match response.loadType:
+        case "playlist":
+            tracks = response.data.tracks[:1] if first else list(response.data.tracks)
+            return dataclasses.replace(response, data=dataclasses.replace(response.data, tracks=tracks))
+        case "search":
+            return dataclasses.replace(response, data=response.data[:1] if first else list(response.data))
+    return response
+
+
+def estimate_response_size(response: rest_api.LoadTrackResponses) -> int:
+    """Cheaply estimate the memory used by a loadtracks response in bytes.
+
+    The encoded string of a track holds every field of its info, so their lengths are used instead of walking the
+    whole object graph.
+
+    Parameters
+    ----------
+    response: LoadTrackResponses
+        The response to estimate the size of.
+    """
+    match response.loadType:
+        case "track":
+            tracks = [response.data]
+        case "playlist":
+            tracks = response.data.tracks
+        case "search":
+            tracks = response.data
+        case __:
+            tracks = []
+    return _RESPONSE_OVERHEAD_BYTES + sum(len(track.encoded) + _TRACK_OVERHEAD_BYTES for track in tracks)
+
+
 class Penalty:
     """Represents the penalty of the stats of a Node"""
 
@@ -3,15 +3,21 @@ from __future__ import annotations
 import asyncio
 import contextlib
 import datetime
+import time
 import typing
 from typing import Any
 
 import aiohttp
-from dacite import from_dict
 from packaging.version import Version
 
 from pylav.compat import json
 from pylav.constants.builtin_nodes import PYLAV_NODES
+from pylav.constants.misc import (
+    WEBSOCKET_INBOX_SIZE,
+    WEBSOCKET_PENDING_EVENTS_GUILDS,
+    WEBSOCKET_PENDING_EVENTS_PER_GUILD,
+    WEBSOCKET_PENDING_EVENTS_TTL,
+)
 from pylav.events.node import WebSocketClosedEvent
 from pylav.events.plugins import SegmentSkippedEvent, SegmentsLoadedEvent
 from pylav.events.track import TrackEndEvent, TrackExceptionEvent, TrackStartEvent, TrackStuckEvent
@@ -45,9 +51,11 @@ from pylav.exceptions.request import HTTPException
 from pylav.helpers.misc import ExponentialBackoffWithReset
 from pylav.helpers.time import get_now_utc
 from pylav.logging import getLogger
+from pylav.nodes.api.decoders import EVENT_DECODERS, PLAYER_UPDATE_DECODER, READY_DECODER, STATS_DECODER
 from pylav.nodes.api.responses.plugins import SegmentSkipped, SegmentsLoaded
 from pylav.nodes.api.responses.websocket import (
     Closed,
+    Message,
     PlayerUpdate,
     Ready,
     Stats,
@@ -92,6 +100,11 @@ class WebSocket:
         "_connecting",
         "_player_reconnect_tasks",
         "_logger",
+        "_inbox",
+        "_inbox_ready",
+        "_inbox_drained",
+        "_inbox_task",
+        "_pending_events",
     )
 
     def __init__(
@@ -134,6 +147,15 @@ class WebSocket:
         self._manual_shutdown = False
         self._connecting = False
         self._player_reconnect_tasks: dict[int : asyncio.Task] = {}
+        # Messages read from the socket and not handled yet, handled in batches by the inbox task
+        self._inbox: list[JSON_DICT_TYPE] = []
+        self._inbox_ready = asyncio.Event()
+        # Set once the messages read so far have been handled, the reads wait on it when the inbox is full
+        self._inbox_drained = asyncio.Event()
+        self._inbox_drained.set()
+        self._inbox_task: asyncio.Task | None = None
+        # Events received for guilds without a player, by guild ID, with the time they were received at
+        self._pending_events: dict[int, list[tuple[float, Message]]] = {}
 
     def _done_callback(self, task: asyncio.Task) -> None:
         with contextlib.suppress(asyncio.CancelledError):
@@ -336,6 +358,9 @@ class WebSocket:
 
     async def _listen(self) -> None:
         """Listens for websocket messages"""
+        if self._inbox_task is None or self._inbox_task.done():
+            self._inbox_task = asyncio.create_task(self._process_inbox())
+            self._inbox_task.set_name(f"PyLav WebSocket inbox - {self.node.name}")
         try:
             async for msg in self._ws:
                 if self._manual_shutdown:
@@ -349,7 +374,12 @@ class WebSocket:
                     await self._websocket_closed(msg.data, msg.extra)
                     return
                 else:
-                    await self.handle_message(msg.json(loads=json.loads))
+                    self._inbox.append(msg.json(loads=json.loads))
+                    self._inbox_ready.set()
+                    if len(self._inbox) >= WEBSOCKET_INBOX_SIZE:
+                        # Stop reading until the handler catches up, the unread messages wait in the socket buffer
+                        self._inbox_drained.clear()
+                        await self._inbox_drained.wait()
                 # elif msg.type == aiohttp.WSMsgType.ERROR and not self.client.is_shutting_down:
                 #     exc = self._ws.exception()
                 #     self._logger.error("Exception in WebSocket! %s", exc)
@@ -386,6 +416,55 @@ class WebSocket:
         self._connect_task = asyncio.ensure_future(self.connect())
         self._connect_task.add_done_callback(self._done_callback)
 
+    async def _process_inbox(self) -> None:
+        """Handles the messages read from the socket, everything received since the last pass is handled as one batch"""
+        try:
+            while True:
+                await self._inbox_ready.wait()
+                self._inbox_ready.clear()
+                messages, self._inbox = self._inbox, []
+                try:
+                    # Hold off while the event queues are full so that a burst slows down the reads from the socket
+                    await self.client.dispatch_manager.wait_for_room()
+                    await self.handle_messages(messages)
+                except Exception:  # noqa
+                    if not self.client.is_shutting_down:
+                        self._logger.exception("Exception while handling WebSocket messages!")
+                if not self._inbox:
+                    self._inbox_drained.set()
+        finally:
+            # Never leave the reads waiting on a handler that is gone
+            self._inbox_drained.set()
+
+    async def handle_messages(self, messages: list[JSON_DICT_TYPE]) -> None:
+        """
+        Handles a burst of messages from the websocket.
+
+        Only the newest player update of each guild is kept, they are applied in a single pass once the other
+        messages have been handled. The update of a guild still held back is applied before any event of that guild,
+        so that it never lands on top of the state the event leads to.
+
+        Parameters
+        ----------
+        messages: list[JSON_DICT_TYPE]
+            The messages given from Lavalink, oldest first.
+        """
+        updates: dict[str, JSON_DICT_TYPE] = {}
+        for data in messages:
+            if data["op"] == "playerUpdate":
+                updates[data["guildId"]] = data
+                continue
+            if (guild_id := data.get("guildId")) is not None and (update := updates.pop(guild_id, None)) is not None:
+                self.apply_player_updates([PLAYER_UPDATE_DECODER(update)])
+            try:
+                await self.handle_message(data)
+            except Exception:  # noqa
+                if self.client.is_shutting_down:
+                    return
+                self._logger.exception("Exception while handling WebSocket message %s", data["op"])
+        if updates:
+            self.apply_player_updates([PLAYER_UPDATE_DECODER(data) for data in updates.values()])
+
     async def handle_message(self, data: JSON_DICT_TYPE) -> None:
         """
         Handles the response from the websocket.
@@ -397,34 +476,16 @@ class WebSocket:
         """
         match data["op"]:
             case "playerUpdate":
-                data = from_dict(data_class=PlayerUpdate, data=data)
-                await self.handle_player_update(data)
+                await self.handle_player_update(PLAYER_UPDATE_DECODER(data))
             case "stats":
-                data = from_dict(data_class=Stats, data=data)
-                await self.handle_stats(data)
+                await self.handle_stats(STATS_DECODER(data))
             case "event":
-                match data["type"]:
-                    case "TrackStartEvent":
-                        data = from_dict(data_class=TrackStart, data=data)
-                    case "TrackEndEvent":
-                        data = from_dict(data_class=TrackEnd, data=data)
-                    case "TrackExceptionEvent":
-                        data = from_dict(data_class=TrackException, data=data)
-                    case "TrackStuckEvent":
-                        data = from_dict(data_class=TrackStuck, data=data)
-                    case "WebSocketClosedEvent":
-                        data = from_dict(data_class=Closed, data=data)
-                    case "SegmentsLoaded":
-                        data = from_dict(data_class=SegmentsLoaded, data=data)
-                    case "SegmentSkipped":
-                        data = from_dict(data_class=SegmentSkipped, data=data)
-                    case __:
-                        self._logger.warning("Received unknown event: %s - ignoring it", data["type"])
-                        return
-                await self.handle_event(data)
+                if (decoder := EVENT_DECODERS.get(data["type"])) is None:
+                    self._logger.warning("Received unknown event: %s - ignoring it", data["type"])
+                    return
+                await self.handle_event(decoder(data))
             case "ready":
-                data = from_dict(data_class=Ready, data=data)
-                await self.handle_ready(data)
+                await self.handle_ready(READY_DECODER(data))
             case __:
                 self._logger.warning("Received unknown op: %s", data["op"])
 
@@ -450,20 +511,33 @@ class WebSocket:
             The data given from Lavalink.
         """
 
-        if player := self.client.player_manager.get(int(data.guildId)):
+        self.apply_player_updates([data])
+
+    def apply_player_updates(self, updates: list[PlayerUpdate]) -> None:
+        """
+        Applies the player update messages from the websocket.
+
+        Parameters
+        ----------
+        updates: list[PlayerUpdate]
+            The newest update of each guild.
+        """
+        stale_before = get_now_utc() - datetime.timedelta(minutes=5)
+        for data in updates:
+            if not (player := self.client.player_manager.get(int(data.guildId))):
+                continue
             if (
                 (not data.state.connected)
                 and player.is_active
                 and self.ready.is_set()
-                and player.connected_at < get_now_utc() - datetime.timedelta(minutes=5)
+                and player.connected_at < stale_before
             ):
                 if player.guild.id in self._player_reconnect_tasks:
                     self._player_reconnect_tasks[player.guild.id].cancel()
                 self._player_reconnect_tasks[player.guild.id] = asyncio.create_task(self.maybe_reconnect_player(player))
-                return
-            await player._update_state(data.state)
-        else:
-            return
+                continue
+            # noinspection PyProtectedMember
+            player._apply_state(data.state)
 
     async def maybe_reconnect_player(self, player: Player) -> None:
         """
@@ -526,13 +600,7 @@ class WebSocket:
             return
         player = self.client.player_manager.get(int(data.guildId))
         if not player:
-            await asyncio.sleep(3)
-            player = self.client.player_manager.get(int(data.guildId))
-        if not player:
-            self._logger.debug(
-                "Received event for non-existent player! Guild ID: %s",
-                data.guildId,
-            )
+            self._park_event(data)
             return
         track = await self._get_track(data, player)
         match data.type:
@@ -580,6 +648,42 @@ class WebSocket:
 
         self.client.dispatch_event(event)
 
+    def _park_event(self, data: Message) -> None:
+        """Holds an event received for a guild without a player until the player is created"""
+        guild_id = int(data.guildId)
+        self._logger.debug("Received event for non-existent player, holding on to it - Guild ID: %s", guild_id)
+        if (events := self._pending_events.pop(guild_id, None)) is None:
+            events = []
+            if len(self._pending_events) >= WEBSOCKET_PENDING_EVENTS_GUILDS:
+                # Forget the guild that has been waiting the longest
+                del self._pending_events[next(iter(self._pending_events))]
+        events.append((time.monotonic(), data))
+        # Re-inserted so that the guilds stay ordered by their latest event
+        self._pending_events[guild_id] = events[-WEBSOCKET_PENDING_EVENTS_PER_GUILD:]
+
+    def flush_pending_events(self, guild_id: int) -> None:
+        """
+        Handles the events held for the guild, called once its player has been created.
+
+        Parameters
+        ----------
+        guild_id: :class:`int`
+            The guild ID of the player.
+        """
+        if not (events := self._pending_events.pop(guild_id, None)):
+            return
+        expired_before = time.monotonic() - WEBSOCKET_PENDING_EVENTS_TTL
+        if events := [data for received_at, data in events if received_at >= expired_before]:
+            task = asyncio.create_task(self._replay_events(events))
+            task.set_name(f"PyLav WebSocket pending events - {guild_id}")
+
+    async def _replay_events(self, events: list[Message]) -> None:
+        for data in events:
+            try:
+                await self.handle_event(data)
+            except Exception:  # noqa
+                self._logger.exception("Exception while handling held event %s", data.type)
+
     async def _get_track(self, data, player) -> Track | None:
         if not isinstance(data, (TrackStart, TrackEnd, TrackException, TrackStuck)):
             return
@@ -674,6 +778,9 @@ class WebSocket:
     async def close(self) -> None:
         """Closes the websocket connection."""
         self._connect_task.cancel()
+        if self._inbox_task is not None:
+            self._inbox_task.cancel()
+        self._pending_events.clear()
         if self._ws and not self._ws.closed and not self._ws._closing:
             await self._ws.close(code=4014, message=b"Shutting down")
         await self._session.close()
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+from collections.abc import Hashable
+
+
+class DeadlineHeap:
+    """A priority queue of deadlines where each key has at most one live deadline.
+
+    Re-arming or disarming a key does not touch the heap, the outdated entries are dropped lazily when they
+    reach the top or when they outnumber the live ones.
+    """
+
+    __slots__ = ("_heap", "_live", "_counter")
+
+    def __init__(self) -> None:
+        self._heap: list[tuple[float, int, Hashable]] = []
+        # The deadline and entry number of the live entry of each key
+        self._live: dict[Hashable, tuple[float, int]] = {}
+        self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._live
+
+    def get(self, key: Hashable) -> float | None:
+        """Get the deadline of the key, None if it is not armed"""
+        return entry[0] if (entry := self._live.get(key)) else None
+
+    def arm(self, key: Hashable, when: float) -> None:
+        """Set the deadline of the key, replacing the previous one"""
+        if (entry := self._live.get(key)) and entry[0] == when:
+            return
+        number = next(self._counter)
+        self._live[key] = (when, number)
+        heapq.heappush(self._heap, (when, number, key))
+        if len(self._heap) > 2 * len(self._live) + 64:
+            self._compact()
+
+    def disarm(self, key: Hashable) -> None:
+        """Remove the deadline of the key, if any"""
+        self._live.pop(key, None)
+
+    def next_deadline(self) -> float | None:
+        """Get the earliest live deadline, None if nothing is armed"""
+        self._drop_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: float) -> list[Hashable]:
+        """Disarm and return the keys whose deadline is at or before now, earliest first"""
+        due = []
+        while self._drop_stale() and self._heap[0][0] <= now:
+            __, __, key = heapq.heappop(self._heap)
+            del self._live[key]
+            due.append(key)
+        return due
+
+    def clear(self) -> None:
+        """Disarm every key"""
+        self._heap.clear()
+        self._live.clear()
+
+    def _drop_stale(self) -> bool:
+        heap = self._heap
+        while heap and self._live.get(heap[0][2], (None, None))[1] != heap[0][1]:
+            heapq.heappop(heap)
+        return bool(heap)
+
+    def _compact(self) -> None:
+        self._heap = [(when, number, key) for key, (when, number) in self._live.items()]
+        heapq.heapify(self._heap)
@@ -1,22 +1,29 @@
 from __future__ import annotations
 
 import asyncio
+import collections
 import contextlib
+import functools
 import pathlib
-from collections.abc import Iterator
+import time
+from collections.abc import Awaitable, Callable, Iterator
 from typing import TYPE_CHECKING
 
 import asyncpg
 import discord
 
-from pylav.constants.config import ENABLE_NODE_RESUMING
+from pylav.constants.config import ENABLE_NODE_RESUMING, PLAYER_RESTORE_CONCURRENCY, PLAYER_RESTORE_NODE_RATE
+from pylav.constants.misc import PLAYER_CHECK_RECONCILE_INTERVAL, PLAYER_CHECK_RETRY_DELAY
 from pylav.events.player import PlayerConnectedEvent
 from pylav.exceptions.node import NoNodeAvailableException
 from pylav.helpers.format.strings import shorten_string
+from pylav.helpers.misc import TimedFeature
 from pylav.logging import getLogger
 from pylav.nodes.node import Node
+from pylav.players.deadlines import DeadlineHeap
 from pylav.players.player import Player
 from pylav.players.query.obj import Query
+from pylav.players.restore import NodeThrottle, RestoreProgress
 from pylav.storage.models.player.config import PlayerConfig
 from pylav.storage.models.player.state import PlayerState
 
@@ -55,7 +62,18 @@ class PlayerController:
         The client that the player manager is initialized with.
     """
 
-    __slots__ = ("_players", "default_player_class", "bot", "client", "_global_player_config")
+    __slots__ = (
+        "_players",
+        "default_player_class",
+        "bot",
+        "client",
+        "_global_player_config",
+        "_restore_progress",
+        "_deadlines",
+        "_pending_checks",
+        "_checks_wakeup",
+        "_checks_task",
+    )
 
     _global_player_config: PlayerConfig
 
@@ -67,6 +85,12 @@ class PlayerController:
         self.bot = lavalink.bot
         self._players: dict[int, Player] = {}
         self.default_player_class = player
+        self._restore_progress = RestoreProgress()
+        # One deadline per guild, the earliest countdown of its idle checks
+        self._deadlines = DeadlineHeap()
+        self._pending_checks: set[int] = set()
+        self._checks_wakeup = asyncio.Event()
+        self._checks_task: asyncio.Task | None = None
 
     def __len__(self):
         return len(self._players)
@@ -80,6 +104,11 @@ class PlayerController:
         """Returns a dictionary of all players in manager."""
         return self._players
 
+    @property
+    def restore_progress(self) -> RestoreProgress:
+        """Returns the progress of the restore of the player states saved before the last shutdown"""
+        return self._restore_progress
+
     @property
     def global_config(self) -> PlayerConfig:
         return self._global_player_config
@@ -121,6 +150,30 @@ class PlayerController:
             coalesce=True,
             id=f"{self.bot.user.id}-update_bot_activity",
         )
+        self.client.scheduler.add_job(
+            self.persist_player_states,
+            trigger="interval",
+            seconds=10,
+            max_instances=1,
+            replace_existing=True,
+            name="persist_player_states",
+            coalesce=True,
+            id=f"{self.bot.user.id}-persist_player_states",
+        )
+        self.client.scheduler.add_job(
+            self.reconcile_player_checks,
+            trigger="interval",
+            seconds=PLAYER_CHECK_RECONCILE_INTERVAL,
+            max_instances=1,
+            replace_existing=True,
+            name="reconcile_player_checks",
+            coalesce=True,
+            id=f"{self.bot.user.id}-reconcile_player_checks",
+        )
+        self.bot.add_listener(self.on_pylav_voice_state_update, name="on_voice_state_update")
+        if self._checks_task is None or self._checks_task.done():
+            self._checks_task = asyncio.create_task(self._run_player_checks())
+            self._checks_task.set_name("PyLav player checks")
 
     async def destroy(self, guild_id: int, requester: discord.Member | None):
         """
@@ -202,6 +255,7 @@ class PlayerController:
         self_deaf: bool = None,
         requester: discord.Member = None,
         feature: str | None = None,
+        throttle: Callable[[Node], Awaitable[None]] | None = None,
     ) -> Player:
         """
         Creates a player if one doesn't exist with the given information.
@@ -225,6 +279,9 @@ class PlayerController:
             The feature to look for for the initial Node. Defaults to `None`.
         self_deaf: :class:`bool`
             Whether the player should deafen themselves. Defaults to `False`.
+        throttle: Optional[Callable[[:class:`Node`], Awaitable[None]]]
+            Awaited with the selected node before the player is set up on it, to rate limit the players created
+            on each node. Defaults to `None`.
         Returns
         -------
         :class:`Player`
@@ -256,9 +313,14 @@ class PlayerController:
             )
             if not best_node:
                 raise NoNodeAvailableException(_("There are no nodes available currently."))
+            if throttle is not None:
+                await throttle(best_node)
             await player.post_init(
                 node=best_node, player_manager=self, config=player_config, pylav=self.client, requester=requester
             )
+            for node in self.client.node_manager.nodes:
+                if node.websocket is not None:
+                    node.websocket.flush_pending_events(channel.guild.id)
             await player.move_to(
                 requester, channel=player.channel, self_deaf=self_deafen if self_deaf is None else self_deaf
             )
@@ -274,9 +336,96 @@ class PlayerController:
 
     async def save_all_players(self) -> None:
         LOGGER.debug("Saving player states")
-        await self.client.player_state_db_manager.save_players(
-            [await p.to_dict() for p in self.connected_players if p.is_active]
-        )
+        await self.client.player_state_db_manager.persist_players(self.connected_players)
+
+    async def persist_player_states(self) -> None:
+        """Write the state of every connected player that changed since it was last saved"""
+        with contextlib.suppress(
+            asyncio.exceptions.CancelledError, NoNodeAvailableException, asyncpg.exceptions.CannotConnectNowError
+        ):
+            await self.client.player_state_db_manager.persist_players(self.connected_players)
+
+    def schedule_checks(self, *guild_ids: int) -> None:
+        """Run the auto pause, resume and disconnect checks of the given guilds as soon as possible"""
+        self._pending_checks.update(guild_ids)
+        self._checks_wakeup.set()
+
+    async def reconcile_player_checks(self) -> None:
+        """Check every player, catches config changes and anything that changed without an event"""
+        self.schedule_checks(*self.players)
+
+    async def on_pylav_voice_state_update(
+        self, member: discord.Member, before: discord.VoiceState, after: discord.VoiceState
+    ) -> None:
+        """Check the player of the guild when someone joins or leaves a voice channel"""
+        if before.channel != after.channel and member.guild.id in self.players:
+            self.schedule_checks(member.guild.id)
+
+    async def _run_player_checks(self) -> None:
+        """Check the players flagged by an event or whose deadline is due, then sleep until the next one"""
+        while True:
+            self._checks_wakeup.clear()
+            due = self._pending_checks
+            self._pending_checks = set()
+            due.update(self._deadlines.pop_due(time.time()))
+            if not due:
+                timeout = None if (when := self._deadlines.next_deadline()) is None else max(0.0, when - time.time())
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(self._checks_wakeup.wait(), timeout)
+                continue
+            try:
+                # The global settings take precedence when enabled, fetch them once for the whole batch
+                alone_pause = await self.global_config.fetch_alone_pause()
+                alone_dc = await self.global_config.fetch_alone_dc()
+                empty_queue_dc = await self.global_config.fetch_empty_queue_dc()
+            except Exception as exc:
+                LOGGER.warning("Failed to fetch the idle settings, retrying shortly", exc_info=exc)
+                for guild_id in due:
+                    self._deadlines.arm(guild_id, time.time() + PLAYER_CHECK_RETRY_DELAY)
+                continue
+            for guild_id in due:
+                if (player := self.players.get(guild_id)) is None:
+                    self._deadlines.disarm(guild_id)
+                    continue
+                try:
+                    await self._check_player(player, alone_pause, alone_dc, empty_queue_dc)
+                except Exception as exc:
+                    LOGGER.warning("Failed to run the checks of %s", player, exc_info=exc)
+                    self._deadlines.arm(guild_id, time.time() + PLAYER_CHECK_RETRY_DELAY)
+
+    async def _check_player(
+        self, player: Player, alone_pause: TimedFeature, alone_dc: TimedFeature, empty_queue_dc: TimedFeature
+    ) -> None:
+        guild_id = player.guild.id
+        if not player.ready.is_set() or not player.is_connected:
+            self._deadlines.disarm(guild_id)
+            return
+        # Served from the in-memory snapshot of the player config
+        if not alone_pause.enabled:
+            alone_pause = await player.config.fetch_alone_pause()
+        if not alone_dc.enabled:
+            alone_dc = await player.config.fetch_alone_dc()
+        if not empty_queue_dc.enabled:
+            empty_queue_dc = await player.config.fetch_empty_queue_dc()
+        await player.auto_pause_task(alone_pause)
+        await player.auto_resume_task(alone_pause)
+        await player.auto_empty_queue_task(empty_queue_dc)
+        await player.auto_dc_task(alone_dc)
+        # The tasks start or reset their countdowns, wake up again when the first one runs out
+        # noinspection PyProtectedMember
+        countdowns = [
+            started + feature.time
+            for started, feature in (
+                (player._last_alone_paused_check, alone_pause),
+                (player._last_empty_queue_check, empty_queue_dc),
+                (player._last_alone_dc_check, alone_dc),
+            )
+            if started
+        ]
+        if countdowns:
+            self._deadlines.arm(guild_id, max(min(countdowns), time.time() + PLAYER_CHECK_RETRY_DELAY))
+        else:
+            self._deadlines.disarm(guild_id)
 
     async def restore_player_states(self) -> None:
         # noinspection PyProtectedMember
@@ -284,39 +433,68 @@ class PlayerController:
         LOGGER.info("Restoring player states")
         while not self.client.node_manager.available_nodes:
             await asyncio.sleep(1)
-        tasks = [
-            asyncio.create_task(self._restore_player(p))
-            async for p in self.client.player_state_db_manager.fetch_all_players()
-        ]
-        await asyncio.gather(*tasks, return_exceptions=True)
-        LOGGER.info("Restored %s player states", len(self.players))
+        states = [p async for p in self.client.player_state_db_manager.fetch_all_players()]
+        states.sort(key=self._restore_priority)
+        pending = collections.deque(states)
+        progress = self._restore_progress = RestoreProgress(total=len(states))
+        throttle = NodeThrottle(PLAYER_RESTORE_NODE_RATE)
+
+        async def worker() -> None:
+            while pending:
+                player_state = pending.popleft()
+                try:
+                    if await self._restore_player(player_state, throttle):
+                        progress.restored += 1
+                    else:
+                        progress.skipped += 1
+                except Exception:
+                    progress.failed += 1
+                LOGGER.verbose("Player restore progress: %s", progress.to_dict())
+
+        await asyncio.gather(*(worker() for __ in range(min(PLAYER_RESTORE_CONCURRENCY, len(states)))))
+        progress.finished_at = time.monotonic()
+        LOGGER.info(
+            "Restored %s player states in %.2fs (%s skipped, %s failed)",
+            progress.restored,
+            progress.elapsed,
+            progress.skipped,
+            progress.failed,
+        )
+
+    def _restore_priority(self, player_state: PlayerState) -> tuple[bool, int]:
+        # Players that were playing with the most people listening are restored first
+        channel = self.client.bot.get_channel(player_state.channel_id)
+        listeners = sum(not m.bot for m in getattr(channel, "members", []))
+        return player_state.paused or not player_state.playing, -listeners
 
-    async def _restore_player(self, player_state: PlayerState) -> None:
+    async def _restore_player(self, player_state: PlayerState, throttle: NodeThrottle | None = None) -> bool:
         player = self.players.get(player_state.id)
         if player is not None:
             # Player was started before restore
             LOGGER.debug("Player %s initialized before restore, skipping restore", player_state.id)
             await self.client.player_state_db_manager.delete_player(guild_id=player_state.id)
-            return
+            return False
         channel = self.client.bot.get_channel(player_state.channel_id)
         if not channel:
             # Channel does not exist anymore
             LOGGER.debug("Channel for %s could not be found, skipping player restore", player_state.id)
             await self.client.player_state_db_manager.delete_player(guild_id=player_state.id)
-            return
+            return False
         if not player_state.current:
             # Player was empty
             LOGGER.debug("Player %s does not have a current track, skipping restore", player_state.id)
             await self.client.player_state_db_manager.delete_player(guild_id=player_state.id)
-            return
+            return False
         requester = self.client.bot.user
         try:
-            async with asyncio.timeout(10):
+            async with asyncio.timeout(10) as deadline:
                 discord_player = await self.create(
                     channel=channel,
                     requester=requester,
                     feature=(await Query.from_base64(player_state.current["encoded"], lazy=True)).requires_capability,
                     self_deaf=player_state.self_deaf,
+                    # Waiting for the node does not count towards the timeout
+                    throttle=None if throttle is None else functools.partial(throttle.wait, deadline=deadline),
                 )
         except Exception:
             LOGGER.exception("Failed to restore player %s - %s", player_state.id, player_state.channel_id)
@@ -324,9 +502,15 @@ class PlayerController:
         # noinspection PyProtectedMember
         if not discord_player._restored:
             await discord_player.restore(player_state, requester)
+        return True
 
     async def shutdown(self) -> None:
         LOGGER.info("Shutting down all players")
+        self.bot.remove_listener(self.on_pylav_voice_state_update, name="on_voice_state_update")
+        if self._checks_task is not None:
+            self._checks_task.cancel()
+            self._checks_task = None
+        self._deadlines.clear()
         tasks = [
             asyncio.create_task(self.destroy(guild_id=guild_id, requester=self.client.bot.user))
             for guild_id in self.players
@@ -1,25 +1,21 @@
 from __future__ import annotations
 
 import asyncio
-import collections
 import contextlib
-import datetime
 import pathlib
-import random
 import time
-from collections.abc import Coroutine
-from itertools import islice
+from collections.abc import Callable, Coroutine, Iterable, Sequence
 from typing import TYPE_CHECKING, Any, Literal
 
 import asyncpg
 import discord
-from apscheduler.jobstores.base import JobLookupError
 from dacite import from_dict
 from discord import VoiceProtocol
 from discord.abc import Messageable
 
-from pylav.constants.config import DEFAULT_SEARCH_SOURCE, ENABLE_NODE_RESUMING
+from pylav.constants.config import COMPACT_PLAYER_STATE, DEFAULT_SEARCH_SOURCE, ENABLE_NODE_RESUMING
 from pylav.constants.coordinates import REGION_TO_COUNTRY_COORDINATE_MAPPING
+from pylav.constants.misc import AUTOPLAY_RANDOM_ATTEMPTS
 from pylav.constants.regex import VOICE_CHANNEL_ENDPOINT
 from pylav.enums.plugins.sponsorblock import SegmentCategory
 from pylav.events.node import NodeChangedEvent
@@ -42,6 +38,7 @@ from pylav.events.player import (
 )
 from pylav.events.queue import (
     QueueEndEvent,
+    QueueReorderedEvent,
     QueueShuffledEvent,
     QueueTrackPositionChangedEvent,
     QueueTracksAddedEvent,
@@ -67,6 +64,7 @@ from pylav.exceptions.request import HTTPException
 from pylav.exceptions.track import TrackNotFoundException
 from pylav.extension.radio import RadioBrowser
 from pylav.helpers.format.strings import format_time_dd_hh_mm_ss, format_time_string, shorten_string
+from pylav.helpers.misc import TimedFeature
 from pylav.helpers.time import get_now_utc
 from pylav.logging import getLogger
 from pylav.nodes.api.responses.exceptions import LavalinkException
@@ -92,7 +90,9 @@ from pylav.players.filters import (
 )
 from pylav.players.filters.misc import FilterMixin
 from pylav.players.query.obj import Query
+from pylav.players.tracks.decoder import DECODE_THREAD_THRESHOLD, decode_tracks_local
 from pylav.players.tracks.obj import Track
+from pylav.players.tracks.packing import pack_tracks, unpack_tracks
 from pylav.players.utils import PlayerQueue, TrackHistoryQueue
 from pylav.storage.models.player.config import PlayerConfig
 from pylav.storage.models.player.state import PlayerState
@@ -115,6 +115,20 @@ if TYPE_CHECKING:
     from pylav.core.client import Client
     from pylav.players.manager import PlayerController
 
+# The config entries saved with the player state
+_STATE_CONFIG_FIELDS = (
+    "text_channel_id",
+    "notify_channel_id",
+    "forced_channel_id",
+    "repeat_queue",
+    "repeat_current",
+    "shuffle",
+    "auto_shuffle",
+    "auto_play",
+    "auto_play_playlist_id",
+    "self_deaf",
+)
+
 
 class Player(VoiceProtocol):
     __slots__ = (
@@ -288,6 +302,8 @@ class Player(VoiceProtocol):
         self.node = node
         self._config = config
         self._global_config = player_manager.global_config
+        # Hot path reads of the config are served from memory for the life of the player when read caching is on
+        await config.load_snapshot()
         self._extras = await config.fetch_extras()
         self._post_init_completed = True
 
@@ -305,61 +321,8 @@ class Player(VoiceProtocol):
         else:
             await self._apply_filters_to_new_player(config, player_manager)
 
-        await self._create_job_for_player()
         self.ready.set()
-
-    async def _create_job_for_player(self) -> None:
-        now_time = get_now_utc()
-        self.player_manager.client.scheduler.add_job(
-            self.auto_dc_task,
-            trigger="interval",
-            seconds=5,
-            max_instances=1,
-            id=f"{self.bot.user.id}-{self.guild.id}-auto_dc_task",
-            replace_existing=True,
-            coalesce=True,
-            next_run_time=now_time + datetime.timedelta(seconds=3),
-        )
-        self.player_manager.client.scheduler.add_job(
-            self.auto_empty_queue_task,
-            trigger="interval",
-            seconds=5,
-            max_instances=1,
-            id=f"{self.bot.user.id}-{self.guild.id}-auto_empty_queue_task",
-            replace_existing=True,
-            coalesce=True,
-            next_run_time=now_time + datetime.timedelta(seconds=2),
-        )
-        self.player_manager.client.scheduler.add_job(
-            self.auto_pause_task,
-            trigger="interval",
-            seconds=5,
-            max_instances=1,
-            id=f"{self.bot.user.id}-{self.guild.id}-auto_pause_task",
-            replace_existing=True,
-            coalesce=True,
-            next_run_time=now_time + datetime.timedelta(seconds=1),
-        )
-        self.player_manager.client.scheduler.add_job(
-            self.auto_resume_task,
-            trigger="interval",
-            seconds=5,
-            max_instances=1,
-            id=f"{self.bot.user.id}-{self.guild.id}-auto_resume_task",
-            replace_existing=True,
-            coalesce=True,
-            next_run_time=now_time + datetime.timedelta(seconds=4),
-        )
-        self.player_manager.client.scheduler.add_job(
-            self.auto_save_task,
-            trigger="interval",
-            seconds=10,
-            max_instances=1,
-            id=f"{self.bot.user.id}-{self.guild.id}-auto_save_task",
-            replace_existing=True,
-            coalesce=True,
-            next_run_time=now_time + datetime.timedelta(seconds=10),
-        )
+        self.player_manager.schedule_checks(self.guild.id)
 
     async def _apply_filters_to_new_player(self, config: PlayerConfig, player_manager: PlayerController) -> None:
         self._volume = Volume(await player_manager.client.player_config_manager.get_volume(self.guild.id))
@@ -758,7 +721,7 @@ class Player(VoiceProtocol):
             return pos
         return pos
 
-    async def auto_pause_task(self):
+    async def auto_pause_task(self, feature: TimedFeature | None = None):
         with contextlib.suppress(
             asyncio.exceptions.CancelledError,
         ):
@@ -774,9 +737,8 @@ class Player(VoiceProtocol):
                 (not self.paused)
                 and self.is_empty
                 and (
-                    feature := await self.player_manager.client.player_config_manager.get_alone_pause(
-                        guild_id=self.guild.id
-                    )
+                    feature := feature
+                    or await self.player_manager.client.player_config_manager.get_alone_pause(guild_id=self.guild.id)
                 ).enabled
             ):
                 if not self._last_alone_paused_check:
@@ -798,7 +760,7 @@ class Player(VoiceProtocol):
             else:
                 self._last_alone_paused_check = 0
 
-    async def auto_resume_task(self):
+    async def auto_resume_task(self, feature: TimedFeature | None = None):
         with contextlib.suppress(
             asyncio.exceptions.CancelledError,
         ):
@@ -814,9 +776,8 @@ class Player(VoiceProtocol):
                 self.paused
                 and not self.is_empty
                 and (
-                    feature := await self.player_manager.client.player_config_manager.get_alone_pause(
-                        guild_id=self.guild.id
-                    )
+                    feature := feature
+                    or await self.player_manager.client.player_config_manager.get_alone_pause(guild_id=self.guild.id)
                 ).enabled
             ):
                 self._logger.debug(
@@ -828,7 +789,7 @@ class Player(VoiceProtocol):
                 self._was_alone_paused = False
                 self.player_manager.client.dispatch_event(PlayerAutoResumedEvent(self))
 
-    async def auto_dc_task(self):
+    async def auto_dc_task(self, feature: TimedFeature | None = None):
         with contextlib.suppress(
             asyncio.exceptions.CancelledError, NoNodeAvailableException, asyncpg.exceptions.CannotConnectNowError
         ):
@@ -842,9 +803,8 @@ class Player(VoiceProtocol):
             if (
                 self.is_empty
                 and (
-                    feature := await self.player_manager.client.player_config_manager.get_alone_dc(
-                        guild_id=self.guild.id
-                    )
+                    feature := feature
+                    or await self.player_manager.client.player_config_manager.get_alone_dc(guild_id=self.guild.id)
                 ).enabled
             ):
                 if not self._last_alone_dc_check:
@@ -864,7 +824,7 @@ class Player(VoiceProtocol):
             else:
                 self._last_alone_dc_check = 0
 
-    async def auto_empty_queue_task(self):
+    async def auto_empty_queue_task(self, feature: TimedFeature | None = None):
         with contextlib.suppress(
             asyncio.exceptions.CancelledError, NoNodeAvailableException, asyncpg.exceptions.CannotConnectNowError
         ):
@@ -877,13 +837,13 @@ class Player(VoiceProtocol):
                 return
             if self.current:
                 self._logger.trace("Auto Empty Queue task - Current track is not empty - discarding")
+                self._last_empty_queue_check = 0
                 return
             if (
                 self.queue.empty()
                 and (
-                    feature := await self.player_manager.client.player_config_manager.get_empty_queue_dc(
-                        guild_id=self.guild.id
-                    )
+                    feature := feature
+                    or await self.player_manager.client.player_config_manager.get_empty_queue_dc(guild_id=self.guild.id)
                 ).enabled
             ):
                 if not self._last_empty_queue_check:
@@ -904,19 +864,6 @@ class Player(VoiceProtocol):
             else:
                 self._last_empty_queue_check = 0
 
-    async def auto_save_task(self):
-        with contextlib.suppress(
-            asyncio.exceptions.CancelledError, NoNodeAvailableException, asyncpg.exceptions.CannotConnectNowError
-        ):
-            if not self.is_active:
-                self._logger.trace(
-                    "Auto save task for %s fired while player is not active - discarding",
-                    self,
-                )
-                return
-            self._logger.trace("Auto save task for %s - Saving the player at %s", self, get_now_utc())
-            await self.save()
-
     async def change_to_best_node(
         self, feature: str = None, ops: bool = True, forced: bool = True, skip_position_fetch: bool = False
     ) -> Node | None:
@@ -1127,7 +1074,7 @@ class Player(VoiceProtocol):
             await self.queue.put([at], index=index)
             if index is None:
                 await self.maybe_shuffle_queue(requester=requester)
-            self.next_track = None if self.queue.empty() else self.queue.raw_queue.popleft()
+            self.next_track = self.queue.peek()
             self.node.dispatch_event(QueueTracksAddedEvent(self, self.guild.get_member(requester), [at]))
 
     async def bulk_add(
@@ -1157,7 +1104,7 @@ class Player(VoiceProtocol):
             await self.queue.put(output, index=index)
             if index is None:
                 await self.maybe_shuffle_queue(requester=requester)
-            self.next_track = None if self.queue.empty() else self.queue.raw_queue.popleft()
+            self.next_track = self.queue.peek()
             self.node.dispatch_event(QueueTracksAddedEvent(self, self.guild.get_member(requester), output))
 
     async def previous(self, requester: discord.Member, bypass_cache: bool = False) -> None:
@@ -1207,7 +1154,7 @@ class Player(VoiceProtocol):
                 await self.change_to_best_node(feature=await track.requires_capability(), skip_position_fetch=True)
             self.current = track
             if self.next_track is None and not self.queue.empty():
-                self.next_track = self.queue.raw_queue.popleft()
+                self.next_track = self.queue.peek()
             payload = {"encodedTrack": track.encoded}
             if self.volume_filter:
                 payload["volume"] = self.volume
@@ -1296,7 +1243,7 @@ class Player(VoiceProtocol):
             if not track.encoded:
                 return await self.play(None, None, requester or self.bot.user, node=node)
             self.current = track
-            self.next_track = None if self.queue.empty() else self.queue.raw_queue.popleft()
+            self.next_track = self.queue.peek()
             payload["encodedTrack"] = track.encoded
             if self.volume_filter:
                 payload["volume"] = self.volume
@@ -1359,10 +1306,8 @@ class Player(VoiceProtocol):
 
     async def _process_play_no_track(self, auto_play, track):
         if self.queue.empty():
-            if await self.autoplay_enabled() and (
-                available_tracks := await (await self.get_auto_playlist()).fetch_tracks()
-            ):
-                auto_play, track = await self._process_autoplay_on_play(available_tracks)
+            if await self.autoplay_enabled() and (available_track := await self._fetch_autoplay_track()):
+                auto_play, track = await self._process_autoplay_on_play(available_track)
             else:
                 await self.stop(
                     requester=self.guild.get_member(self.node.node_manager.client.bot.user.id)
@@ -1391,24 +1336,26 @@ class Player(VoiceProtocol):
         self.node.dispatch_event(event)
         await self._handle_event(event)
 
-    async def _process_autoplay_on_play(self, available_tracks):
-        available_tracks = {track["encoded"]: track for track in available_tracks}
-        if tracks_not_in_history := list(set(available_tracks) - set(self.history.raw_b64s)):
-            track = await Track.build_track(
-                node=self.node,
-                data=available_tracks[random.choice(list(tracks_not_in_history))],
-                query=None,
-                requester=self.client.user.id,
-                player_instance=self,
-            )
-        else:
-            track = await Track.build_track(
-                node=self.node,
-                data=available_tracks[random.choice(list(available_tracks))],
-                query=None,
-                requester=self.client.user.id,
-                player_instance=self,
-            )
+    async def _fetch_autoplay_track(self) -> JSON_DICT_TYPE | None:
+        if (playlist := await self.get_auto_playlist()) is None:
+            return None
+        track = None
+        # Each attempt is a single indexed lookup, so retry a few times to avoid replaying recent tracks
+        # rather than loading the whole playlist to compute the difference with the history.
+        for __ in range(AUTOPLAY_RANDOM_ATTEMPTS):
+            track = await playlist.fetch_random()
+            if track is None or not self.history.has_encoded(track["encoded"]):
+                break
+        return track
+
+    async def _process_autoplay_on_play(self, available_track: JSON_DICT_TYPE):
+        track = await Track.build_track(
+            node=self.node,
+            data=available_track,
+            query=None,
+            requester=self.client.user.id,
+            player_instance=self,
+        )
         auto_play = True
         self.next_track = None
         return auto_play, track
@@ -1589,7 +1536,7 @@ class Player(VoiceProtocol):
         ):
             self.last_track = self.current
             await self.next()
-            self.next_track = None if self.queue.empty() else self.queue.raw_queue.popleft()
+            self.next_track = self.queue.peek()
 
     async def _update_state(self, state: State) -> None:
         """
@@ -1599,6 +1546,9 @@ class Player(VoiceProtocol):
         state: :class:`dict`
             The state that is given to update.
         """
+        self._apply_state(state)
+
+    def _apply_state(self, state: State) -> None:
         self._last_update = time.time() * 1000
         self._last_position = state.position
         self.position_timestamp = state.time
@@ -1753,24 +1703,10 @@ class Player(VoiceProtocol):
             self.current = None
             with contextlib.suppress(ValueError):
                 await self.player_manager.remove(self.channel.guild.id)
+            if self._config is not None:
+                self._config.discard_snapshot()
             if not maybe_resuming:
                 await self.node.delete_session_player(self.guild.id)
-            with contextlib.suppress(JobLookupError):
-                self.player_manager.client.scheduler.remove_job(
-                    job_id=f"{self.bot.user.id}-{self.guild.id}-auto_dc_task"
-                )
-            with contextlib.suppress(JobLookupError):
-                self.player_manager.client.scheduler.remove_job(
-                    job_id=f"{self.bot.user.id}-{self.guild.id}-auto_empty_queue_task"
-                )
-            with contextlib.suppress(JobLookupError):
-                self.player_manager.client.scheduler.remove_job(
-                    job_id=f"{self.bot.user.id}-{self.guild.id}-auto_pause_task"
-                )
-            with contextlib.suppress(JobLookupError):
-                self.player_manager.client.scheduler.remove_job(
-                    job_id=f"{self.bot.user.id}-{self.guild.id}-auto_save_task"
-                )
             self.cleanup()
 
     async def stop(self, requester: discord.Member) -> None:
@@ -2663,7 +2599,7 @@ class Player(VoiceProtocol):
         queue_list = ""
         start_index = page_index * per_page
         end_index = start_index + per_page
-        tracks = list(islice(queue.raw_queue, start_index, end_index))
+        tracks = list(queue.view(start_index, end_index))
         arrow = await self.draw_time()
         position = await self.fetch_position()
         pos = format_time_dd_hh_mm_ss(position)
@@ -2797,10 +2733,9 @@ class Player(VoiceProtocol):
 
     async def queue_duration(self, history: bool = False) -> int:
         queue = self.history if history else self.queue
-        dur = [await track.duration() for track in queue.raw_queue if not await track.stream()]
-        queue_dur = sum(dur)
-        if queue.empty():
-            queue_dur = 0
+        queue_dur = queue.duration
+        if queue_dur and self.timescale.changed:
+            queue_dur = self.timescale.adjust_position(queue_dur)
         if history:
             return queue_dur
         try:
@@ -2818,7 +2753,7 @@ class Player(VoiceProtocol):
         if self.queue.empty():
             return 0
         tracks, count = await self.queue.remove(track, duplicates=duplicates)
-        self.next_track = None if self.queue.empty() else self.queue.raw_queue.popleft()
+        self.next_track = self.queue.peek()
         self.node.dispatch_event(QueueTracksRemovedEvent(player=self, requester=requester, tracks=tracks))
         return count
 
@@ -2832,7 +2767,7 @@ class Player(VoiceProtocol):
             return None
         track = await self.queue.get(queue_number)
         await self.queue.put([track], new_index)
-        self.next_track = None if self.queue.empty() else self.queue.raw_queue.popleft()
+        self.next_track = self.queue.peek()
         self.node.dispatch_event(
             QueueTrackPositionChangedEvent(
                 before=queue_number, after=new_index, track=track, player=self, requester=requester
@@ -2840,6 +2775,117 @@ class Player(VoiceProtocol):
         )
         return track
 
+    async def bulk_insert(
+        self,
+        tracks_at: list[tuple[int, Track | APITrack | dict | str]],
+        requester: int,
+    ) -> list[Track]:
+        """Insert many tracks at different positions of the queue in a single pass.
+
+        Parameters
+        ----------
+        tracks_at: list[tuple[int, Track | APITrack | dict | str]]
+            The index at which to insert each track, indexes refer to the queue before any track is inserted
+            and a negative index appends the track to the end of the queue.
+        requester: :class:`int`
+            The ID of the user who requested the tracks.
+
+        Returns
+        -------
+        list[Track]
+            The inserted tracks, in the order they appear in the queue.
+        """
+        async with self.__adding_lock:
+            output = [(index, await self._query_to_track(requester, track)) for index, track in tracks_at]
+            tracks = await self.queue.insert_at(output)
+            self.next_track = self.queue.peek()
+            if tracks:
+                self.node.dispatch_event(QueueTracksAddedEvent(self, self.guild.get_member(requester), tracks))
+            return tracks
+
+    async def remove_from_queue_where(
+        self,
+        predicate: Callable[[Track], bool],
+        requester: discord.Member,
+    ) -> list[Track]:
+        """Remove every track of the queue matching the predicate in a single pass.
+
+        Parameters
+        ----------
+        predicate: Callable[[Track], bool]
+            Returns True for the tracks to remove.
+        requester: :class:`discord.Member`
+            The user who requested the change.
+
+        Returns
+        -------
+        list[Track]
+            The removed tracks.
+        """
+        return self._after_bulk_removal(await self.queue.remove_where(predicate), requester)
+
+    async def remove_from_queue_at(self, indexes: Iterable[int], requester: discord.Member) -> list[Track]:
+        """Remove the tracks at the given queue indexes in a single pass.
+
+        Parameters
+        ----------
+        indexes: Iterable[int]
+            The 0-based indexes of the tracks to remove.
+        requester: :class:`discord.Member`
+            The user who requested the change.
+
+        Returns
+        -------
+        list[Track]
+            The removed tracks.
+
+        Raises
+        ------
+        IndexError
+            If any of the indexes is out of range.
+        """
+        return self._after_bulk_removal(await self.queue.remove_indexes(indexes), requester)
+
+    async def dedupe_queue(self, requester: discord.Member) -> list[Track]:
+        """Remove the tracks already present earlier in the queue, keeping their first occurrence.
+
+        Parameters
+        ----------
+        requester: :class:`discord.Member`
+            The user who requested the change.
+
+        Returns
+        -------
+        list[Track]
+            The removed tracks.
+        """
+        return self._after_bulk_removal(await self.queue.dedupe(), requester)
+
+    async def reorder_queue(self, order: Sequence[int], requester: discord.Member) -> None:
+        """Reorder the queue, the track at ``order[i]`` is moved to position ``i``.
+
+        Parameters
+        ----------
+        order: Sequence[int]
+            A permutation of the queue indexes.
+        requester: :class:`discord.Member`
+            The user who requested the change.
+
+        Raises
+        ------
+        ValueError
+            If the order is not a permutation of the queue indexes.
+        """
+        await self.queue.reorder(order)
+        self.next_track = self.queue.peek()
+        self.node.dispatch_event(QueueReorderedEvent(player=self, requester=requester))
+
+    def _after_bulk_removal(self, tracks: list[Track], requester: discord.Member) -> list[Track]:
+        self.next_track = self.queue.peek()
+        if tracks:
+            self.node.dispatch_event(QueueTracksRemovedEvent(player=self, requester=requester, tracks=tracks))
+        return tracks
+
     async def maybe_shuffle_queue(self, requester: int) -> None:
         if (await self.player_manager.client.player_config_manager.get_auto_shuffle(self.guild.id)) is False:
             return
@@ -2848,7 +2894,7 @@ class Player(VoiceProtocol):
     async def shuffle_queue(self, requester: int) -> None:
         self.node.dispatch_event(QueueShuffledEvent(player=self, requester=self.guild.get_member(requester)))
         await self.queue.shuffle()
-        self.next_track = None if self.queue.empty() else self.queue.raw_queue.popleft()
+        self.next_track = self.queue.peek()
 
     async def set_autoplay_playlist(self, playlist: int | Playlist) -> None:
         if isinstance(playlist, int):
@@ -2867,55 +2913,104 @@ class Player(VoiceProtocol):
     async def set_autoplay(self, autoplay: bool) -> None:
         await self.config.update_auto_play(autoplay)
 
-    async def to_dict(self) -> dict:
+    async def to_dict(self, queues: bool = True) -> dict:
         """
         Returns a dict representation of the player.
+
+        If queues is False the "queue" and "history" entries (and their packed variants) are left out, which avoids
+        serialising every track.
         """
-        data = await self.config.fetch_all()
+        if (snapshot := self.config.snapshot) is not None:
+            config = {name: getattr(snapshot, name) for name in _STATE_CONFIG_FIELDS}
+        else:
+            config = await self.config.fetch_all()
         position = await self.position()
         if self.timescale.changed:
             position = self.timescale.reverse_position(position)
-        return {
+        state = {
             "id": int(self.guild.id),
             "channel_id": self.channel.id,
             "current": await self.current.to_dict() if self.current else None,
-            "text_channel_id": data["text_channel_id"],
-            "notify_channel_id": data["notify_channel_id"],
-            "forced_channel_id": data["forced_channel_id"],
+            "text_channel_id": config["text_channel_id"],
+            "notify_channel_id": config["notify_channel_id"],
+            "forced_channel_id": config["forced_channel_id"],
             "paused": self.paused,
-            "repeat_queue": data["repeat_queue"],
-            "repeat_current": data["repeat_current"],
-            "shuffle": data["shuffle"],
-            "auto_shuffle": data["auto_shuffle"],
-            "auto_play": data["auto_play"],
-            "auto_play_playlist_id": data["auto_play_playlist_id"],
+            "repeat_queue": config["repeat_queue"],
+            "repeat_current": config["repeat_current"],
+            "shuffle": config["shuffle"],
+            "auto_shuffle": config["auto_shuffle"],
+            "auto_play": config["auto_play"],
+            "auto_play_playlist_id": config["auto_play_playlist_id"],
             "volume": self.volume,
             "position": position,
             "playing": self.is_active,
-            "queue": [] if self.queue.empty() else [await t.to_dict() for t in self.queue.raw_queue],
-            "history": [] if self.history.empty() else [await t.to_dict() for t in self.history.raw_queue],
             "effect_enabled": self._effect_enabled,
-            "effects": {
-                "volume": self._volume.to_dict(),
-                "equalizer": self._equalizer.to_dict(),
-                "karaoke": self._karaoke.to_dict(),
-                "timescale": self._timescale.to_dict(),
-                "tremolo": self._tremolo.to_dict(),
-                "vibrato": self._vibrato.to_dict(),
-                "rotation": self._rotation.to_dict(),
-                "distortion": self._distortion.to_dict(),
-                "low_pass": self._low_pass.to_dict(),
-                "channel_mix": self._channel_mix.to_dict(),
-                "echo": self._echo.to_dict(),
-                "reverb": self._reverb.to_dict(),
-            },
-            "self_deaf": data["self_deaf"],
+            "effects": self._effects_to_dict(),
+            "self_deaf": config["self_deaf"],
             "extras": {
                 "last_track": await self.last_track.to_dict() if self.last_track else None,
                 "next_track": await self.next_track.to_dict() if self.next_track else None,
                 "was_alone_paused": self._was_alone_paused,
             },
         }
+        if queues and COMPACT_PLAYER_STATE:
+            state["queue"], state["history"] = [], []
+            state["queue_packed"] = await self._pack_queue(self.queue)
+            state["history_packed"] = await self._pack_queue(self.history)
+        elif queues:
+            state["queue"] = [] if self.queue.empty() else [await t.to_dict() for t in self.queue.raw_queue]
+            state["history"] = [] if self.history.empty() else [await t.to_dict() for t in self.history.raw_queue]
+            state["queue_packed"], state["history_packed"] = None, None
+        return state
+
+    def _effects_to_dict(self) -> dict[str, dict]:
+        return {
+            "volume": self._volume.to_dict(),
+            "equalizer": self._equalizer.to_dict(),
+            "karaoke": self._karaoke.to_dict(),
+            "timescale": self._timescale.to_dict(),
+            "tremolo": self._tremolo.to_dict(),
+            "vibrato": self._vibrato.to_dict(),
+            "rotation": self._rotation.to_dict(),
+            "distortion": self._distortion.to_dict(),
+            "low_pass": self._low_pass.to_dict(),
+            "channel_mix": self._channel_mix.to_dict(),
+            "echo": self._echo.to_dict(),
+            "reverb": self._reverb.to_dict(),
+        }
+
+    def state_fingerprint(self) -> tuple | None:
+        """
+        Returns a summary of the state written by `to_dict`, built without touching the database or serialising
+        any track, it changes whenever the saved state would change.
+
+        None if the config snapshot is not loaded, in which case the state has to be serialised to be compared.
+        """
+        if (snapshot := self.config.snapshot) is None:
+            return None
+        # noinspection PyProtectedMember
+        return (
+            self.channel.id if self.channel else None,
+            self.current._id if self.current else None,
+            self.last_track._id if self.last_track else None,
+            self.next_track._id if self.next_track else None,
+            self.paused,
+            self._paused_position if self.paused else (self._last_position, self._last_update),
+            self.volume,
+            self.is_active,
+            self._effect_enabled,
+            self._was_alone_paused,
+            self._effects_to_dict(),
+            tuple(getattr(snapshot, name) for name in _STATE_CONFIG_FIELDS),
+        )
+
+    @staticmethod
+    async def _pack_queue(queue: PlayerQueue[Track]) -> bytes:
+        # The full track data is rebuilt from the encoded string on restore, so it is only kept for unresolved tracks
+        tracks = [await t.to_dict(full_track_data=not t.encoded) for t in queue.raw_queue]
+        if len(tracks) > DECODE_THREAD_THRESHOLD:
+            return await asyncio.to_thread(pack_tracks, tracks)
+        return pack_tracks(tracks)
 
     async def save(self) -> None:
         if self.is_active:
@@ -2934,10 +3029,8 @@ class Player(VoiceProtocol):
         await self._process_restore_autoplaylist(player)
         self._last_position = player.position
         history, queue = await self._process_restore_queues(player)
-        self.queue.raw_queue = collections.deque(queue)
-        self.queue.raw_b64s = [t.encoded for t in queue if t.encoded]
-        self.history.raw_queue = collections.deque(history)
-        self.history.raw_b64s = [t.encoded for t in history]
+        self.queue.raw_queue = queue
+        self.history.raw_queue = history
         self._effect_enabled = player.effect_enabled
         await self._process_restore_filters(player)
         self.current = current
@@ -2997,8 +3090,10 @@ class Player(VoiceProtocol):
             await self.node.patch_session_player(guild_id=self.guild.id, payload=payload)
 
     async def _process_restore_queues(self, player):
-        queue = await self._generate_queue(player.queue)
-        history = await self._generate_queue(player.history)
+        queue = await self._generate_queue(unpack_tracks(player.queue_packed) if player.queue_packed else player.queue)
+        history = await self._generate_queue(
+            unpack_tracks(player.history_packed) if player.history_packed else player.history
+        )
         return history, queue
 
     async def _generate_queue(self, raw_queue):
@@ -3017,16 +3112,18 @@ class Player(VoiceProtocol):
             if raw_queue
             else []
         )
-        encoded_list = [track["data"] for track in queue_raw if track["full_track_data"] is None]
+        encoded_list = [track["data"] for track in queue_raw if track["full_track_data"] is None and track["data"]]
         full_track_data = [track["full_track_data"] for track in queue_raw if track["full_track_data"] is not None]
 
+        track_objects_mapping = {}
         if encoded_list:
-            track_objects = await self.node.post_decodetracks(encoded_list)
-            track_objects_mapping = (
-                {track.encoded: track for track in track_objects} if isinstance(track_objects, list) else {}
-            )
-        else:
-            track_objects_mapping = {}
+            # Decode within the bot first and only send what it could not decode to the node
+            decoded = await decode_tracks_local(encoded_list)
+            track_objects_mapping = {track.encoded: track for track in decoded if track is not None}
+            if failed := [encoded for encoded, track in zip(encoded_list, decoded) if track is None]:
+                track_objects = await self.node.post_decodetracks(failed)
+                if isinstance(track_objects, list):
+                    track_objects_mapping |= {track.encoded: track for track in track_objects}
         queue = []
         if track_objects_mapping:
             for i, track in enumerate(queue_raw, start=0):
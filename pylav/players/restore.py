@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pylav.nodes.node import Node
+
+
+@dataclass(slots=True)
+class RestoreProgress:
+    """Counters describing the progress of the player restore on startup"""
+
+    total: int = 0
+    restored: int = 0
+    skipped: int = 0
+    failed: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+    finished_at: float | None = None
+
+    @property
+    def done(self) -> int:
+        """How many player states have been processed"""
+        return self.restored + self.skipped + self.failed
+
+    @property
+    def pending(self) -> int:
+        """How many player states are still waiting to be processed"""
+        return self.total - self.done
+
+    @property
+    def elapsed(self) -> float:
+        """How long the restore has been running for, in seconds"""
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    def to_dict(self) -> dict[str, int | float]:
+        """Get the counters as a dict"""
+        return {
+            "total": self.total,
+            "restored": self.restored,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "pending": self.pending,
+            "elapsed": self.elapsed,
+        }
+
+
+class NodeThrottle:
+    """Spaces out the work sent to each node so that it never exceeds the given rate.
+
+    Parameters
+    ----------
+    rate: float
+        The maximum number of calls to `wait` per second that can go through for each node.
+    """
+
+    __slots__ = ("_interval", "_next_slot")
+
+    def __init__(self, rate: float) -> None:
+        self._interval = 1 / rate
+        self._next_slot: dict[int, float] = {}
+
+    async def wait(self, node: Node, deadline: asyncio.Timeout | None = None) -> None:
+        """Wait for the next free slot of the node
+
+        Parameters
+        ----------
+        node: Node
+            The node the work is sent to.
+        deadline: asyncio.Timeout | None
+            The timeout the caller runs under, it is pushed back by the time spent waiting for the slot.
+        """
+        now = time.monotonic()
+        slot = max(now, self._next_slot.get(node.identifier, now))
+        # Reserve the slot before sleeping so that concurrent callers queue up behind it
+        self._next_slot[node.identifier] = slot + self._interval
+        if (delay := slot - now) > 0:
+            if deadline is not None and (when := deadline.when()) is not None:
+                deadline.reschedule(when + delay)
+            await asyncio.sleep(delay)
@@ -1,18 +1,28 @@
 from __future__ import annotations
 
 import asyncio
+import functools
+import types
 import typing
 
-from dacite import from_dict  # type: ignore
-
 from pylav.logging import getLogger
-from pylav.nodes.api.responses.track import Track
+from pylav.nodes.api.decoders import TRACK_DECODER
+from pylav.nodes.api.responses.shared import TrackPluginInfo
+from pylav.nodes.api.responses.track import Info, Track
+from pylav.type_hints.dict_typing import JSON_DICT_TYPE
 from pylav.utils.vendor.lavalink_py.datarw import DataReader
 
+if typing.TYPE_CHECKING:
+    from pylav.core.client import Client
+
 LOGGER = getLogger("PyLav.Track.Decoder")
 
+# How many decoded track fields are memoised, keyed by their encoded string
+DECODE_CACHE_SIZE = 10_000
+# Batches larger than this are decoded in a worker thread so that the event loop isn't blocked
+DECODE_THREAD_THRESHOLD = 64
+
 
-# noinspection SpellCheckingInspection,PyPep8Naming
 def decode_track(track: str) -> Track:
     """Decodes a base64 track string into a Track object.
 
@@ -26,6 +36,18 @@ def decode_track(track: str) -> Track:
     :class:`Track`
     The decoded Track object
     """
+    return _decode_track(track)
+
+
+def _decode_track(track: str) -> Track:
+    # Track objects are mutable, so every caller gets its own built from the memoised fields
+    info, plugin_info = _read_track(track)
+    return Track(encoded=track, info=Info(**info), pluginInfo=TrackPluginInfo(kwargs=dict(plugin_info)))
+
+
+# noinspection SpellCheckingInspection,PyPep8Naming
+@functools.lru_cache(maxsize=DECODE_CACHE_SIZE)
+def _read_track(track: str) -> tuple[types.MappingProxyType, tuple[tuple[str, str], ...]]:
     reader = DataReader(track)
     version = reader.read_version()
     plugin_info = {}
@@ -57,31 +79,95 @@ def decode_track(track: str) -> Track:
         LOGGER.verbose("Error while decoding version %d track: %s", version, track, exc_info=exc)
         raise UnicodeError("Error while decoding track") from exc
 
-    return typing.cast(
-        Track,
-        from_dict(
-            data_class=Track,
-            data={
-                "encoded": track,
-                "info": {
-                    "version": version,
-                    "title": title,
-                    "author": author,
-                    "length": length,
-                    "identifier": identifier,
-                    "isStream": is_stream,
-                    "uri": uri,
-                    "isSeekable": not is_stream,
-                    "sourceName": source,
-                    "artworkUrl": artworkUrl,
-                    "isrc": isrc,
-                    "position": 0,
-                },
-                "pluginInfo": plugin_info,
-            },
-        ),
+    info = types.MappingProxyType(
+        {
+            "version": version,
+            "title": title,
+            "author": author,
+            "length": length,
+            "identifier": identifier,
+            "isStream": is_stream,
+            "uri": uri,
+            "isSeekable": not is_stream,
+            "sourceName": source,
+            "artworkUrl": artworkUrl,
+            "isrc": isrc,
+            "position": 0,
+        }
     )
+    return info, tuple(plugin_info.items())
 
 
 async def async_decoder(track: str) -> Track:
     return await asyncio.to_thread(decode_track, track=track)
+
+
+def _decode_tracks(tracks: list[str], raise_on_failure: bool) -> list[Track | None]:
+    response = []
+    for track in tracks:
+        try:
+            response.append(_decode_track(track))
+        except Exception:
+            if raise_on_failure:
+                raise
+            response.append(None)
+    return response
+
+
+async def decode_tracks_local(tracks: list[str], raise_on_failure: bool = False) -> list[Track | None]:
+    """Decodes a batch of base64 track strings into Track objects without a round trip to a node.
+
+    Results are memoised, and large batches are decoded in a worker thread.
+
+    Parameters
+    ----------
+    tracks: :class:`list` of :class:`str`
+        The base64 track strings.
+    raise_on_failure: :class:`bool`
+        Whether to raise if a track fails to decode, if not its entry is None.
+
+    Returns
+    -------
+    :class:`list` of Optional[:class:`Track`]
+    The decoded Track objects, in the same order as the input
+    """
+    if len(tracks) > DECODE_THREAD_THRESHOLD:
+        return await asyncio.to_thread(_decode_tracks, tracks, raise_on_failure)
+    return _decode_tracks(tracks, raise_on_failure)
+
+
+async def resolve_tracks(client: Client, tracks: typing.Iterable[str | JSON_DICT_TYPE | Track]) -> list[Track]:
+    """Converts a mixed list of encoded strings, track dicts and Track objects into Track objects.
+
+    Encoded strings are decoded locally and the ones that cannot be are sent to a node in a single request.
+    The input order is preserved and any entry that fails to decode is dropped.
+
+    Parameters
+    ----------
+    client: :class:`Client`
+        The client used to decode the encoded strings.
+    tracks: :class:`list`
+        The tracks to convert.
+
+    Returns
+    -------
+    :class:`list` of :class:`Track`
+    The converted Track objects
+    """
+    tracks = list(tracks)
+    if encoded := [track for track in tracks if isinstance(track, str)]:
+        decoded = {
+            track.encoded: track for track in await client.decode_tracks(encoded, raise_on_failure=False, lazy=True)
+        }
+    else:
+        decoded = {}
+    response = []
+    for track in tracks:
+        if isinstance(track, str):
+            if track in decoded:
+                response.append(decoded[track])
+        elif isinstance(track, dict):
+            response.append(TRACK_DECODER(track))
+        else:
+            response.append(track)
+    return response
@@ -374,6 +374,19 @@ class Track:
     async def stream(self) -> bool:
         return (await self.fetch_full_track_data()).info.isStream
 
+    @property
+    def known_duration(self) -> int | None:
+        """The length of the track without the timescale applied, 0 for streams, or None if it was not resolved yet"""
+        if self._processed is None:
+            return None
+        return 0 if self._processed.info.isStream else self._processed.info.length
+
+    def _notify_resolved(self) -> None:
+        if self._player is None:
+            return
+        self._player.queue.track_resolved(self)
+        self._player.history.track_resolved(self)
+
     async def title(self) -> str:
         title = (await self.fetch_full_track_data()).info.title
         return title if not await self.is_local() else await self._mutagen_title(title)
@@ -667,13 +680,18 @@ class Track:
         if self.encoded:
             self._processed = await self.client.decode_track(self.encoded)
             self._duration = self._processed.info.length
+            self._notify_resolved()
         else:
             await self.search()
         return self._processed
 
-    async def to_dict(self) -> dict[str, Any]:
+    async def to_dict(self, full_track_data: bool = True) -> dict[str, Any]:
         """
         Returns a dict representation of this Track.
+        Parameters
+        ----------
+        full_track_data: :class:`bool`
+            Whether to include the full track data, if False it is left as None and rebuilt from the encoded string.
         Returns
         -------
         :class:`dict`
@@ -689,7 +707,7 @@ class Track:
                 "last_known_position": self.last_known_position,
             },
             "raw_data": self._raw_data,
-            "full_track_data": (await self.fetch_full_track_data()).to_database(),
+            "full_track_data": (await self.fetch_full_track_data()).to_database() if full_track_data else None,
         }
 
     async def search(self, bypass_cache: bool = False):
@@ -723,6 +741,7 @@ class Track:
         self._unique_id.update(self.encoded.encode())
         self._processed = track
         self._duration = track.info.length
+        self._notify_resolved()
 
     async def search_all(self, player: Player, requester: int, bypass_cache: bool = False) -> list[Track]:
         _query = await Query.from_string(self._query)
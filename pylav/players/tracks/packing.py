@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import struct
+import zlib
+from typing import Any
+
+from pylav.compat import json
+from pylav.type_hints.dict_typing import JSON_DICT_TYPE
+
+PACKING_MAGIC = b"PLQ"
+PACKING_VERSION = 1
+# Length written in place of an encoded string for tracks that have not been resolved yet
+_NO_ENCODED = 0xFFFFFFFF
+_LENGTH = struct.Struct(">I")
+
+
+def pack_tracks(tracks: list[JSON_DICT_TYPE]) -> bytes:
+    """Pack a list of tracks produced by ``Track.to_dict`` into a compressed binary blob.
+
+    The encoded strings are stored as a length-prefixed list, everything else the track needs to be rebuilt
+    (query, requester, timestamps, ...) goes in a small side table, defaults are left out.
+
+    Parameters
+    ----------
+    tracks: list[JSON_DICT_TYPE]
+        The tracks to pack.
+
+    Returns
+    -------
+    bytes
+        The packed tracks.
+    """
+    body = bytearray(_LENGTH.pack(len(tracks)))
+    extras = []
+    for track in tracks:
+        if (encoded := track.get("encoded")) is None:
+            body += _LENGTH.pack(_NO_ENCODED)
+        else:
+            raw = encoded.encode()
+            body += _LENGTH.pack(len(raw))
+            body += raw
+        extra = track.get("extra") or {}
+        entry = {
+            "q": track.get("query"),
+            "r": track.get("requester"),
+            "s": track.get("skip_segments"),
+            "t": extra.get("timestamp"),
+            "p": extra.get("last_known_position"),
+            "d": track.get("raw_data"),
+            "f": track.get("full_track_data"),
+        }
+        extras.append({k: v for k, v in entry.items() if v})
+    side_table = json.dumps(extras).encode()
+    body += _LENGTH.pack(len(side_table))
+    body += side_table
+    return PACKING_MAGIC + bytes([PACKING_VERSION]) + zlib.compress(bytes(body))
+
+
+def unpack_tracks(blob: bytes) -> list[JSON_DICT_TYPE]:
+    """Unpack a blob built by `pack_tracks` into dicts shaped like the output of ``Track.to_dict``.
+
+    Parameters
+    ----------
+    blob: bytes
+        The packed tracks.
+
+    Returns
+    -------
+    list[JSON_DICT_TYPE]
+        The tracks, tracks that were packed without their full track data have it set to None.
+
+    Raises
+    ------
+    ValueError
+        If the blob was not built by `pack_tracks`.
+    """
+    if blob[: len(PACKING_MAGIC)] != PACKING_MAGIC or blob[len(PACKING_MAGIC)] != PACKING_VERSION:
+        raise ValueError("Unsupported packed track format")
+    body = memoryview(zlib.decompress(blob[len(PACKING_MAGIC) + 1 :]))
+    (count,), offset = _LENGTH.unpack_from(body), _LENGTH.size
+    encoded_tracks: list[str | None] = []
+    for __ in range(count):
+        (length,) = _LENGTH.unpack_from(body, offset)
+        offset += _LENGTH.size
+        if length == _NO_ENCODED:
+            encoded_tracks.append(None)
+            continue
+        encoded_tracks.append(str(body[offset : offset + length], "utf-8"))
+        offset += length
+    (length,) = _LENGTH.unpack_from(body, offset)
+    offset += _LENGTH.size
+    extras: list[dict[str, Any]] = json.loads(bytes(body[offset : offset + length]))
+    return [
+        {
+            "encoded": encoded,
+            "query": extra.get("q"),
+            "requester": extra.get("r"),
+            "skip_segments": extra.get("s") or [],
+            "extra": {"timestamp": extra.get("t") or 0, "last_known_position": extra.get("p") or 0},
+            "raw_data": extra.get("d") or {},
+            "full_track_data": extra.get("f"),
+        }
+        for encoded, extra in zip(encoded_tracks, extras)
+    ]
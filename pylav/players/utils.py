@@ -3,16 +3,25 @@ from __future__ import annotations
 import asyncio
 import collections
 import contextlib
-import random
 import threading
 from abc import ABC
 from asyncio import Event, QueueFull, get_event_loop
-from collections.abc import Iterator
+from collections.abc import Callable, Hashable, Iterable, Iterator, Sequence
+from operator import attrgetter, itemgetter
 from types import GenericAlias
 from typing import NoReturn
 
+from pylav.helpers.sequence import BlockSequence
 from pylav.type_hints.generics import ANY_GENERIC_TYPE
 
+# Tracks compare equal by their id, so it is used to index the queues for O(1) membership tests
+_track_key = attrgetter("id")
+
+
+def _duplicate_key(track: ANY_GENERIC_TYPE) -> Hashable:
+    # Tracks that were not resolved yet have no encoded string and can only be a duplicate of themselves
+    return track.encoded or track.id
+
 
 class PlayerQueue(asyncio.Queue[ANY_GENERIC_TYPE]):
     """A queue, useful for coordinating producer and consumer coroutines.
@@ -28,8 +37,7 @@ class PlayerQueue(asyncio.Queue[ANY_GENERIC_TYPE]):
 
     __slots__ = ("_queue", "_maxsize", "_getters", "_putters", "_unfinished_tasks", "_finished", "_loop")
 
-    _queue: collections.deque[ANY_GENERIC_TYPE]
-    raw_b64s: list[str]
+    _queue: BlockSequence[ANY_GENERIC_TYPE]
 
     def __init__(self, maxsize: int = 0) -> None:
         self._lock = asyncio.Lock()
@@ -50,24 +58,79 @@ class PlayerQueue(asyncio.Queue[ANY_GENERIC_TYPE]):
     # These do not exist in asyncio.Queue
     @property
     def raw_queue(self) -> collections.deque[ANY_GENERIC_TYPE]:
-        return self._queue.copy()
+        """A copy of the queue, use `peek`, `view` or iterate the queue directly to avoid copying it"""
+        return collections.deque(self._queue)
 
     @raw_queue.setter
-    def raw_queue(self, value: collections.deque[ANY_GENERIC_TYPE]):
-        if not isinstance(value, collections.deque):
-            raise TypeError("Queue value must be a collections.deque[Track]")
+    def raw_queue(self, value: Iterable[ANY_GENERIC_TYPE]):
+        if not isinstance(value, Iterable):
+            raise TypeError("Queue value must be an iterable of Track")
+        value = list(value)
         if self._maxsize and len(value) > self._maxsize:
             raise ValueError(f"Queue value cannot be longer than maxsize: {self._maxsize}")
-        self._queue = value
+        with self._threading_lock:
+            self._replace(value)
 
     @raw_queue.deleter
     def raw_queue(self) -> None:
         self.clear()
 
+    @property
+    def raw_b64s(self) -> list[str]:
+        """The encoded strings of the tracks in the queue, use `has_encoded` to check for a single track"""
+        return [i.encoded for i in self._queue if i.encoded]
+
+    @property
+    def version(self) -> int:
+        """A counter bumped every time the content or order of the queue changes"""
+        return self._version
+
+    @property
+    def duration(self) -> int:
+        """The total length in milliseconds of the tracks in the queue, streams and unresolved tracks count as 0.
+
+        The timescale of the player is not applied.
+        """
+        return self._duration
+
+    def track_resolved(self, track: ANY_GENERIC_TYPE) -> None:
+        """Count the length of a track that was queued before it was resolved"""
+        if (length := track.known_duration) is None:
+            return
+        with self._threading_lock:
+            if track.id not in self._pending:
+                return
+            counted_encoded = self._pending.pop(track.id)
+            occurrences = self._queue.count(track)
+            if track.encoded and not counted_encoded:
+                # The encoded string only became known now, so `has_encoded` has to learn about it too
+                self._encoded[track.encoded] += occurrences
+            self._lengths[track.id] = length
+            self._duration += length * occurrences
+
+    def has_encoded(self, encoded: str) -> bool:
+        """Return True if a track with the given encoded string is in the queue"""
+        return encoded in self._encoded
+
+    def peek(self, index: int = 0) -> ANY_GENERIC_TYPE | None:
+        """Return the item at the index without removing it, or None if there is no such item"""
+        try:
+            return self._queue[index]
+        except IndexError:
+            return None
+
+    def view(self, start: int = 0, stop: int | None = None) -> Sequence[ANY_GENERIC_TYPE]:
+        """Return a view of the items between start and stop without copying them.
+
+        The view follows the changes made to the queue, copy it with `list` before awaiting while iterating it.
+        """
+        return self._queue[start:stop]
+
     def popindex(self, index: int) -> ANY_GENERIC_TYPE:
         with self._threading_lock:
-            value = self._queue[index]
-            del self._queue[index]
+            value = self._queue.pop(index)
+            self._account_removed((value,))
+            self._version += 1
             return value
 
     async def remove(self, value: ANY_GENERIC_TYPE, duplicates: bool = False) -> tuple[list[ANY_GENERIC_TYPE], int]:
@@ -77,26 +140,100 @@ class PlayerQueue(asyncio.Queue[ANY_GENERIC_TYPE]):
         Returns the removed entries and number of occurrences removed.
         """
         async with self._lock:
-            count = 0
-            removed = []
-            try:
-                i = self._queue.index(value)
-                removed.append(self.popindex(i))
-                count += 1
-                if duplicates:
-                    with contextlib.suppress(ValueError):
-                        while value in self:
-                            i = self._queue.index(value)
-                            removed.append(self.popindex(i))
-                            count += 1
-                return removed, count
-            except ValueError as e:
-                raise IndexError("Value not in queue") from e
+            if value not in self._queue:
+                raise IndexError("Value not in queue")
+            if duplicates:
+                removed = self._partition(lambda item: item == value)
+            else:
+                removed = [self.popindex(self._queue.index(value))]
+            return removed, len(removed)
+
+    async def insert_at(self, insertions: Iterable[tuple[int, ANY_GENERIC_TYPE]]) -> list[ANY_GENERIC_TYPE]:
+        """Insert many items at different positions in a single pass.
+
+        Each index is a position in the queue before any of the items are inserted, items sharing an index keep
+        their order and a negative index appends the item to the end of the queue.
+        Returns the inserted items in the order they now appear in the queue.
+        """
+        async with self._lock:
+            with self._threading_lock:
+                size = len(self._queue)
+                ordered = sorted(
+                    ((size if index < 0 else min(index, size), item) for index, item in insertions), key=itemgetter(0)
+                )
+                if not ordered:
+                    return []
+                if self._maxsize and size + len(ordered) > self._maxsize:
+                    raise QueueFull
+                merged = []
+                previous = 0
+                for index, item in ordered:
+                    merged.extend(self._queue[previous:index])
+                    merged.append(item)
+                    previous = index
+                merged.extend(self._queue[previous:])
+                self._replace(merged)
+        self._unfinished_tasks += 1
+        self._finished.clear()
+        self._wakeup_next(self._getters)
+        return [item for __, item in ordered]
+
+    async def remove_where(self, predicate: Callable[[ANY_GENERIC_TYPE], bool]) -> list[ANY_GENERIC_TYPE]:
+        """Remove every item matching the predicate in a single pass and return them"""
+        async with self._lock:
+            return self._partition(predicate)
+
+    async def remove_indexes(self, indexes: Iterable[int]) -> list[ANY_GENERIC_TYPE]:
+        """Remove the items at the given indexes in a single pass and return them.
+
+        Raises IndexError if any of the indexes is out of range.
+        """
+        async with self._lock:
+            size = len(self._queue)
+            targets = {index + size if index < 0 else index for index in indexes}
+            if any(not 0 <= index < size for index in targets):
+                raise IndexError("Queue index out of range")
+            # The items are visited in order, so their position is the number of items seen so far
+            position = iter(range(size))
+            return self._partition(lambda __: next(position) in targets)
+
+    async def dedupe(self, key: Callable[[ANY_GENERIC_TYPE], Hashable] | None = None) -> list[ANY_GENERIC_TYPE]:
+        """Remove every item whose key was already seen earlier in the queue and return them.
+
+        By default, tracks are considered the same if they have the same encoded string.
+        """
+        key = key or _duplicate_key
+        seen = set()
+
+        def _seen(item: ANY_GENERIC_TYPE) -> bool:
+            if (value := key(item)) in seen:
+                return True
+            seen.add(value)
+            return False
+
+        async with self._lock:
+            return self._partition(_seen)
+
+    async def reorder(self, order: Sequence[int]) -> None:
+        """Reorder the queue, the item at ``order[i]`` is moved to position ``i``.
+
+        Raises ValueError if the order is not a permutation of the queue indexes.
+        """
+        async with self._lock:
+            with self._threading_lock:
+                size = len(self._queue)
+                if len(order) != size or set(order) != set(range(size)):
+                    raise ValueError("The order must be a permutation of the queue indexes")
+                items = list(self._queue)
+                self._queue.reset([items[index] for index in order])
+                self._version += 1
 
     def clear(self) -> None:
         """Remove all items from the queue"""
         with self._threading_lock:
             self._queue.clear()
+            self._reset_accounting()
+            self._version += 1
             for i in self._getters:
                 i.cancel()
             self._getters.clear()
@@ -109,7 +246,8 @@ class PlayerQueue(asyncio.Queue[ANY_GENERIC_TYPE]):
         async with self._lock:
             if self.empty():
                 return
-            await asyncio.to_thread(random.shuffle, self._queue)
+            await asyncio.to_thread(self._queue.shuffle)
+            self._version += 1
 
     async def get_oldest(self) -> ANY_GENERIC_TYPE:
         """Remove and return an item from the queue.
@@ -138,7 +276,7 @@ class PlayerQueue(asyncio.Queue[ANY_GENERIC_TYPE]):
         return obj in self._queue
 
     def __iter__(self) -> Iterator[ANY_GENERIC_TYPE]:
-        return iter(self.raw_queue)
+        return iter(self._queue)
 
     def __len__(self) -> int:
         return len(self._queue)
@@ -146,8 +284,8 @@ class PlayerQueue(asyncio.Queue[ANY_GENERIC_TYPE]):
     def __index__(self) -> int:
         return len(self._queue)
 
-    def __getitem__(self, key: int | slice) -> ANY_GENERIC_TYPE | list[ANY_GENERIC_TYPE]:
-        return self.raw_queue[key]
+    def __getitem__(self, key: int | slice) -> ANY_GENERIC_TYPE | Sequence[ANY_GENERIC_TYPE]:
+        return self._queue[key]
 
     def __setitem__(self, key: int, value: ANY_GENERIC_TYPE | list[ANY_GENERIC_TYPE]) -> NoReturn:
         raise NotImplementedError("Use .put() to add entries to the queue")
@@ -158,38 +296,95 @@ class PlayerQueue(asyncio.Queue[ANY_GENERIC_TYPE]):
     def __length_hint__(self) -> int:
         return len(self._queue)
 
+    def _reset_accounting(self) -> None:
+        self._encoded.clear()
+        self._pending.clear()
+        self._lengths.clear()
+        self._duration = 0
+
+    def _account_added(self, items: Iterable[ANY_GENERIC_TYPE]) -> None:
+        # Must be called after the items were inserted, lengths are counted once per occurrence
+        added: dict[str, list] = {}
+        for i in items:
+            if i.encoded:
+                self._encoded[i.encoded] += 1
+            added.setdefault(i.id, [i, 0])[1] += 1
+        for track, occurrences in added.values():
+            if (length := track.known_duration) is None:
+                self._pending.setdefault(track.id, track.encoded)
+                continue
+            if track.id in self._pending:
+                # Resolved since it was first queued, the occurrences already in the queue were never counted
+                counted_encoded = self._pending.pop(track.id)
+                earlier = self._queue.count(track) - occurrences
+                if track.encoded and not counted_encoded:
+                    self._encoded[track.encoded] += earlier
+                occurrences += earlier
+            self._lengths[track.id] = length
+            self._duration += length * occurrences
+
+    def _account_removed(self, items: Iterable[ANY_GENERIC_TYPE]) -> None:
+        # Must be called after the items were removed
+        removed: dict[str, list] = {}
+        for i in items:
+            if i.encoded:
+                if (count := self._encoded[i.encoded] - 1) > 0:
+                    self._encoded[i.encoded] = count
+                else:
+                    # The track may have been resolved after it was queued, so it might not have been counted
+                    self._encoded.pop(i.encoded, None)
+            removed.setdefault(i.id, [i, 0])[1] += 1
+        for track, occurrences in removed.values():
+            if track in self._queue:
+                self._duration -= self._lengths.get(track.id, 0) * occurrences
+            else:
+                self._pending.pop(track.id, None)
+                self._duration -= self._lengths.pop(track.id, 0) * occurrences
+
+    def _replace(self, items: list[ANY_GENERIC_TYPE]) -> None:
+        self._queue.reset(items)
+        self._reset_accounting()
+        self._account_added(items)
+        self._version += 1
+
+    def _partition(self, predicate: Callable[[ANY_GENERIC_TYPE], bool]) -> list[ANY_GENERIC_TYPE]:
+        with self._threading_lock:
+            kept, removed = [], []
+            for item in self._queue:
+                (removed if predicate(item) else kept).append(item)
+            if removed:
+                self._replace(kept)
+        if removed:
+            self._wakeup_next(self._putters)
+        return removed
+
+    def _insert(self, items: list[ANY_GENERIC_TYPE], index: int = None) -> None:
+        # A negative index appends the items to the end of the queue
+        if index is None or index < 0:
+            self._queue.extend(items)
+        else:
+            self._queue.insert_many(index, items)
+        self._account_added(items)
+        self._version += 1
+
     # These three are overridable in subclasses.
 
     def _init(self, maxsize: int) -> None:
-        self._queue = collections.deque(maxlen=maxsize or None)
-        self.raw_b64s = []
+        self._queue = BlockSequence(key=_track_key)
+        self._encoded: collections.Counter[str] = collections.Counter()
+        # The encoded string counted for the tracks whose length is not known yet, and the length counted for each
+        # of the others
+        self._pending: dict[str, str | None] = {}
+        self._lengths: dict[str, int] = {}
+        self._duration = 0
+        self._version = 0
 
     def _get(self, index: int = None) -> ANY_GENERIC_TYPE:
-        if index is not None:
-            r = self.popindex(index)
-        else:
-            with self._threading_lock:
-                r = self._queue.popleft()
-        if r.encoded:
-            self.raw_b64s.remove(r.encoded)
-        return r
+        return self.popindex(0 if index is None else index)
 
     def _put(self, items: list[ANY_GENERIC_TYPE], index: int = None) -> None:
         with self._threading_lock:
-            if index is not None:
-                for i in items:
-                    if index < 0:
-                        self._queue.append(i)
-                        if i.encoded:
-                            self.raw_b64s.append(i.encoded)
-                    else:
-                        self._queue.insert(index, i)
-                        if i.encoded:
-                            self.raw_b64s.append(i.encoded)
-                        index += 1
-            else:
-                self._queue.extend(items)
-                self.raw_b64s.extend([i.encoded for i in items if i.encoded])
+            self._insert(items, index)
 
     # End of the overridable methods.
 
@@ -358,34 +553,11 @@ class TrackHistoryQueue(PlayerQueue[ANY_GENERIC_TYPE], ABC):
         with self._threading_lock:
             if len(items) + self.qsize() > self.maxsize:
                 diff = len(items) + self.qsize() - self.maxsize
-                for _ in range(diff):
-                    self._queue.pop()
-                    self.raw_b64s.pop()
-            if index is not None:
-                for i in items:
-                    i.timestamp = 0
-                    if index < 0:
-                        self._queue.append(i)
-                        self.raw_b64s.append(i.encoded)
-                    else:
-                        self._queue.insert(index, i)
-                        self.raw_b64s.insert(index, i.encoded)
-                        index += 1
-            else:
-                self._queue.extendleft(items)
-                for i, t in enumerate(items):
-                    t.timestamp = 0
-                    self.raw_b64s.insert(i, t.encoded)
-
-    def _get(self, index: int = None) -> ANY_GENERIC_TYPE:
-        if index is not None:
-            r = self.popindex(index)
-            self.raw_b64s.pop(index)
-        else:
-            with self._threading_lock:
-                r = self._queue.popleft()
-                self.raw_b64s.pop()
-        return r
+                self._account_removed([self._queue.pop() for _ in range(min(diff, self.qsize()))])
+            for i in items:
+                i.timestamp = 0
+            # The most recent track is kept at the start of the history
+            self._insert(items[::-1] if index is None else items, 0 if index is None else index)
 
     def put_nowait(self, items: list[ANY_GENERIC_TYPE], index: int = None) -> None:
         """Put an item into the queue without blocking.
@@ -8,7 +8,9 @@ from pylav.constants.config import CONFIG_DIR
 from pylav.storage.database.tables.aiohttp_cache import AioHttpCacheRow
 from pylav.storage.database.tables.config import LibConfigRow
 from pylav.storage.database.tables.equalizer import EqualizerRow
+from pylav.storage.database.tables.local_tracks import LocalTrackRow
 from pylav.storage.database.tables.m2m import TrackToPlaylists, TrackToQueries
+from pylav.storage.database.tables.misc import IS_POSTGRES
 from pylav.storage.database.tables.nodes import NodeRow, Sessions
 from pylav.storage.database.tables.player_state import PlayerStateRow
 from pylav.storage.database.tables.players import PlayerRow
@@ -18,6 +20,7 @@ from pylav.storage.database.tables.tracks import TrackRow
 from pylav.storage.database.tables.version import BotVersionRow
 from pylav.storage.migrations.low_level.base import migrate_data, run_low_level_migrations
 from pylav.storage.models.config import Config
+from pylav.storage.models.playlist import SEARCH_INDEX
 from pylav.storage.models.version import BotVersion
 
 if TYPE_CHECKING:
@@ -44,6 +47,12 @@ class ConfigController:
     @staticmethod
     async def create_tables() -> None:
         await PlaylistRow.create_table(if_not_exists=True)
+        if IS_POSTGRES:
+            # Backs the trigram similarity search used for the playlist name lookups and autocomplete
+            await PlaylistRow.raw(
+                f"CREATE INDEX IF NOT EXISTS playlist_name_trgm "
+                f"ON {PlaylistRow._meta.tablename} USING gin (name gin_trgm_ops)"
+            )
         await LibConfigRow.create_table(if_not_exists=True)
         await LibConfigRow.raw(
             f"CREATE UNIQUE INDEX IF NOT EXISTS unique_lib_config_bot_id "
@@ -65,7 +74,10 @@ class ConfigController:
         await AioHttpCacheRow.create_table(if_not_exists=True)
         await TrackRow.create_table(if_not_exists=True)
         await TrackToPlaylists.create_table(if_not_exists=True)
+        await TrackToPlaylists.create_position_index()
         await TrackToQueries.create_table(if_not_exists=True)
+        await TrackToQueries.create_position_index()
+        await LocalTrackRow.create_table(if_not_exists=True)
         await Sessions.create_table(if_not_exists=True)
         await Sessions.raw(
             f"CREATE UNIQUE INDEX IF NOT EXISTS unique_node_bot_id ON {Sessions._meta.tablename} (bot, node)"
@@ -86,9 +98,11 @@ class ConfigController:
             f"{QueryRow._meta.tablename}, "
             f"{BotVersionRow._meta.tablename}, "
             f"{AioHttpCacheRow._meta.tablename}, "
+            f"{LocalTrackRow._meta.tablename}, "
             f"{TrackRow._meta.tablename}"
             ";"
         )
+        SEARCH_INDEX.invalidate()
         await self.create_tables()
 
     def get_config(
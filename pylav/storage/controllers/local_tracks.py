@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, NamedTuple
+
+from pylav.storage.database.tables.local_tracks import LocalTrackRow
+from pylav.storage.database.tables.tracks import BULK_BATCH_SIZE
+
+if TYPE_CHECKING:
+    from pylav.core.client import Client
+
+# BULK_BATCH_SIZE is sized for 9 columns per row, local track rows only have 4
+SAVE_BATCH_SIZE = BULK_BATCH_SIZE * 9 // 4
+
+
+class LocalTrackEntry(NamedTuple):
+    """A file of the local tracks folder as it was when it was last loaded"""
+
+    path: str
+    size: int
+    mtime: int
+    encoded: str
+
+
+class LocalTrackController:
+    """Persists the index of the local tracks folder so that unchanged files are not probed again on startup"""
+
+    __slots__ = ("_client",)
+
+    def __init__(self, client: Client) -> None:
+        self._client = client
+
+    @property
+    def client(self) -> Client:
+        return self._client
+
+    @staticmethod
+    async def fetch_index() -> dict[str, LocalTrackEntry]:
+        """Get every indexed file keyed by its path"""
+        rows = await LocalTrackRow.select(
+            LocalTrackRow.path, LocalTrackRow.size, LocalTrackRow.mtime, LocalTrackRow.encoded
+        )
+        return {row["path"]: LocalTrackEntry(**row) for row in rows}
+
+    @staticmethod
+    async def save_many(entries: list[LocalTrackEntry]) -> None:
+        """Insert or update the given files with one upsert per batch"""
+        for start in range(0, len(entries), SAVE_BATCH_SIZE):
+            await LocalTrackRow.insert(
+                *(LocalTrackRow(**entry._asdict()) for entry in entries[start : start + SAVE_BATCH_SIZE])
+            ).on_conflict(
+                action="DO UPDATE",
+                target=LocalTrackRow.path,
+                values=[LocalTrackRow.size, LocalTrackRow.mtime, LocalTrackRow.encoded],
+            )
+
+    @staticmethod
+    async def delete_many(paths: Iterable[str]) -> None:
+        """Remove the given files from the index"""
+        paths = list(paths)
+        for start in range(0, len(paths), BULK_BATCH_SIZE):
+            await LocalTrackRow.delete().where(LocalTrackRow.path.is_in(paths[start : start + BULK_BATCH_SIZE]))
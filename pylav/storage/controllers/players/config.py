@@ -25,6 +25,8 @@ class PlayerConfigController:
 
     async def initialize_global_config(self) -> None:
         await PlayerConfig.create_global(bot=self.client.bot.user.id)
+        # The global config is read on every player operation, so keep it in memory when read caching is on
+        await self.get_global_config().load_snapshot()
 
     def get_global_config(self) -> PlayerConfig:
         return PlayerConfig(bot=self.client.bot.user.id, id=0)
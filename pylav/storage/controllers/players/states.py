@@ -1,7 +1,7 @@
 from __future__ import annotations
 
-from collections.abc import AsyncIterator
-from typing import TYPE_CHECKING
+from collections.abc import AsyncIterator, Iterable
+from typing import TYPE_CHECKING, Any
 
 from pylav.logging import getLogger
 from pylav.storage.database.tables.player_state import PlayerStateRow
@@ -10,28 +10,80 @@ from pylav.type_hints.dict_typing import JSON_DICT_TYPE
 
 if TYPE_CHECKING:
     from pylav.core.client import Client
+    from pylav.players.player import Player
 LOGGER = getLogger("PyLav.Database.Controller.Player.State")
 
+# Entries of `Player.to_dict` only written when the queue or history changed
+QUEUE_KEYS = ("queue", "history", "queue_packed", "history_packed")
+
 
 class PlayerStateController:
-    __slots__ = ("_client",)
+    __slots__ = ("_client", "_persisted")
 
     def __init__(self, client: Client) -> None:
         self._client = client
+        # Guild id -> (queue version, history version, state fingerprint, every other column) as last written to
+        # the database
+        self._persisted: dict[int, tuple[int, int, tuple | None, dict[str, Any]]] = {}
 
     @property
     def client(self) -> Client:
         return self._client
 
     async def save_players(self, players: list[JSON_DICT_TYPE]) -> None:
+        await PlayerState.save_many([PlayerState(bot=self.client.bot.user.id, **player) for player in players])
         for player in players:
-            await self.save_player(player)
+            self._persisted.pop(player["id"], None)
         LOGGER.debug("Saved %s players", len(players))
 
     async def save_player(self, player: JSON_DICT_TYPE) -> None:
         await PlayerState(bot=self.client.bot.user.id, **player).save()
+        self._persisted.pop(player["id"], None)
         LOGGER.trace("Saved player %s", player.get("id"))
 
+    async def persist_players(self, players: Iterable[Player]) -> None:
+        """Write the state of the players that changed since they were last persisted.
+
+        Players whose state fingerprint is unchanged are skipped without being serialised, the queue and history
+        of a player are only serialised and rewritten when they were mutated, and all the rows are written with
+        one upsert per batch.
+
+        Parameters
+        ----------
+        players : Iterable[Player]
+            The players to persist, inactive players are skipped.
+        """
+        bot_id = self.client.bot.user.id
+        with_queues: list[PlayerState] = []
+        without_queues: list[PlayerState] = []
+        persisted = {}
+        for player in players:
+            if not player.is_active:
+                continue
+            queue_version, history_version = player.queue.version, player.history.version
+            previous = self._persisted.get(player.guild.id)
+            queues_changed = previous is None or previous[:2] != (queue_version, history_version)
+            fingerprint = player.state_fingerprint()
+            if not queues_changed and fingerprint is not None and previous[2] == fingerprint:
+                continue
+            state = await player.to_dict(queues=queues_changed)
+            columns = {k: v for k, v in state.items() if k not in QUEUE_KEYS}
+            persisted[player.guild.id] = (queue_version, history_version, fingerprint, columns)
+            if not queues_changed and previous[3] == columns:
+                continue
+            if queues_changed:
+                with_queues.append(PlayerState(bot=bot_id, **state))
+            else:
+                without_queues.append(PlayerState(bot=bot_id, queue=[], history=[], **state))
+        if with_queues:
+            await PlayerState.save_many(with_queues)
+        if without_queues:
+            await PlayerState.save_many(without_queues, queues=False)
+        self._persisted.update(persisted)
+        LOGGER.trace(
+            "Persisted %s players (%s with queue changes)", len(with_queues) + len(without_queues), len(with_queues)
+        )
+
     async def fetch_player(self, guild_id: int) -> PlayerState | None:
         return await PlayerState.get(bot_id=self._client.bot.user.id, guild_id=guild_id)
 
@@ -42,9 +94,11 @@ class PlayerStateController:
             yield PlayerState(**entry)
 
     async def delete_player(self, guild_id: int) -> None:
+        self._persisted.pop(guild_id, None)
         await PlayerStateRow.delete().where(
             (PlayerStateRow.bot == self.client.bot.user.id) & (PlayerStateRow.id == guild_id)
         )
 
     async def delete_all_players(self) -> None:
+        self._persisted.clear()
         await PlayerStateRow.delete().where(PlayerStateRow.bot == self.client.bot.user.id)
@@ -12,6 +12,7 @@ import asyncpg
 import discord
 
 from pylav.constants.config import (
+    READ_CACHING_ENABLED,
     TASK_TIMER_UPDATE_BUNDLED_EXTERNAL_PLAYLISTS_DAYS,
     TASK_TIMER_UPDATE_BUNDLED_PLAYLISTS_DAYS,
     TASK_TIMER_UPDATE_EXTERNAL_PLAYLISTS_DAYS,
@@ -30,8 +31,12 @@ from pylav.logging import getLogger
 from pylav.nodes.api.responses.rest_api import PlaylistResponse
 from pylav.players.query.obj import Query
 from pylav.players.tracks.obj import Track
+from pylav.storage.database.cache.functions import key_builder, prime_keys
+from pylav.storage.database.tables.m2m import TrackToPlaylists
+from pylav.storage.database.tables.misc import IS_POSTGRES
 from pylav.storage.database.tables.playlists import PlaylistRow
-from pylav.storage.models.playlist import Playlist
+from pylav.storage.database.tables.tracks import BULK_BATCH_SIZE
+from pylav.storage.models.playlist import SEARCH_INDEX, Playlist, PlaylistListing, PlaylistMatch
 from pylav.type_hints.bot import DISCORD_BOT_TYPE
 from pylav.type_hints.dict_typing import JSON_DICT_TYPE
 
@@ -90,6 +95,50 @@ class PlaylistController:
             )
         return [self.get_playlist(**playlist) for playlist in playlists]
 
+    async def search_playlists(self, query: str, limit: int = 25, requester: int | None = None) -> list[PlaylistMatch]:
+        """Search playlists by name, ranked by how closely their name matches the query.
+
+        On Postgres the scoring and the selection of the best matches are done by the database using the
+        ``pg_trgm`` word similarity and the trigram index on the playlist names, otherwise an in-process
+        trigram index of the names is used.
+
+        Parameters
+        ----------
+        query : str
+            The text to search for.
+        limit : int
+            The maximum number of playlists to return.
+        requester : int | None
+            Playlists authored by this user are ranked first among equally good matches.
+
+        Returns
+        -------
+        list[PlaylistMatch]
+            The best matches, best first.
+        """
+        if not query:
+            return []
+        if not IS_POSTGRES:
+            if not SEARCH_INDEX.loaded:
+                rows = await PlaylistRow.select(PlaylistRow.id, PlaylistRow.name, PlaylistRow.author)
+                SEARCH_INDEX.load((row["id"], row["name"], row["author"]) for row in rows)
+            return [
+                PlaylistMatch(id=identifier, name=name, author=author, score=score)
+                for identifier, name, author, score in SEARCH_INDEX.search(query, limit=limit, owner=requester)
+            ]
+        pattern = "%{}%".format(query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_"))
+        rows = await PlaylistRow.raw(
+            f"SELECT id, name, author, word_similarity({{}}, name) AS score FROM {PlaylistRow._meta.tablename} "
+            f"WHERE {{}} <% name OR name ILIKE {{}} "
+            f"ORDER BY score DESC, author = {{}} DESC, name LIMIT {{}}",
+            query,
+            query,
+            pattern,
+            requester,
+            limit,
+        )
+        return [PlaylistMatch(**row) for row in rows]
+
     async def get_playlist_by_id(self, playlist_id: int | str) -> Playlist:
         try:
             playlist_id = int(playlist_id)
@@ -216,6 +265,120 @@ class PlaylistController:
             identifier=vc.id, scope=vc.id, author=author, name=name, url=url, tracks=tracks
         )
 
+    async def fetch_listing(
+        self,
+        *,
+        scopes: typing.Iterable[int] | None = None,
+        ids: typing.Iterable[int] | None = None,
+        include_empty: bool = True,
+    ) -> list[PlaylistListing]:
+        """Fetch the id, name, scope, author, url and track count of many playlists at once.
+
+        The track counts are computed by the database in the same query, and the values are used to populate
+        the read cache of the matching playlists. If both ``scopes`` and ``ids`` are given, playlists matching
+        either are listed, if neither are given every playlist is listed.
+
+        Parameters
+        ----------
+        scopes : Iterable[int] | None
+            Only list playlists in these scopes.
+        ids : Iterable[int] | None
+            Only list playlists with these ids.
+        include_empty : bool
+            Whether to include playlists without tracks.
+
+        Returns
+        -------
+        list[PlaylistListing]
+            The playlists, sorted by id.
+        """
+        listing = []
+        if scopes is None and ids is None:
+            listing.extend(await self._fetch_listing_batch(None, [], include_empty))
+        else:
+            for column, values in (("scope", scopes), ("id", ids)):
+                if values is None:
+                    continue
+                values = list(dict.fromkeys(values))
+                for start in range(0, len(values), BULK_BATCH_SIZE):
+                    listing.extend(
+                        await self._fetch_listing_batch(column, values[start : start + BULK_BATCH_SIZE], include_empty)
+                    )
+        listing = sorted(set(listing), key=lambda p: p.id)
+        await self._prime_listing(listing)
+        return listing
+
+    @staticmethod
+    async def _fetch_listing_batch(column: str | None, values: list[int], include_empty: bool) -> list[PlaylistListing]:
+        if column is not None and not values:
+            return []
+        playlist_table = PlaylistRow._meta.tablename
+        link_table = TrackToPlaylists._meta.tablename
+        link_column = TrackToPlaylists.playlists._meta.db_column_name
+        where = f"WHERE {playlist_table}.{column} IN ({', '.join(['{}'] * len(values))}) " if column else ""
+        having = "" if include_empty else f"HAVING COUNT({link_table}.id) > 0"
+        rows = await PlaylistRow.raw(
+            f"SELECT {playlist_table}.id, {playlist_table}.name, {playlist_table}.scope, {playlist_table}.author, "
+            f"{playlist_table}.url, COUNT({link_table}.id) AS size FROM {playlist_table} "
+            f"LEFT JOIN {link_table} ON {link_table}.{link_column} = {playlist_table}.id "
+            f"{where}GROUP BY {playlist_table}.id {having}",
+            *values,
+        )
+        return [PlaylistListing(**row) for row in rows]
+
+    @staticmethod
+    async def _prime_listing(listing: list[PlaylistListing]) -> None:
+        if not READ_CACHING_ENABLED:
+            return
+        pairs = {}
+        for entry in listing:
+            playlist = entry.playlist
+            for method, value in (
+                (playlist.exists, True),
+                (playlist.fetch_name, entry.name),
+                (playlist.fetch_scope, entry.scope),
+                (playlist.fetch_author, entry.author),
+                (playlist.fetch_url, entry.url),
+                (playlist.size, entry.size),
+            ):
+                pairs[key_builder(method, playlist)] = value
+        await prime_keys(pairs)
+
+    async def get_all_listings_for_user(
+        self,
+        requester: int,
+        empty: bool = False,
+        *,
+        vc: discord.channel.VocalGuildChannel = None,
+        guild: discord.Guild = None,
+        channel: discord.abc.MessageableChannel = None,
+    ) -> tuple[
+        list[PlaylistListing],
+        list[PlaylistListing],
+        list[PlaylistListing],
+        list[PlaylistListing],
+        list[PlaylistListing],
+    ]:
+        """
+        Gets the listing of all playlists a user has access to in a given context with a single query.
+        Globals, User specific, Guild specific, Channel specific, VC specific.
+        If empty is True playlists without tracks are left out.
+        """
+        scopes = [
+            self._client.bot.user.id,
+            requester,
+            getattr(guild, "id", None),
+            getattr(channel, "id", None),
+            getattr(vc, "id", None),
+        ]
+        by_scope: dict[int, list[PlaylistListing]] = {}
+        for entry in await self.fetch_listing(scopes=[s for s in scopes if s is not None], include_empty=not empty):
+            by_scope.setdefault(entry.scope, []).append(entry)
+        global_playlists, user_playlists, guild_playlists, channel_playlists, vc_playlists = (
+            list(by_scope.get(scope, [])) if scope is not None else [] for scope in scopes
+        )
+        return global_playlists, user_playlists, guild_playlists, channel_playlists, vc_playlists
+
     async def get_all_for_user(
         self,
         requester: int,
@@ -229,39 +392,34 @@ class PlaylistController:
         Gets all playlists a user has access to in a given context.
         Globals, User specific, Guild specific, Channel specific, VC specific.
         """
-        global_playlists = [
-            p
-            for p in await self.get_playlists_by_scope(scope=self._client.bot.user.id, return_empty=True)
-            if (not empty or await p.size())
-        ]
-        user_playlists = [
-            p
-            for p in await self.get_playlists_by_scope(scope=requester, return_empty=True)
-            if (not empty or await p.size())
-        ]
-        vc_playlists = []
-        guild_playlists = []
-        channel_playlists = []
-        if vc is not None:
-            vc_playlists = [
-                p
-                for p in await self.get_playlists_by_scope(scope=vc.id, return_empty=True)
-                if (not empty or await p.size())
-            ]
-        if guild is not None:
-            guild_playlists = [
-                p
-                for p in await self.get_playlists_by_scope(scope=guild.id, return_empty=True)
-                if (not empty or await p.size())
-            ]
-        if channel is not None:
-            channel_playlists = [
-                p
-                for p in await self.get_playlists_by_scope(scope=channel.id, return_empty=True)
-                if (not empty or await p.size())
-            ]
+        listings = await self.get_all_listings_for_user(requester, empty, vc=vc, guild=guild, channel=channel)
+        global_playlists, user_playlists, guild_playlists, channel_playlists, vc_playlists = (
+            [entry.playlist for entry in listing] for listing in listings
+        )
         return global_playlists, user_playlists, guild_playlists, channel_playlists, vc_playlists
 
+    @staticmethod
+    def filter_manageable(
+        listing: typing.Iterable[PlaylistListing], requester: discord.abc.User, bot: DISCORD_BOT_TYPE
+    ) -> list[PlaylistListing]:
+        """Keep the playlists the requester can manage, without querying the database.
+
+        Parameters
+        ----------
+        listing : Iterable[PlaylistListing]
+            The playlists to filter.
+        requester : discord.abc.User
+            The requester.
+        bot : DISCORD_BOT_TYPE
+            The bot instance.
+
+        Returns
+        -------
+        list[PlaylistListing]
+            The playlists the requester can manage.
+        """
+        return [entry for entry in listing if entry.can_manage(bot=bot, requester=requester)]
+
     async def get_manageable_playlists(
         self, requester: discord.abc.User, bot: DISCORD_BOT_TYPE, *, name_or_id: str | None = None
     ) -> list[Playlist]:
@@ -269,18 +427,11 @@ class PlaylistController:
             try:
                 playlists = await self.get_playlist_by_name_or_id(name_or_id)
             except EntryNotFoundException:
-                playlists = []
+                return []
+            listing = await self.fetch_listing(ids=[p.id for p in playlists])
         else:
-            try:
-                playlists = [p async for p in self.get_all_playlists()]
-            except EntryNotFoundException:
-                playlists = []
-        returning_list = []
-        if playlists:
-            for playlist in playlists:
-                if await playlist.can_manage(requester=requester, bot=bot):
-                    returning_list.append(playlist)
-        return returning_list
+            listing = await self.fetch_listing()
+        return [entry.playlist for entry in self.filter_manageable(listing, requester=requester, bot=bot)]
 
     async def _update_bundled_playlists(self, playlist_id, url, source, name, old_time_stamp):
         try:
@@ -7,10 +7,14 @@ from typing import TYPE_CHECKING
 
 import asyncpg
 
+from pylav.constants.config import QUERY_CACHE_MEMORY_SIZE_MB
+from pylav.helpers.lru import SizedLRU
 from pylav.helpers.time import get_now_utc
 from pylav.logging import getLogger
 from pylav.nodes.api.responses import rest_api
+from pylav.nodes.utils import detach_response, estimate_response_size
 from pylav.players.query.obj import Query as QueryObj
+from pylav.storage.database.tables.m2m import TrackToQueries
 from pylav.storage.database.tables.queries import QueryRow
 from pylav.storage.database.tables.tracks import TrackRow
 from pylav.storage.models.query import Query
@@ -22,10 +26,14 @@ LOGGER = getLogger("PyLav.Database.Controller.Query")
 
 
 class QueryController:
-    __slots__ = ("_client",)
+    __slots__ = ("_client", "_parsed")
 
     def __init__(self, client: Client) -> None:
         self._client = client
+        # Fully parsed responses of recently used queries, served without a database round trip
+        self._parsed: SizedLRU[rest_api.LoadTrackResponses] = SizedLRU(
+            QUERY_CACHE_MEMORY_SIZE_MB * 1024 * 1024, sizer=estimate_response_size
+        )
 
     @property
     def client(self) -> Client:
@@ -51,8 +59,46 @@ class QueryController:
         cached = self.get(query.query_identifier)
         return cached
 
-    @staticmethod
-    async def add_query(query: QueryObj, result: rest_api.LoadTrackResponses) -> bool:
+    def fetch_parsed(self, query: QueryObj, first: bool = False) -> rest_api.LoadTrackResponses | None:
+        """Get the parsed response of the query if it is held in memory.
+
+        Parameters
+        ----------
+        query: :class:`Query`
+            The query to get the response for.
+        first: :class:`bool`
+            Whether to only include the first track of the response.
+
+        Returns
+        -------
+        Optional[LoadTrackResponses]
+            A copy of the cached response, or None if the query is not held in memory.
+        """
+        if (response := self._parsed.get(query.query_identifier)) is None:
+            return None
+        return detach_response(response, first=first)
+
+    def cache_parsed(self, query: QueryObj, result: rest_api.LoadTrackResponses) -> None:
+        """Keep the parsed response of the query in memory.
+
+        Parameters
+        ----------
+        query: :class:`Query`
+            The query the response belongs to.
+        result: LoadTrackResponses
+            The complete response for the query.
+        """
+        if query.is_custom_playlist or query.is_http:
+            return
+        if not result or result.loadType in ["empty", "error", "apiError", None]:
+            return
+        self._parsed.set(query.query_identifier, result)
+
+    def parsed_stats(self) -> dict[str, int]:
+        """Get the usage counters of the in-memory query cache"""
+        return self._parsed.stats()
+
+    async def add_query(self, query: QueryObj, result: rest_api.LoadTrackResponses) -> bool:
         if query.is_custom_playlist or query.is_http:
             # Do not cache local queries and single track urls or http source entries
             return False
@@ -88,12 +134,9 @@ class QueryController:
         # noinspection PyProtectedMember
         if not query_row._was_created:
             await QueryRow.update(defaults).where(QueryRow.identifier == query.query_identifier)
-        new_tracks = []
-        # TODO: Optimize this, after https://github.com/piccolo-orm/piccolo/discussions/683 is answered or fixed
-        for track in tracks:
-            new_tracks.append(await TrackRow.get_or_create(track))
+        new_tracks = await TrackRow.bulk_upsert(tracks)
         if new_tracks:
-            await query_row.add_m2m(*new_tracks, m2m=QueryRow.tracks)
+            await TrackToQueries.replace(query.query_identifier, new_tracks)
             return True
         await QueryRow.delete().where(QueryRow.identifier == query.query_identifier)
         return False
@@ -101,6 +144,7 @@ class QueryController:
     async def delete_old(self) -> None:
         with contextlib.suppress(asyncio.exceptions.CancelledError, asyncpg.exceptions.CannotConnectNowError):
             LOGGER.trace("Deleting old queries")
+            self._parsed.clear()
             from pylav.players.query.local_files import LocalFile
 
             await QueryRow.delete().where(
@@ -109,20 +153,20 @@ class QueryController:
             )
             LOGGER.trace("Deleted old queries")
 
-    @staticmethod
-    async def wipe() -> None:
+    async def wipe(self) -> None:
         LOGGER.trace("Wiping query cache")
+        self._parsed.clear()
         await QueryRow.raw(
             "TRUNCATE TABLE query",
         )
         LOGGER.trace("Wiped query cache")
 
-    @staticmethod
-    async def delete_older_than(days: int) -> None:
+    async def delete_older_than(self, days: int) -> None:
+        self._parsed.clear()
         await QueryRow.delete().where(QueryRow.last_updated <= (get_now_utc() - datetime.timedelta(days=days)))
 
-    @staticmethod
-    async def delete_query(query: QueryObj) -> None:
+    async def delete_query(self, query: QueryObj) -> None:
+        self._parsed.pop(query.query_identifier)
         await QueryRow.delete().where(QueryRow.identifier == query.query_identifier)
 
     @staticmethod
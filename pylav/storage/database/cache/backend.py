@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import sys
+from collections import OrderedDict
+from typing import Any
+
+from cashews.backends.memory import Memory  # type: ignore
+from cashews.utils import get_obj_size  # type: ignore
+
+DEFAULT_PRIORITY = 0
+# Priority for large collections (track lists, full rows) which are cheap to rebuild relative to their size
+LOW_PRIORITY = -1
+# Lifetime in seconds for large collections so that they don't linger in memory after they stop being used
+COLLECTION_TTL = 300
+
+# Maps "module:method" to the eviction priority registered by `maybe_cached`,
+# entries with a lower priority are evicted first when the byte budget is exceeded.
+_PRIORITIES: dict[str, int] = {}
+# Maps "module:method" to the lifetime in seconds registered by `maybe_cached`, so that values written
+# outside of the decorator (updates, priming) expire like the ones it caches.
+_TTLS: dict[str, int | None] = {}
+
+
+def method_key(module: str, name: str) -> str:
+    """Build the registry key used to look up the eviction priority of a cached method"""
+    return f"{module}:{name}"
+
+
+def register_method(module: str, name: str, priority: int, ttl: int | None) -> None:
+    """Register the eviction priority and the lifetime for the cached method `name` in `module`"""
+    _PRIORITIES[method_key(module, name)] = priority
+    _TTLS[method_key(module, name)] = ttl
+
+
+def _method_key_for(key: str) -> str | None:
+    parts = key.split(":", 3)
+    return method_key(parts[0], parts[2]) if len(parts) >= 3 else None
+
+
+def priority_for(key: str) -> int:
+    """Get the eviction priority for a cache key built by `key_builder`"""
+    return _PRIORITIES.get(_method_key_for(key), DEFAULT_PRIORITY)
+
+
+def ttl_for(key: str) -> int | None:
+    """Get the lifetime in seconds for a cache key built by `key_builder`, None if it never expires"""
+    return _TTLS.get(_method_key_for(key))
+
+
+class SizedMemory(Memory):
+    """In-memory LRU backend bounded by an approximate byte budget rather than an entry count.
+
+    Every entry is tracked under the priority of the method that produced it, when the budget is exceeded
+    the least recently used entries of the lowest priority are evicted first.
+    """
+
+    def __init__(self, max_bytes: int, check_interval: float = 10, **kwargs: Any) -> None:
+        super().__init__(size=sys.maxsize, check_interval=check_interval, **kwargs)
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entry_sizes: dict[str, tuple[int, int]] = {}
+        self._lru: dict[int, OrderedDict[str, None]] = {}
+
+    def _track(self, key: str, value: Any) -> None:
+        self._forget(key)
+        priority = priority_for(key)
+        size = get_obj_size(value)
+        self._entry_sizes[key] = (priority, size)
+        self._lru.setdefault(priority, OrderedDict())[key] = None
+        self.current_bytes += size
+
+    def _forget(self, key: str) -> None:
+        if (entry := self._entry_sizes.pop(key, None)) is None:
+            return
+        priority, size = entry
+        self.current_bytes -= size
+        if (bucket := self._lru.get(priority)) is not None:
+            bucket.pop(key, None)
+            if not bucket:
+                del self._lru[priority]
+
+    def _touch(self, key: str) -> None:
+        if (entry := self._entry_sizes.get(key)) is not None:
+            self._lru[entry[0]].move_to_end(key)
+
+    def _evict(self, keep: str) -> None:
+        while self.current_bytes > self.max_bytes:
+            # The entry that was just written is never evicted to make room for itself
+            key = next((k for p in sorted(self._lru) for k in self._lru[p] if k != keep), None)
+            if key is None:
+                break
+            self.store.pop(key, None)
+            self._forget(key)
+            self.evictions += 1
+
+    def _set(self, key: str, value: Any, expire: float | None = None) -> None:
+        super()._set(key, value, expire)
+        self._track(key, value)
+        self._evict(keep=key)
+
+    def record_lookup(self, key: str, hit: bool) -> None:
+        """Count a lookup made by a cached method and mark the entry as recently used on a hit.
+
+        This is not done in `_get` since the periodic sweep of expired entries goes through it for every key.
+        """
+        if hit:
+            self.hits += 1
+            self._touch(key)
+        else:
+            self.misses += 1
+
+    async def _delete(self, key: str) -> bool:
+        self._forget(key)
+        return await super()._delete(key)
+
+    async def clear(self) -> None:
+        await super().clear()
+        self._entry_sizes.clear()
+        self._lru.clear()
+        self.current_bytes = 0
+
+    def stats(self) -> dict[str, int]:
+        """Get the current usage counters of the cache"""
+        return {
+            "entries": len(self.store),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
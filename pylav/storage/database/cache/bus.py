@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import uuid
+from collections.abc import Awaitable, Callable, Iterable, Iterator
+from typing import TYPE_CHECKING, Any
+
+import asyncpg  # type: ignore
+
+from pylav.compat import json
+from pylav.storage.database.cache.logging import LOGGER
+from pylav.storage.database.tables.misc import DATABASE_ENGINE, IS_POSTGRES
+
+if TYPE_CHECKING:
+    from cashews import Cache  # type: ignore
+
+INVALIDATION_CHANNEL = "pylav_cache_invalidation"
+# Postgres rejects NOTIFY payloads of 8000 bytes or more, leave room for the envelope
+MAX_PAYLOAD_SIZE = 7500
+RECONNECT_DELAY = 5
+# Keys held back while the connection is down, past this the peers are asked to clear everything instead
+MAX_PENDING_KEYS = 10000
+
+
+class InvalidationBus:
+    """Propagates read cache invalidations to every process using the same database.
+
+    Keys invalidated or updated in one process are published with Postgres ``NOTIFY`` and evicted from the
+    local cache of every other process listening on the channel, the process that published them ignores its
+    own notifications. Keys published while the connection is down are held back and sent once it is back.
+
+    Listeners added with :meth:`add_listener` are called with the keys evicted because of another process, or
+    with None when the whole cache was cleared.
+    """
+
+    def __init__(self, cache: Cache, channel: str = INVALIDATION_CHANNEL) -> None:
+        self._cache = cache
+        self._channel = channel
+        self._origin = uuid.uuid4().hex
+        self._connection: asyncpg.Connection | None = None
+        self._lock = asyncio.Lock()
+        self._tasks: set[asyncio.Task] = set()
+        self._stopped = True
+        self._listeners: list[Callable[[list[str] | None], Awaitable[None]]] = []
+        self._pending: set[str] = set()
+        self._pending_clear = False
+
+    def add_listener(self, listener: Callable[[list[str] | None], Awaitable[None]]) -> None:
+        """Call the coroutine function whenever keys are evicted because of another process
+
+        Parameters
+        ----------
+        listener: Callable[[list[str] | None], Awaitable[None]]
+            Called with the evicted keys, or with None when the whole cache was cleared.
+        """
+        self._listeners.append(listener)
+
+    @property
+    def running(self) -> bool:
+        """Whether the bus is currently connected and listening"""
+        return self._connection is not None and not self._connection.is_closed()
+
+    async def start(self) -> None:
+        """Start listening for invalidations from other processes"""
+        if not IS_POSTGRES:
+            LOGGER.debug("Not using Postgres, cache invalidations will not be shared across processes")
+            return
+        if self.running:
+            return
+        self._stopped = False
+        await self._connect()
+
+    async def stop(self) -> None:
+        """Stop listening for invalidations and close the dedicated connection"""
+        self._stopped = True
+        for task in list(self._tasks):
+            task.cancel()
+        if (connection := self._connection) is not None:
+            self._connection = None
+            with contextlib.suppress(Exception):
+                await connection.remove_listener(self._channel, self._on_notification)
+            with contextlib.suppress(Exception):
+                await connection.close()
+
+    async def publish(self, keys: Iterable[str]) -> None:
+        """Ask every other process to evict the specified keys from their local cache.
+
+        Parameters
+        ----------
+        keys: Iterable[str]
+            The cache keys that were invalidated or updated.
+        """
+        if self._stopped:
+            return
+        self._hold(keys)
+        if self.running:
+            await self._flush()
+
+    def _hold(self, keys: Iterable[str]) -> None:
+        if self._pending_clear:
+            return
+        self._pending.update(keys)
+        if len(self._pending) > MAX_PENDING_KEYS:
+            self._pending.clear()
+            self._pending_clear = True
+
+    async def _flush(self) -> None:
+        """Send the held back keys, they are held back again if the connection fails"""
+        if self._pending_clear:
+            payloads = [self._dump({"clear": True})]
+        else:
+            payloads = list(self._payloads(self._pending))
+        keys, clear = self._pending, self._pending_clear
+        self._pending, self._pending_clear = set(), False
+        try:
+            for payload in payloads:
+                async with self._lock:
+                    await self._connection.execute("SELECT pg_notify($1, $2)", self._channel, payload)
+        except Exception as exc:
+            LOGGER.warning("Failed to publish cache invalidation, it will be sent again later", exc_info=exc)
+            # Sending the batches that did go out once more is harmless
+            self._pending_clear = self._pending_clear or clear
+            self._hold(keys)
+
+    async def _connect(self) -> None:
+        connection = await DATABASE_ENGINE.get_new_connection()
+        await connection.add_listener(self._channel, self._on_notification)
+        connection.add_termination_listener(self._on_termination)
+        self._connection = connection
+        LOGGER.debug("Listening for cache invalidations on %s", self._channel)
+
+    def _payloads(self, keys: Iterable[str]) -> Iterator[str]:
+        batch: list[str] = []
+        size = 0
+        for key in keys:
+            key_size = len(json.dumps(key)) + 1
+            if key_size > MAX_PAYLOAD_SIZE:
+                # The key cannot fit in a notification, the only safe option left is for others to drop everything
+                yield self._dump({"clear": True})
+                return
+            if batch and size + key_size > MAX_PAYLOAD_SIZE:
+                yield self._dump({"keys": batch})
+                batch, size = [], 0
+            batch.append(key)
+            size += key_size
+        if batch:
+            yield self._dump({"keys": batch})
+
+    def _dump(self, data: dict[str, Any]) -> str:
+        return json.dumps({"origin": self._origin, **data})
+
+    def _spawn(self, coro: Any) -> None:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _on_notification(self, connection: asyncpg.Connection, pid: int, channel: str, payload: str) -> None:
+        data = json.loads(payload)
+        if data.get("origin") == self._origin:
+            return
+        self._spawn(self._apply(data))
+
+    def _on_termination(self, connection: asyncpg.Connection) -> None:
+        if self._stopped or connection is not self._connection:
+            return
+        self._connection = None
+        LOGGER.warning("Lost the cache invalidation connection, reconnecting")
+        self._spawn(self._reconnect())
+
+    async def _apply(self, data: dict[str, Any]) -> None:
+        if data.get("clear"):
+            await self._clear()
+        elif keys := data.get("keys"):
+            await self._cache.delete_many(*keys)
+            await self._notify(keys)
+
+    async def _clear(self) -> None:
+        await self._cache.clear()
+        await self._notify(None)
+
+    async def _notify(self, keys: list[str] | None) -> None:
+        for listener in self._listeners:
+            try:
+                await listener(keys)
+            except Exception as exc:
+                LOGGER.warning("Cache invalidation listener %r failed", listener, exc_info=exc)
+
+    async def _reconnect(self) -> None:
+        # Any invalidation sent while disconnected was missed, so nothing cached locally can be trusted anymore
+        await self._clear()
+        while not self._stopped:
+            try:
+                await self._connect()
+            except Exception as exc:
+                LOGGER.debug("Failed to reconnect the cache invalidation connection", exc_info=exc)
+                await asyncio.sleep(RECONNECT_DELAY)
+            else:
+                await self._flush()
+                return
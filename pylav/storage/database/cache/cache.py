@@ -1,14 +1,16 @@
 from __future__ import annotations
 
-from cashews import Cache  # type: ignore
+from cashews import Cache, register_backend  # type: ignore
 
-from pylav.constants.config import READ_CACHING_ENABLED
+from pylav.constants.config import READ_CACHING_ENABLED, READ_CACHING_MAX_SIZE_MB, READ_CACHING_SHARED_ADDRESS
+from pylav.storage.database.cache.backend import SizedMemory
+from pylav.storage.database.cache.bus import InvalidationBus
 from pylav.storage.database.cache.logging import LOGGER
 
 if READ_CACHING_ENABLED:
     LOGGER.warning(
         "Caching is enabled, "
-        "this will make it so live edits to the database will not be reflected "
+        "this will make it so manual edits to the database will not be reflected "
         "in the bot until the cache is invalidated or bot is restarted."
     )
 else:
@@ -18,6 +20,32 @@ else:
     )
 
 
+register_backend("pylav-mem", SizedMemory)
+
+# Entries are expected to be short-lived or invalidated on write, so the budget is what keeps memory bounded.
 CACHE = Cache("ReadCache")
-CACHE.setup("mem://?check_interval=10", size=1_000_000, enable=READ_CACHING_ENABLED)
-# TODO: Allow for redis caching
+_BACKEND: SizedMemory = CACHE.setup(
+    "pylav-mem://",
+    max_bytes=READ_CACHING_MAX_SIZE_MB * 1024 * 1024,
+    check_interval=10,
+    enable=READ_CACHING_ENABLED,
+)
+
+# Optional second tier shared by every process, checked when the in-memory cache misses
+SHARED_CACHE: Cache | None = None
+if READ_CACHING_ENABLED and READ_CACHING_SHARED_ADDRESS:
+    SHARED_CACHE = Cache("SharedReadCache")
+    SHARED_CACHE.setup(READ_CACHING_SHARED_ADDRESS)
+
+# Evicts keys from the in-memory cache of other processes when they are invalidated or updated in this one
+INVALIDATION_BUS = InvalidationBus(CACHE)
+
+
+def record_lookup(key: str, hit: bool) -> None:
+    """Count a lookup of a cached method in the stats of the in-memory cache"""
+    _BACKEND.record_lookup(key, hit)
+
+
+def get_cache_stats() -> dict[str, int]:
+    """Get the entry count, approximate size in bytes, hits, misses and evictions of the read cache"""
+    return _BACKEND.stats()
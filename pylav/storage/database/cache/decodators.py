@@ -4,18 +4,50 @@ import functools
 from collections.abc import Awaitable, Callable
 
 from pylav.constants.config import READ_CACHING_ENABLED
-from pylav.storage.database.cache.cache import CACHE
+from pylav.storage.database.cache.backend import DEFAULT_PRIORITY, register_method
+from pylav.storage.database.cache.cache import CACHE, SHARED_CACHE, record_lookup
 from pylav.storage.database.cache.functions import key_builder
 from pylav.type_hints.generics import ANY_GENERIC_TYPE, PARAM_SPEC_TYPE
 
 
 def maybe_cached(
-    func: Callable[PARAM_SPEC_TYPE, Awaitable[ANY_GENERIC_TYPE]]  # type: ignore
+    func: Callable[PARAM_SPEC_TYPE, Awaitable[ANY_GENERIC_TYPE]] | None = None,  # type: ignore
+    *,
+    ttl: int | None = None,
+    priority: int = DEFAULT_PRIORITY,
 ) -> Callable[ANY_GENERIC_TYPE, Awaitable[ANY_GENERIC_TYPE]]:  # type: ignore
-    @functools.wraps(func)
-    async def wrapper(*args: PARAM_SPEC_TYPE.args, **kwargs: PARAM_SPEC_TYPE.kwargs) -> Awaitable[ANY_GENERIC_TYPE]:
-        if READ_CACHING_ENABLED:
-            return await CACHE(ttl=None, key=key_builder(func, *args, **kwargs))(func)(*args, **kwargs)
-        return await func(*args, **kwargs)
+    """Cache the result of the decorated method if read caching is enabled.
 
-    return wrapper
+    Can be used as ``@maybe_cached`` or ``@maybe_cached(ttl=..., priority=...)``, where ``ttl`` is the lifetime
+    of an entry in seconds (``None`` keeps it until it is invalidated or evicted) and entries with a lower
+    ``priority`` are evicted first once the cache is over its memory budget.
+    """
+
+    def decorator(
+        func: Callable[PARAM_SPEC_TYPE, Awaitable[ANY_GENERIC_TYPE]]  # type: ignore
+    ) -> Callable[ANY_GENERIC_TYPE, Awaitable[ANY_GENERIC_TYPE]]:  # type: ignore
+        register_method(func.__module__, func.__name__, priority, ttl)
+
+        @functools.wraps(func)
+        async def wrapper(*args: PARAM_SPEC_TYPE.args, **kwargs: PARAM_SPEC_TYPE.kwargs) -> Awaitable[ANY_GENERIC_TYPE]:
+            if READ_CACHING_ENABLED:
+                key = key_builder(func, *args, **kwargs)
+                fetch = func if SHARED_CACHE is None else SHARED_CACHE(ttl=ttl, key=key)(func)
+                missed = False
+
+                @functools.wraps(fetch)
+                async def load(*a: PARAM_SPEC_TYPE.args, **kw: PARAM_SPEC_TYPE.kwargs) -> ANY_GENERIC_TYPE:
+                    nonlocal missed
+                    missed = True
+                    return await fetch(*a, **kw)
+
+                result = await CACHE(ttl=ttl, key=key)(load)(*args, **kwargs)
+                record_lookup(key, hit=not missed)
+                return result
+            return await func(*args, **kwargs)
+
+        # Marks the method as cached so that `CachedModel.invalidate_cache` picks it up
+        wrapper.cache = True
+        return wrapper
+
+    return decorator if func is None else decorator(func)
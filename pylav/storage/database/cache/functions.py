@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+from collections import defaultdict
 from collections.abc import Callable, Iterable
 from typing import Any
 
-from pylav.storage.database.cache.cache import CACHE
+from pylav.storage.database.cache.backend import ttl_for
+from pylav.storage.database.cache.cache import CACHE, INVALIDATION_BUS, SHARED_CACHE
 
 
 def key_builder(method: Callable, *args: Any, **kwargs: Any) -> str:  # noqa
@@ -11,16 +13,53 @@ def key_builder(method: Callable, *args: Any, **kwargs: Any) -> str:  # noqa
 
 
 async def invalidate_cache(method: Callable, instance: object) -> None:
-    await CACHE.delete(key=key_builder(method, instance))
+    await invalidate_keys(key_builder(method, instance))
 
 
 async def update_cache(method: Callable, instance: object, value: Any) -> None:
-    await CACHE.set(key=key_builder(method, instance), value=value)
+    await update_keys({key_builder(method, instance): value})
 
 
 async def update_cache_multi(pairs: Iterable[tuple[Callable, Any]], instance: object) -> None:
-    await CACHE.set_many(pairs={key_builder(method, instance): value for method, value in pairs})
+    await update_keys({key_builder(method, instance): value for method, value in pairs})
 
 
 async def invalidate_cache_multi(methods: Iterable[Callable], instance: object) -> None:
-    await CACHE.delete_many(*[key_builder(method, instance) for method in methods])
+    await invalidate_keys(*[key_builder(method, instance) for method in methods])
+
+
+async def invalidate_keys(*keys: str) -> None:
+    """Invalidate the keys in every cache tier and in the local cache of other processes"""
+    if not keys:
+        return
+    await CACHE.delete_many(*keys)
+    if SHARED_CACHE is not None:
+        await SHARED_CACHE.delete_many(*keys)
+    await INVALIDATION_BUS.publish(keys)
+
+
+async def update_keys(pairs: dict[str, Any]) -> None:
+    """Update the keys in every cache tier and evict them from the local cache of other processes"""
+    if not pairs:
+        return
+    for ttl, group in _group_by_ttl(pairs).items():
+        await CACHE.set_many(pairs=group, expire=ttl)
+        if SHARED_CACHE is not None:
+            await SHARED_CACHE.set_many(pairs=group, expire=ttl)
+    await INVALIDATION_BUS.publish(pairs.keys())
+
+
+async def prime_keys(pairs: dict[str, Any]) -> None:
+    """Populate the in-memory cache with values freshly read from the database, other processes are not notified"""
+    if not pairs:
+        return
+    for ttl, group in _group_by_ttl(pairs).items():
+        await CACHE.set_many(pairs=group, expire=ttl)
+
+
+def _group_by_ttl(pairs: dict[str, Any]) -> dict[int | None, dict[str, Any]]:
+    """Group the pairs by the lifetime of the method that caches them"""
+    groups: defaultdict[int | None, dict[str, Any]] = defaultdict(dict)
+    for key, value in pairs.items():
+        groups[ttl_for(key)][key] = value
+    return groups
@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+from piccolo.columns import BigInt, Text
+from piccolo.table import Table
+
+from pylav.storage.database.tables.misc import DATABASE_ENGINE
+
+
+class LocalTrackRow(Table, db=DATABASE_ENGINE, tablename="local_track"):
+    path = Text(primary_key=True, index=True)
+    size = BigInt(default=0)
+    mtime = BigInt(default=0)
+    encoded = Text()
@@ -1,19 +1,425 @@
 from __future__ import annotations
 
-from piccolo.columns import ForeignKey
+from collections.abc import AsyncIterator, Sequence
+
+from piccolo.columns import Column, ForeignKey, Integer
+from piccolo.engine.sqlite import TransactionType
 from piccolo.table import Table
 
-from pylav.storage.database.tables.misc import DATABASE_ENGINE
+from pylav.storage.database.tables.misc import DATABASE_ENGINE, IS_POSTGRES
 from pylav.storage.database.tables.playlists import PlaylistRow
 from pylav.storage.database.tables.queries import QueryRow
-from pylav.storage.database.tables.tracks import TrackRow
+from pylav.storage.database.tables.tracks import BULK_BATCH_SIZE, TrackRow
+from pylav.type_hints.dict_typing import JSON_DICT_TYPE
+
+
+async def _next_position(table: type[Table], owner_column: Column, owner: int | str) -> int:
+    response = (
+        await table.select(table.position)
+        .where(owner_column == owner)
+        .order_by(table.position, ascending=False)
+        .first()
+    )
+    return response["position"] + 1 if response else 0
+
+
+def _transaction():
+    if IS_POSTGRES:
+        return DATABASE_ENGINE.transaction()
+    # SQLite has a single writer, taking the write lock when the transaction starts is enough to keep two writers
+    # from reading the same next position
+    return DATABASE_ENGINE.transaction(transaction_type=TransactionType.immediate)
+
+
+async def _lock_owner(table: type[Table], owner: int | str) -> None:
+    # Serialise the writes to the positions of one owner until the end of the current transaction
+    if IS_POSTGRES:
+        await table.raw("SELECT pg_advisory_xact_lock(hashtext({}))", f"{table._meta.tablename}:{owner}")
+
+
+async def _link(
+    table: type[Table], owner_column: Column, owner: int | str, tracks: Sequence[str], offset: int | None = None
+) -> None:
+    owner_name = owner_column._meta.name
+    async with _transaction():
+        await _lock_owner(table, owner)
+        if offset is None:
+            offset = await _next_position(table, owner_column, owner)
+        for start in range(0, len(tracks), BULK_BATCH_SIZE):
+            await table.insert(
+                *(
+                    table(**{owner_name: owner, "tracks": track, "position": position})
+                    for position, track in enumerate(tracks[start : start + BULK_BATCH_SIZE], start=offset + start)
+                )
+            )
+
+
+async def _unlink(
+    table: type[Table], owner_column: Column, owner: int | str, tracks: Sequence[str] | None = None
+) -> None:
+    async with _transaction():
+        await _lock_owner(table, owner)
+        if tracks is None:
+            await table.delete().where(owner_column == owner)
+            return
+        for start in range(0, len(tracks), BULK_BATCH_SIZE):
+            await table.delete().where(
+                (owner_column == owner) & table.tracks.is_in(list(tracks[start : start + BULK_BATCH_SIZE]))
+            )
+        # Nothing left to renumber when every track of the owner was removed
+        if await table.exists().where(owner_column == owner):
+            await _compact(table, owner_column, owner)
+
+
+async def _compact(table: type[Table], owner_column: Column, owner: int | str) -> None:
+    # Close the gaps left behind by removed entries so positions stay contiguous and can be looked up directly.
+    # The rows are moved through negative positions first, so that the unique (owner, position) index never sees
+    # two rows on the same position while the statement runs.
+    tablename = table._meta.tablename
+    owner_name = owner_column._meta.db_column_name
+    if IS_POSTGRES:
+        await table.raw(
+            f"UPDATE {tablename} SET position = -1 - ranked.new_position "
+            f"FROM (SELECT id, ROW_NUMBER() OVER (ORDER BY position, id) - 1 AS new_position "
+            f"FROM {tablename} WHERE {owner_name} = {{}}) AS ranked "
+            f"WHERE {tablename}.id = ranked.id AND {tablename}.position <> ranked.new_position",
+            owner,
+        )
+    else:
+        # UPDATE ... FROM needs a recent SQLite, the new positions are worked out here instead
+        rows = (
+            await table.select(table.id, table.position).where(owner_column == owner).order_by(table.position, table.id)
+        )
+        for new_position, row in enumerate(rows):
+            if row["position"] != new_position:
+                await table.update({table.position: -1 - new_position}).where(table.id == row["id"])
+    await table.raw(
+        f"UPDATE {tablename} SET position = -1 - position WHERE {owner_name} = {{}} AND position < 0",
+        owner,
+    )
+
+
+async def _create_position_index(table: type[Table], owner_column: Column) -> None:
+    tablename = table._meta.tablename
+    owner_name = owner_column._meta.db_column_name
+    if not IS_POSTGRES:
+        await table.raw(
+            f"CREATE INDEX IF NOT EXISTS {tablename}_{owner_name}_position ON {tablename} ({owner_name}, position)"
+        )
+        return
+    index_name = f"unique_{tablename}_{owner_name}_position"
+    if (await table.raw("SELECT to_regclass({}) AS name", index_name))[0]["name"] is None:
+        # Positions written by concurrent links before the index existed may collide, renumber every owner first
+        await table.raw(
+            f"UPDATE {tablename} SET position = ranked.new_position "
+            f"FROM (SELECT id, ROW_NUMBER() OVER (PARTITION BY {owner_name} ORDER BY position, id) - 1 "
+            f"AS new_position FROM {tablename}) AS ranked "
+            f"WHERE {tablename}.id = ranked.id AND {tablename}.position <> ranked.new_position"
+        )
+        await table.raw(f"CREATE UNIQUE INDEX IF NOT EXISTS {index_name} ON {tablename} ({owner_name}, position)")
+    # Superseded by the unique index
+    await table.raw(f"DROP INDEX IF EXISTS {tablename}_{owner_name}_position")
+
+
+async def _replace(table: type[Table], owner_column: Column, owner: int | str, tracks: Sequence[str]) -> None:
+    async with _transaction():
+        await _lock_owner(table, owner)
+        await _unlink(table, owner_column, owner)
+        await _link(table, owner_column, owner, tracks, offset=0)
+
+
+def _track_columns(table: type[Table]) -> tuple[Column, ...]:
+    return (
+        table.tracks.as_alias("encoded"),
+        table.tracks.info.as_alias("info"),
+        table.tracks.pluginInfo.as_alias("pluginInfo"),
+    )
+
+
+async def _fetch_index(table: type[Table], owner_column: Column, owner: int | str, index: int) -> JSON_DICT_TYPE | None:
+    return (
+        await table.select(*_track_columns(table))
+        .where((owner_column == owner) & (table.position == index))
+        .first()
+        .output(load_json=True)
+    )
+
+
+async def _fetch_range(
+    table: type[Table], owner_column: Column, owner: int | str, start: int = 0, stop: int | None = None
+) -> list[JSON_DICT_TYPE]:
+    condition = (owner_column == owner) & (table.position >= start)
+    if stop is not None:
+        condition &= table.position < stop
+    return await table.select(*_track_columns(table)).where(condition).order_by(table.position).output(load_json=True)
+
+
+async def _iter_tracks(
+    table: type[Table], owner_column: Column, owner: int | str, batch_size: int
+) -> AsyncIterator[JSON_DICT_TYPE]:
+    # Keyset pagination - each batch resumes after the last position seen, so every page is a single index range scan.
+    position = 0
+    while True:
+        batch = (
+            await table.select(*_track_columns(table), table.position)
+            .where((owner_column == owner) & (table.position >= position))
+            .order_by(table.position)
+            .limit(batch_size)
+            .output(load_json=True)
+        )
+        if not batch:
+            return
+        position = batch[-1]["position"] + 1
+        for track in batch:
+            del track["position"]
+            yield track
+        if len(batch) < batch_size:
+            return
+
+
+async def _size(table: type[Table], owner_column: Column, owner: int | str) -> int:
+    return await table.count().where(owner_column == owner)
 
 
 class TrackToQueries(Table, db=DATABASE_ENGINE):
     queries = ForeignKey(QueryRow)
     tracks = ForeignKey(TrackRow)
+    position = Integer(default=0)
+
+    @classmethod
+    async def create_position_index(cls) -> None:
+        """Create the unique index on the position of the tracks of each query."""
+        await _create_position_index(cls, cls.queries)
+
+    @classmethod
+    async def link(cls, query: str, tracks: Sequence[str]) -> None:
+        """Link the given tracks to a query.
+
+        Parameters
+        ----------
+        query : str
+            The identifier of the query.
+        tracks : Sequence[str]
+            The encoded strings of the tracks to link.
+        """
+        await _link(cls, cls.queries, query, tracks)
+
+    @classmethod
+    async def unlink(cls, query: str, tracks: Sequence[str] | None = None) -> None:
+        """Unlink tracks from a query.
+
+        Parameters
+        ----------
+        query : str
+            The identifier of the query.
+        tracks : Sequence[str] | None
+            The encoded strings of the tracks to unlink, if not provided all tracks are unlinked.
+        """
+        await _unlink(cls, cls.queries, query, tracks)
+
+    @classmethod
+    async def replace(cls, query: str, tracks: Sequence[str]) -> None:
+        """Replace the track set of a query within a single transaction.
+
+        Parameters
+        ----------
+        query : str
+            The identifier of the query.
+        tracks : Sequence[str]
+            The encoded strings of the new tracks.
+        """
+        await _replace(cls, cls.queries, query, tracks)
+
+    @classmethod
+    async def fetch_index(cls, query: str, index: int) -> JSON_DICT_TYPE | None:
+        """Fetch the track at the given position of a query.
+
+        Parameters
+        ----------
+        query : str
+            The identifier of the query.
+        index : int
+            The position of the track.
+
+        Returns
+        -------
+        JSON_DICT_TYPE | None
+            The track, or None if there is no track at that position.
+        """
+        return await _fetch_index(cls, cls.queries, query, index)
+
+    @classmethod
+    async def fetch_range(cls, query: str, start: int = 0, stop: int | None = None) -> list[JSON_DICT_TYPE]:
+        """Fetch the tracks of a query between two positions, in order.
+
+        Parameters
+        ----------
+        query : str
+            The identifier of the query.
+        start : int
+            The first position to fetch.
+        stop : int | None
+            The position to stop at (exclusive), if not provided all remaining tracks are fetched.
+
+        Returns
+        -------
+        list[JSON_DICT_TYPE]
+            The tracks.
+        """
+        return await _fetch_range(cls, cls.queries, query, start, stop)
+
+    @classmethod
+    def iter_tracks(cls, query: str, batch_size: int = 100) -> AsyncIterator[JSON_DICT_TYPE]:
+        """Iterate over the tracks of a query in order, fetching them in batches.
+
+        Parameters
+        ----------
+        query : str
+            The identifier of the query.
+        batch_size : int
+            The number of tracks to fetch per query.
+
+        Yields
+        ------
+        JSON_DICT_TYPE
+            The tracks.
+        """
+        return _iter_tracks(cls, cls.queries, query, batch_size)
+
+    @classmethod
+    async def size(cls, query: str) -> int:
+        """Count the tracks linked to a query.
+
+        Parameters
+        ----------
+        query : str
+            The identifier of the query.
+
+        Returns
+        -------
+        int
+            The number of tracks.
+        """
+        return await _size(cls, cls.queries, query)
 
 
 class TrackToPlaylists(Table, db=DATABASE_ENGINE):
     playlists = ForeignKey(PlaylistRow)
     tracks = ForeignKey(TrackRow)
+    position = Integer(default=0)
+
+    @classmethod
+    async def create_position_index(cls) -> None:
+        """Create the unique index on the position of the tracks of each playlist."""
+        await _create_position_index(cls, cls.playlists)
+
+    @classmethod
+    async def link(cls, playlist: int, tracks: Sequence[str]) -> None:
+        """Link the given tracks to a playlist.
+
+        Parameters
+        ----------
+        playlist : int
+            The id of the playlist.
+        tracks : Sequence[str]
+            The encoded strings of the tracks to link.
+        """
+        await _link(cls, cls.playlists, playlist, tracks)
+
+    @classmethod
+    async def unlink(cls, playlist: int, tracks: Sequence[str] | None = None) -> None:
+        """Unlink tracks from a playlist.
+
+        Parameters
+        ----------
+        playlist : int
+            The id of the playlist.
+        tracks : Sequence[str] | None
+            The encoded strings of the tracks to unlink, if not provided all tracks are unlinked.
+        """
+        await _unlink(cls, cls.playlists, playlist, tracks)
+
+    @classmethod
+    async def replace(cls, playlist: int, tracks: Sequence[str]) -> None:
+        """Replace the track set of a playlist within a single transaction.
+
+        Parameters
+        ----------
+        playlist : int
+            The id of the playlist.
+        tracks : Sequence[str]
+            The encoded strings of the new tracks.
+        """
+        await _replace(cls, cls.playlists, playlist, tracks)
+
+    @classmethod
+    async def fetch_index(cls, playlist: int, index: int) -> JSON_DICT_TYPE | None:
+        """Fetch the track at the given position of a playlist.
+
+        Parameters
+        ----------
+        playlist : int
+            The id of the playlist.
+        index : int
+            The position of the track.
+
+        Returns
+        -------
+        JSON_DICT_TYPE | None
+            The track, or None if there is no track at that position.
+        """
+        return await _fetch_index(cls, cls.playlists, playlist, index)
+
+    @classmethod
+    async def fetch_range(cls, playlist: int, start: int = 0, stop: int | None = None) -> list[JSON_DICT_TYPE]:
+        """Fetch the tracks of a playlist between two positions, in order.
+
+        Parameters
+        ----------
+        playlist : int
+            The id of the playlist.
+        start : int
+            The first position to fetch.
+        stop : int | None
+            The position to stop at (exclusive), if not provided all remaining tracks are fetched.
+
+        Returns
+        -------
+        list[JSON_DICT_TYPE]
+            The tracks.
+        """
+        return await _fetch_range(cls, cls.playlists, playlist, start, stop)
+
+    @classmethod
+    def iter_tracks(cls, playlist: int, batch_size: int = 100) -> AsyncIterator[JSON_DICT_TYPE]:
+        """Iterate over the tracks of a playlist in order, fetching them in batches.
+
+        Parameters
+        ----------
+        playlist : int
+            The id of the playlist.
+        batch_size : int
+            The number of tracks to fetch per query.
+
+        Yields
+        ------
+        JSON_DICT_TYPE
+            The tracks.
+        """
+        return _iter_tracks(cls, cls.playlists, playlist, batch_size)
+
+    @classmethod
+    async def size(cls, playlist: int) -> int:
+        """Count the tracks linked to a playlist.
+
+        Parameters
+        ----------
+        playlist : int
+            The id of the playlist.
+
+        Returns
+        -------
+        int
+            The number of tracks.
+        """
+        return await _size(cls, cls.playlists, playlist)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from piccolo.columns import JSONB, UUID, BigInt, Boolean, Float, Integer
+from piccolo.columns import JSONB, UUID, BigInt, Boolean, Bytea, Float, Integer
 from piccolo.table import Table
 
 from pylav.constants.config import DEFAULT_PLAYER_VOLUME
@@ -34,3 +34,6 @@ class PlayerStateRow(Table, db=DATABASE_ENGINE, tablename="player_state"):
     history = JSONB(null=False, default=[])
     effects = JSONB(null=False, default={})
     extras = JSONB(null=False, default={})
+    # Set instead of queue/history when PYLAV__COMPACT_PLAYER_STATE is enabled, see pylav.players.tracks.packing
+    queue_packed = Bytea(null=True, default=None)
+    history_packed = Bytea(null=True, default=None)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+from collections.abc import Iterable
 from typing import TYPE_CHECKING
 
 from asyncpg import UniqueViolationError  # type: ignore
@@ -9,13 +10,16 @@ from piccolo.columns.indexes import IndexMethod
 from piccolo.table import Table
 
 from pylav.logging import getLogger
-from pylav.storage.database.tables.misc import DATABASE_ENGINE
+from pylav.storage.database.tables.misc import DATABASE_ENGINE, IS_POSTGRES
 
 if TYPE_CHECKING:
     from pylav.nodes.api.responses.track import Track
 
 LOGGER = getLogger("PyLav.Database.Track")
 _LOCK = asyncio.Lock()
+# Postgres caps a single statement at 32767 bind parameters, older SQLite builds at 999,
+# with 9 columns per track these keep every batch under the limit.
+BULK_BATCH_SIZE = 1000 if IS_POSTGRES else 100
 
 
 class TrackRow(Table, db=DATABASE_ENGINE, tablename="track"):
@@ -66,3 +70,68 @@ class TrackRow(Table, db=DATABASE_ENGINE, tablename="track"):
             except Exception as e:
                 LOGGER.trace("Error while creating track: %s", e, exc_info=True)
                 raise e
+
+    @classmethod
+    def _from_track(cls, track: Track) -> TrackRow:
+        return cls(
+            identifier=track.info.identifier,
+            sourceName=track.info.sourceName,
+            title=track.info.title,
+            uri=track.info.uri,
+            isrc=track.info.isrc,
+            encoded=track.encoded,
+            artworkUrl=track.info.artworkUrl,
+            info=track.info.to_dict(),
+            pluginInfo=track.pluginInfo.to_dict() if track.pluginInfo else None,
+        )
+
+    @classmethod
+    async def bulk_upsert(cls, tracks: Iterable[Track]) -> list[str]:
+        """Insert or update many tracks using as few statements as possible.
+
+        Each track is only written once even if it is given several times,
+        existing rows are only updated if they are missing their info or pluginInfo.
+
+        Parameters
+        ----------
+        tracks : Iterable[Track]
+            The tracks to insert.
+
+        Returns
+        -------
+        list[str]
+            The primary keys (encoded strings) of the tracks, one per track in input order, duplicates included.
+        """
+        keys: list[str] = []
+        unique: dict[str, Track] = {}
+        for track in tracks:
+            if not track.encoded:
+                continue
+            keys.append(track.encoded)
+            unique.setdefault(track.encoded, track)
+        if not unique:
+            return []
+        # Sorting by primary key keeps the lock order consistent across concurrent upserts,
+        # which avoids deadlocks between two transactions touching the same rows.
+        rows = [cls._from_track(unique[encoded]) for encoded in sorted(unique)]
+        try:
+            for start in range(0, len(rows), BULK_BATCH_SIZE):
+                await cls.insert(*rows[start : start + BULK_BATCH_SIZE]).on_conflict(
+                    target=cls.encoded,
+                    action="DO UPDATE",
+                    values=[
+                        cls.identifier,
+                        cls.sourceName,
+                        cls.title,
+                        cls.uri,
+                        cls.isrc,
+                        cls.artworkUrl,
+                        cls.info,
+                        cls.pluginInfo,
+                    ],
+                    where=cls.info.is_null() | cls.pluginInfo.is_null(),
+                )
+        except Exception as e:
+            LOGGER.trace("Error while bulk creating tracks: %s", e, exc_info=True)
+            raise e
+        return keys
@@ -18,6 +18,7 @@ from pylav.storage.migrations.low_level.v_1_3_8 import low_level_v_1_3_8_migrati
 from pylav.storage.migrations.low_level.v_1_7_0 import low_level_v_1_7_0_migration
 from pylav.storage.migrations.low_level.v_1_10_6 import low_level_v_1_10_6_migration
 from pylav.storage.migrations.low_level.v_1_15_7 import low_level_v_1_15_7_migration
+from pylav.storage.migrations.low_level.v_1_16_0 import low_level_v_1_16_0_migration
 
 if TYPE_CHECKING:
     from pylav.storage.controllers.config import ConfigController
@@ -34,6 +35,7 @@ async def run_low_level_migrations(migrator: ConfigController) -> dict[str, dict
     await low_level_v_1_7_0_migration(con)
     await low_level_v_1_10_6_migration(con)
     await low_level_v_1_15_7_migration(con)
+    await low_level_v_1_16_0_migration(con)
     return migration_data
 
 
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from asyncpg import Connection
+
+from pylav.storage.migrations.logging import LOGGER
+
+
+async def low_level_v_1_16_0_migration(con: Connection) -> None:
+    """Run the low level migration for PyLav 1.16.0."""
+    await low_level_v_1_16_0_track_links(con)
+    await low_level_v_1_16_0_player_state_packing(con)
+
+
+async def low_level_v_1_16_0_track_links(con: Connection) -> None:
+    """Run the track link tables migration for PyLav 1.16.0."""
+    await run_track_links_migration_v_1_16_0(con, "track_to_playlists", "playlists")
+    await run_track_links_migration_v_1_16_0(con, "track_to_queries", "queries")
+
+
+async def run_track_links_migration_v_1_16_0(con: Connection, table: str, owner: str) -> None:
+    """
+    Add the position column to a track link table and number the existing rows in insertion order.
+    """
+    has_column = """
+        SELECT EXISTS (SELECT 1
+        FROM information_schema.columns
+        WHERE table_name='version' AND column_name='version')
+        """
+    has_version_column = await con.fetchval(has_column)
+    if not has_version_column:
+        return
+
+    version = await con.fetchval("SELECT version from version;")
+    if version is None:
+        return
+
+    has_column = f"""
+            SELECT EXISTS (SELECT 1
+            FROM information_schema.columns
+            WHERE table_name='{table}' AND column_name='position')
+            """
+    has_column_response = await con.fetchval(has_column)
+    if not has_column_response:
+        LOGGER.info("----------- Migrating %s to PyLav 1.16.0 ---------", table)
+        alter_table = f"""
+        ALTER TABLE IF EXISTS {table}
+        ADD COLUMN IF NOT EXISTS "position" integer NOT NULL DEFAULT 0
+        """
+        await con.execute(alter_table)
+        backfill = f"""
+        UPDATE {table} SET position = ranked.new_position
+        FROM (
+            SELECT id, ROW_NUMBER() OVER (PARTITION BY {owner} ORDER BY id) - 1 AS new_position FROM {table}
+        ) AS ranked
+        WHERE {table}.id = ranked.id
+        """
+        await con.execute(backfill)
+
+
+async def low_level_v_1_16_0_player_state_packing(con: Connection) -> None:
+    """
+    Add the columns holding the packed queue and history to the player state table.
+    """
+    has_column = """
+        SELECT EXISTS (SELECT 1
+        FROM information_schema.columns
+        WHERE table_name='player_state' AND column_name='queue_packed')
+        """
+    has_column_response = await con.fetchval(has_column)
+    if not has_column_response:
+        LOGGER.info("----------- Migrating player_state to PyLav 1.16.0 ---------")
+        alter_table = """
+        ALTER TABLE IF EXISTS player_state
+        ADD COLUMN IF NOT EXISTS "queue_packed" bytea NULL DEFAULT NULL,
+        ADD COLUMN IF NOT EXISTS "history_packed" bytea NULL DEFAULT NULL
+        """
+        await con.execute(alter_table)
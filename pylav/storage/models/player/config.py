@@ -1,21 +1,76 @@
 from __future__ import annotations
 
+import copy
 import typing
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 import discord
 from piccolo.querystring import QueryString
 
 from pylav.compat import json
-from pylav.constants.config import DEFAULT_PLAYER_VOLUME
+from pylav.constants.config import DEFAULT_PLAYER_VOLUME, READ_CACHING_ENABLED
 from pylav.helpers.misc import TimedFeature
 from pylav.helpers.singleton import SingletonCachedByKey
+from pylav.storage.database.cache.cache import INVALIDATION_BUS
 from pylav.storage.database.cache.decodators import maybe_cached
 from pylav.storage.database.cache.model import CachedModel
 from pylav.storage.database.tables.players import PlayerRow
 from pylav.type_hints.dict_typing import JSON_DICT_TYPE
 
 
+@dataclass(slots=True, kw_only=True)
+class PlayerConfigSnapshot:
+    """An in-memory copy of a player config row, kept up to date by every write made through :class:`PlayerConfig`"""
+
+    id: int
+    bot: int
+    volume: int
+    max_volume: int
+    auto_play_playlist_id: int
+    text_channel_id: int
+    notify_channel_id: int
+    forced_channel_id: int
+    repeat_current: bool
+    repeat_queue: bool
+    shuffle: bool
+    auto_shuffle: bool
+    auto_play: bool
+    self_deaf: bool
+    empty_queue_dc: TimedFeature
+    alone_dc: TimedFeature
+    alone_pause: TimedFeature
+    extras: JSON_DICT_TYPE = field(default_factory=dict)
+    effects: JSON_DICT_TYPE = field(default_factory=dict)
+    dj_users: set[int] = field(default_factory=set)
+    dj_roles: set[int] = field(default_factory=set)
+
+
+_SNAPSHOTS: dict[tuple[int, int], PlayerConfigSnapshot] = {}
+
+
+def _snapshots_enabled() -> bool:
+    # Writes made by other processes or directly in the database only reach a snapshot through the bus, without
+    # it every read has to go to the database so that live edits show up immediately
+    return READ_CACHING_ENABLED and INVALIDATION_BUS.running
+
+
+async def _on_remote_invalidation(keys: list[str] | None) -> None:
+    """Reload the in-memory copies of the configs another process wrote to, or all of them if the cache was cleared"""
+    if keys is None:
+        stale = set(_SNAPSHOTS)
+    else:
+        prefix = f"{__name__}:{PlayerConfig.__name__}:"
+        stale = set()
+        for key in keys:
+            if not key.startswith(prefix):
+                continue
+            __, player_id, bot = key[len(prefix) :].split(":", 2)
+            stale.add((int(player_id), int(bot)))
+    for player_id, bot in stale & set(_SNAPSHOTS):
+        # noinspection PyProtectedMember
+        await PlayerConfig(id=player_id, bot=bot)._reload_snapshot()
+
+
 @dataclass(eq=True, slots=True, unsafe_hash=True, order=True, kw_only=True, frozen=True)
 class PlayerConfig(CachedModel, metaclass=SingletonCachedByKey):
     id: int
@@ -24,6 +79,61 @@ class PlayerConfig(CachedModel, metaclass=SingletonCachedByKey):
     def get_cache_key(self) -> str:
         return f"{self.id}:{self.bot}"
 
+    @property
+    def snapshot(self) -> PlayerConfigSnapshot | None:
+        """The in-memory copy of the config if it has been loaded with :meth:`load_snapshot`.
+
+        None while the cache invalidation bus is not running, since the copy could miss writes from other processes.
+        """
+        return _SNAPSHOTS.get((self.id, self.bot)) if _snapshots_enabled() else None
+
+    async def load_snapshot(self) -> PlayerConfigSnapshot | None:
+        """Load the config into memory, once loaded every fetch is served from it instead of the database.
+
+        Nothing is loaded unless read caching is enabled and the cache invalidation bus is running, as the bus is
+        what keeps the copy in sync with the writes of other processes.
+        """
+        _SNAPSHOTS.pop((self.id, self.bot), None)
+        if not _snapshots_enabled():
+            return None
+        return self._store_snapshot(await self.fetch_all())
+
+    async def _reload_snapshot(self) -> None:
+        """Reload the in-memory copy straight from the database, without going through the read cache"""
+        if _SNAPSHOTS.pop((self.id, self.bot), None) is None:
+            return
+        # The cached rows may be the ones another process just replaced
+        self._store_snapshot(await PlayerConfig.fetch_all.__wrapped__(self))
+
+    def _store_snapshot(self, data: JSON_DICT_TYPE) -> PlayerConfigSnapshot:
+        snapshot = PlayerConfigSnapshot(
+            **{
+                **data,
+                "extras": copy.deepcopy(data["extras"] or {}),
+                "effects": copy.deepcopy(data["effects"] or {}),
+                "dj_users": set(data["dj_users"] or []),
+                "dj_roles": set(data["dj_roles"] or []),
+            }
+        )
+        _SNAPSHOTS[(self.id, self.bot)] = snapshot
+        return snapshot
+
+    def discard_snapshot(self) -> None:
+        """Drop the in-memory copy of the config, fetches go back to the database"""
+        _SNAPSHOTS.pop((self.id, self.bot), None)
+
+    def _update_snapshot(self, **values: typing.Any) -> None:
+        if (snapshot := self.snapshot) is None:
+            return
+        for key, value in values.items():
+            setattr(snapshot, key, value)
+
+    async def invalidate_cache(self, *methods: typing.Callable) -> None:
+        """Invalidate the cache for the given methods if not specify all, and reload the in-memory copy if loaded"""
+        await CachedModel.invalidate_cache(self, *methods)
+        if not methods and self.snapshot is not None:
+            await self.load_snapshot()
+
     @classmethod
     async def create_global(cls, bot: int) -> None:
         """Create the player in the database"""
@@ -50,6 +160,7 @@ class PlayerConfig(CachedModel, metaclass=SingletonCachedByKey):
     async def delete(self) -> None:
         """Delete the player from the database"""
         await PlayerRow.delete().where((PlayerRow.id == self.id) & (PlayerRow.bot == self.bot))
+        # Reloads the in-memory copy with the defaults if it was loaded
         await self.invalidate_cache()
 
     @maybe_cached
@@ -101,6 +212,8 @@ class PlayerConfig(CachedModel, metaclass=SingletonCachedByKey):
     @maybe_cached
     async def fetch_volume(self) -> int:
         """Fetch the volume of the player from the db"""
+        if (snapshot := self.snapshot) is not None:
+            return snapshot.volume or DEFAULT_PLAYER_VOLUME
 
         player = (
             await PlayerRow.select(PlayerRow.volume)
@@ -115,12 +228,15 @@ class PlayerConfig(CachedModel, metaclass=SingletonCachedByKey):
         await PlayerRow.insert(PlayerRow(id=self.id, bot=self.bot, volume=volume)).on_conflict(
             action="DO UPDATE", target=(PlayerRow.id, PlayerRow.bot), values=[PlayerRow.volume]
         )
+        self._update_snapshot(volume=volume)
         await self.update_cache((self.fetch_volume, volume), (self.exists, True))
         await self.invalidate_cache(self.fetch_all)
 
     @maybe_cached
     async def fetch_max_volume(self) -> int:
         """Fetch the max volume of the player from the db"""
+        if (snapshot := self.snapshot) is not None:
+            return snapshot.max_volume or 1000
         player = (
             await PlayerRow.select(PlayerRow.max_volume)
             .where((PlayerRow.id == self.id) & (PlayerRow.bot == self.bot))
@@ -136,12 +252,15 @@ class PlayerConfig(CachedModel, metaclass=SingletonCachedByKey):
             target=(PlayerRow.id, PlayerRow.bot),
             values=[PlayerRow.max_volume],
         )
+        self._update_snapshot(max_volume=max_volume)
         await self.update_cache((self.fetch_max_volume, max_volume), (self.exists, True))
         await self.invalidate_cache(self.fetch_all)
 
     @maybe_cached
     async def fetch_auto_play_playlist_id(self) -> int:
         """Fetch the auto play playlist ID of the player"""
+        if (snapshot := self.snapshot) is not None:
+            return snapshot.auto_play_playlist_id
         player = (
             await PlayerRow.select(PlayerRow.auto_play_playlist_id)
             .where((PlayerRow.id == self.id) & (PlayerRow.bot == self.bot))
@@ -159,12 +278,15 @@ class PlayerConfig(CachedModel, metaclass=SingletonCachedByKey):
             target=(PlayerRow.id, PlayerRow.bot),
             values=[PlayerRow.auto_play_playlist_id],
         )
+        self._update_snapshot(auto_play_playlist_id=auto_play_playlist_id)
         await self.update_cache((self.fetch_auto_play_playlist_id, auto_play_playlist_id), (self.exists, True))
         await self.invalidate_cache(self.fetch_all)
 
     @maybe_cached
     async def fetch_text_channel_id(self) -> int:
         """Fetch the text channel ID of the player"""
+        if (snapshot := self.snapshot) is not None:
+            return snapshot.text_channel_id
         player = (
             await PlayerRow.select(PlayerRow.text_channel_id)
             .where((PlayerRow.id == self.id) & (PlayerRow.bot == self.bot))
@@ -180,12 +302,15 @@ class PlayerConfig(CachedModel, metaclass=SingletonCachedByKey):
             target=(PlayerRow.id, PlayerRow.bot),
             values=[PlayerRow.text_channel_id],
         )
+        self._update_snapshot(text_channel_id=text_channel_id)
         await self.update_cache((self.fetch_text_channel_id, text_channel_id), (self.exists, True))
         await self.invalidate_cache(self.fetch_all)
 
     @maybe_cached
     async def fetch_notify_channel_id(self) -> int:
         """Fetch the notify channel ID of the player"""
+        if (snapshot := self.snapshot) is not None:
+            return snapshot.notify_channel_id
         player = (
             await PlayerRow.select(PlayerRow.notify_channel_id)
             .where((PlayerRow.id == self.id) & (PlayerRow.bot == self.bot))
@@ -201,12 +326,15 @@ class PlayerConfig(CachedModel, metaclass=SingletonCachedByKey):
             target=(PlayerRow.id, PlayerRow.bot),
             values=[PlayerRow.notify_channel_id],
         )
+        self._update_snapshot(notify_channel_id=notify_channel_id)
         await self.update_cache((self.fetch_notify_channel_id, notify_channel_id), (self.exists, True))
         await self.invalidate_cache(self.fetch_all)
 
     @maybe_cached
     async def fetch_forced_channel_id(self) -> int:
         """Fetch the forced channel ID of the player"""
+        if (snapshot := self.snapshot) is not None:
+            return snapshot.forced_channel_id
         player = (
             await PlayerRow.select(PlayerRow.forced_channel_id)
             .where((PlayerRow.id == self.id) & (PlayerRow.bot == self.bot))
@@ -222,12 +350,15 @@ class PlayerConfig(CachedModel, metaclass=SingletonCachedByKey):
             target=(PlayerRow.id, PlayerRow.bot),
             values=[PlayerRow.forced_channel_id],
         )
+        self._update_snapshot(forced_channel_id=forced_channel_id)
         await self.update_cache((self.fetch_forced_channel_id, forced_channel_id), (self.exists, True))
         await self.invalidate_cache(self.fetch_all)
 
     @maybe_cached
     async def fetch_repeat_current(self) -> bool:
         """Fetch the repeat current of the player"""
+        if (snapshot := self.snapshot) is not None:
+            return snapshot.repeat_current
         player = (
             await PlayerRow.select(PlayerRow.repeat_current)
             .where((PlayerRow.id == self.id) & (PlayerRow.bot == self.bot))
@@ -243,12 +374,15 @@ class PlayerConfig(CachedModel, metaclass=SingletonCachedByKey):
             target=(PlayerRow.id, PlayerRow.bot),
             values=[PlayerRow.repeat_current],
         )
+        self._update_snapshot(repeat_current=repeat_current)
         await self.update_cache((self.fetch_repeat_current, repeat_current), (self.exists, True))
         await self.invalidate_cache(self.fetch_all)
 
     @maybe_cached
     async def fetch_repeat_queue(self) -> bool:
         """Fetch the repeat queue of the player"""
+        if (snapshot := self.snapshot) is not None:
+            return snapshot.repeat_queue
         player = (
             await PlayerRow.select(PlayerRow.repeat_queue)
             .where((PlayerRow.id == self.id) & (PlayerRow.bot == self.bot))
@@ -264,12 +398,15 @@ class PlayerConfig(CachedModel, metaclass=SingletonCachedByKey):
             target=(PlayerRow.id, PlayerRow.bot),
             values=[PlayerRow.repeat_queue],
         )
+        self._update_snapshot(repeat_queue=repeat_queue)
         await self.update_cache((self.fetch_repeat_queue, repeat_queue), (self.exists, True))
         await self.invalidate_cache(self.fetch_all)
 
     @maybe_cached
     async def fetch_shuffle(self) -> bool:
         """Fetch the shuffle of the player"""
+        if (snapshot := self.snapshot) is not None:
+            return snapshot.shuffle
         player = (
             await PlayerRow.select(PlayerRow.shuffle)
             .where((PlayerRow.id == self.id) & (PlayerRow.bot == self.bot))
@@ -285,12 +422,15 @@ class PlayerConfig(CachedModel, metaclass=SingletonCachedByKey):
             target=(PlayerRow.id, PlayerRow.bot),
             values=[PlayerRow.shuffle],
         )
+        self._update_snapshot(shuffle=shuffle)
         await self.update_cache((self.fetch_shuffle, shuffle), (self.exists, True))
         await self.invalidate_cache(self.fetch_all)
 
     @maybe_cached
     async def fetch_auto_shuffle(self) -> bool:
         """Fetch the auto shuffle of the player"""
+        if (snapshot := self.snapshot) is not None:
+            return snapshot.auto_shuffle
         player = (
             await PlayerRow.select(PlayerRow.auto_shuffle)
             .where((PlayerRow.id == self.id) & (PlayerRow.bot == self.bot))
@@ -306,12 +446,15 @@ class PlayerConfig(CachedModel, metaclass=SingletonCachedByKey):
             target=(PlayerRow.id, PlayerRow.bot),
             values=[PlayerRow.auto_shuffle],
         )
+        self._update_snapshot(auto_shuffle=auto_shuffle)
         await self.update_cache((self.fetch_auto_shuffle, auto_shuffle), (self.exists, True))
         await self.invalidate_cache(self.fetch_all)
 
     @maybe_cached
     async def fetch_auto_play(self) -> bool:
         """Fetch the auto play of the player"""
+        if (snapshot := self.snapshot) is not None:
+            return snapshot.auto_play
         player = (
             await PlayerRow.select(PlayerRow.auto_play)
             .where((PlayerRow.id == self.id) & (PlayerRow.bot == self.bot))
@@ -327,12 +470,15 @@ class PlayerConfig(CachedModel, metaclass=SingletonCachedByKey):
             target=(PlayerRow.id, PlayerRow.bot),
             values=[PlayerRow.auto_play],
         )
+        self._update_snapshot(auto_play=auto_play)
         await self.update_cache((self.fetch_auto_play, auto_play), (self.exists, True))
         await self.invalidate_cache(self.fetch_all)
 
     @maybe_cached
     async def fetch_self_deaf(self) -> bool:
         """Fetch the self deaf of the player"""
+        if (snapshot := self.snapshot) is not None:
+            return snapshot.self_deaf
         player = (
             await PlayerRow.select(PlayerRow.self_deaf)
             .where((PlayerRow.id == self.id) & (PlayerRow.bot == self.bot))
@@ -348,12 +494,15 @@ class PlayerConfig(CachedModel, metaclass=SingletonCachedByKey):
             target=(PlayerRow.id, PlayerRow.bot),
             values=[PlayerRow.self_deaf],
         )
+        self._update_snapshot(self_deaf=self_deaf)
         await self.update_cache((self.fetch_self_deaf, self_deaf), (self.exists, True))
         await self.invalidate_cache(self.fetch_all)
 
     @maybe_cached
     async def fetch_extras(self) -> JSON_DICT_TYPE:
         """Fetch the extras of the player"""
+        if (snapshot := self.snapshot) is not None:
+            return copy.deepcopy(snapshot.extras)
         player = (
             await PlayerRow.select(PlayerRow.extras)
             .where((PlayerRow.id == self.id) & (PlayerRow.bot == self.bot))
@@ -367,6 +516,7 @@ class PlayerConfig(CachedModel, metaclass=SingletonCachedByKey):
         await PlayerRow.insert(PlayerRow(id=self.id, bot=self.bot, extras=extras)).on_conflict(
             action="DO UPDATE", target=(PlayerRow.id, PlayerRow.bot), values=[PlayerRow.extras]
         )
+        self._update_snapshot(extras=copy.deepcopy(extras))
         await self.update_cache((self.fetch_extras, extras), (self.exists, True))
         await self.invalidate_cache(self.fetch_all)
 
@@ -375,6 +525,8 @@ class PlayerConfig(CachedModel, metaclass=SingletonCachedByKey):
         self,
     ) -> dict[str, int | None | dict[str, int | float | list[dict[str, float | None]] | None]]:
         """Fetch the effects of the player"""
+        if (snapshot := self.snapshot) is not None:
+            return copy.deepcopy(snapshot.effects)
         player = (
             await PlayerRow.select(PlayerRow.effects)
             .where((PlayerRow.id == self.id) & (PlayerRow.bot == self.bot))
@@ -392,12 +544,15 @@ class PlayerConfig(CachedModel, metaclass=SingletonCachedByKey):
             target=(PlayerRow.id, PlayerRow.bot),
             values=[PlayerRow.effects],
         )
+        self._update_snapshot(effects=copy.deepcopy(effects))
         await self.update_cache((self.fetch_effects, effects), (self.exists, True))
         await self.invalidate_cache(self.fetch_all)
 
     @maybe_cached
     async def fetch_empty_queue_dc(self) -> TimedFeature:
         """Fetch the empty queue dc of the player"""
+        if (snapshot := self.snapshot) is not None:
+            return snapshot.empty_queue_dc
         player = (
             await PlayerRow.select(PlayerRow.empty_queue_dc)
             .where((PlayerRow.id == self.id) & (PlayerRow.bot == self.bot))
@@ -415,6 +570,7 @@ class PlayerConfig(CachedModel, metaclass=SingletonCachedByKey):
             target=(PlayerRow.id, PlayerRow.bot),
             values=[PlayerRow.empty_queue_dc],
         )
+        self._update_snapshot(empty_queue_dc=TimedFeature.from_dict(empty_queue_dc))
         await self.update_cache(
             (self.fetch_empty_queue_dc, TimedFeature.from_dict(empty_queue_dc)), (self.exists, True)
         )
@@ -423,6 +579,8 @@ class PlayerConfig(CachedModel, metaclass=SingletonCachedByKey):
     @maybe_cached
     async def fetch_alone_dc(self) -> TimedFeature:
         """Fetch the alone dc of the player"""
+        if (snapshot := self.snapshot) is not None:
+            return snapshot.alone_dc
         player = (
             await PlayerRow.select(PlayerRow.alone_dc)
             .where((PlayerRow.id == self.id) & (PlayerRow.bot == self.bot))
@@ -438,12 +596,15 @@ class PlayerConfig(CachedModel, metaclass=SingletonCachedByKey):
             target=(PlayerRow.id, PlayerRow.bot),
             values=[PlayerRow.alone_dc],
         )
+        self._update_snapshot(alone_dc=TimedFeature.from_dict(alone_dc))
         await self.update_cache((self.fetch_alone_dc, TimedFeature.from_dict(alone_dc)), (self.exists, True))
         await self.invalidate_cache(self.fetch_all)
 
     @maybe_cached
     async def fetch_alone_pause(self) -> TimedFeature:
         """Fetch the alone pause of the player"""
+        if (snapshot := self.snapshot) is not None:
+            return snapshot.alone_pause
         player = (
             await PlayerRow.select(PlayerRow.alone_pause)
             .where((PlayerRow.id == self.id) & (PlayerRow.bot == self.bot))
@@ -459,12 +620,15 @@ class PlayerConfig(CachedModel, metaclass=SingletonCachedByKey):
             target=(PlayerRow.id, PlayerRow.bot),
             values=[PlayerRow.alone_pause],
         )
+        self._update_snapshot(alone_pause=TimedFeature.from_dict(alone_pause))
         await self.update_cache((self.fetch_alone_pause, TimedFeature.from_dict(alone_pause)), (self.exists, True))
         await self.invalidate_cache(self.fetch_all)
 
     @maybe_cached
     async def fetch_dj_users(self) -> set[int]:
         """Fetch the disc jockey users of the player"""
+        if (snapshot := self.snapshot) is not None:
+            return set(snapshot.dj_users)
         player = (
             await PlayerRow.select(PlayerRow.dj_users)
             .where((PlayerRow.id == self.id) & (PlayerRow.bot == self.bot))
@@ -481,6 +645,8 @@ class PlayerConfig(CachedModel, metaclass=SingletonCachedByKey):
             target=(PlayerRow.id, PlayerRow.bot),
             values=[PlayerRow.dj_users, QueryString("array_cat(player.dj_users, EXCLUDED.dj_users)")],
         )
+        if (snapshot := self.snapshot) is not None:
+            snapshot.dj_users.add(user.id)
         await self.update_cache((self.exists, True))
         await self.invalidate_cache(self.fetch_all, self.fetch_dj_users)
 
@@ -489,6 +655,8 @@ class PlayerConfig(CachedModel, metaclass=SingletonCachedByKey):
         await PlayerRow.update(dj_users=QueryString("array_remove(dj_users, {})", user.id)).where(
             PlayerRow.id == self.id & PlayerRow.bot == self.bot
         )
+        if (snapshot := self.snapshot) is not None:
+            snapshot.dj_users.discard(user.id)
         await self.update_cache((self.exists, True))
         await self.invalidate_cache(self.fetch_all, self.fetch_dj_users)
 
@@ -501,6 +669,8 @@ class PlayerConfig(CachedModel, metaclass=SingletonCachedByKey):
             target=(PlayerRow.id, PlayerRow.bot),
             values=[PlayerRow.dj_users, QueryString("array_cat(player.dj_users, EXCLUDED.dj_users)")],
         )
+        if (snapshot := self.snapshot) is not None:
+            snapshot.dj_users.update(u.id for u in users)
         await self.update_cache((self.exists, True))
         await self.invalidate_cache(self.fetch_all, self.fetch_dj_users)
 
@@ -524,12 +694,15 @@ class PlayerConfig(CachedModel, metaclass=SingletonCachedByKey):
             target=(PlayerRow.id, PlayerRow.bot),
             values=[PlayerRow.dj_users],
         )
+        self._update_snapshot(dj_users=set())
         await self.update_cache((self.fetch_dj_users, set()), (self.exists, True))
         await self.invalidate_cache(self.fetch_all)
 
     @maybe_cached
     async def fetch_dj_roles(self) -> set[int]:
         """Fetch the disc jockey roles of the player"""
+        if (snapshot := self.snapshot) is not None:
+            return set(snapshot.dj_roles)
         player = (
             await PlayerRow.select(PlayerRow.dj_roles)
             .where((PlayerRow.id == self.id) & (PlayerRow.bot == self.bot))
@@ -546,6 +719,8 @@ class PlayerConfig(CachedModel, metaclass=SingletonCachedByKey):
             target=(PlayerRow.id, PlayerRow.bot),
             values=[PlayerRow.dj_roles, QueryString("array_cat(player.dj_roles, EXCLUDED.dj_roles)")],
         )
+        if (snapshot := self.snapshot) is not None:
+            snapshot.dj_roles.add(role.id)
         await self.update_cache((self.exists, True))
         await self.invalidate_cache(self.fetch_all, self.fetch_dj_roles)
 
@@ -554,6 +729,8 @@ class PlayerConfig(CachedModel, metaclass=SingletonCachedByKey):
         await PlayerRow.update(dj_roles=QueryString("array_remove(dj_roles, {})", role.id)).where(
             PlayerRow.id == self.id & PlayerRow.bot == self.bot
         )
+        if (snapshot := self.snapshot) is not None:
+            snapshot.dj_roles.discard(role.id)
         await self.update_cache((self.exists, True))
         await self.invalidate_cache(self.fetch_all, self.fetch_dj_roles)
 
@@ -572,6 +749,8 @@ class PlayerConfig(CachedModel, metaclass=SingletonCachedByKey):
             target=(PlayerRow.id, PlayerRow.bot),
             values=[PlayerRow.dj_roles, QueryString("array_cat(player.dj_roles, EXCLUDED.dj_roles)")],
         )
+        if (snapshot := self.snapshot) is not None:
+            snapshot.dj_roles.update(r.id for r in roles)
         await self.update_cache((self.exists, True))
         await self.invalidate_cache(self.fetch_all, self.fetch_dj_roles)
 
@@ -595,15 +774,20 @@ class PlayerConfig(CachedModel, metaclass=SingletonCachedByKey):
             target=(PlayerRow.id, PlayerRow.bot),
             values=[PlayerRow.dj_roles],
         )
+        self._update_snapshot(dj_roles=set())
         await self.update_cache((self.fetch_dj_roles, set()), (self.exists, True))
         await self.invalidate_cache(self.fetch_all)
 
     async def _role_id_in_dj_roles(self, role_id: int) -> bool:
+        if (snapshot := self.snapshot) is not None:
+            return role_id in snapshot.dj_roles
         return await PlayerRow.exists().where(
             (PlayerRow.id == self.id) & (PlayerRow.bot == self.bot) & PlayerRow.dj_roles.any(role_id)
         )
 
     async def _userid_in_dj_users(self, user_id: int) -> bool:
+        if (snapshot := self.snapshot) is not None:
+            return user_id in snapshot.dj_users
         return await PlayerRow.exists().where(
             (PlayerRow.id == self.id) & (PlayerRow.bot == self.bot) & PlayerRow.dj_users.any(user_id)
         )
@@ -647,3 +831,6 @@ class PlayerConfig(CachedModel, metaclass=SingletonCachedByKey):
             return True
         dj_roles = await self.fetch_dj_roles()
         return any(r.id in dj_roles for r in user.roles) if dj_roles else True
+
+
+INVALIDATION_BUS.add_listener(_on_remote_invalidation)
@@ -5,8 +5,41 @@ from dataclasses import dataclass
 from pylav.compat import json
 from pylav.storage.database.cache.model import CachedModel
 from pylav.storage.database.tables.player_state import PlayerStateRow
+from pylav.storage.database.tables.tracks import BULK_BATCH_SIZE
 from pylav.type_hints.dict_typing import JSON_DICT_TYPE
 
+# Every column overwritten when a row already exists
+UPSERT_COLUMNS = [
+    PlayerStateRow.channel_id,
+    PlayerStateRow.volume,
+    PlayerStateRow.position,
+    PlayerStateRow.auto_play_playlist_id,
+    PlayerStateRow.forced_channel_id,
+    PlayerStateRow.text_channel_id,
+    PlayerStateRow.notify_channel_id,
+    PlayerStateRow.paused,
+    PlayerStateRow.repeat_current,
+    PlayerStateRow.repeat_queue,
+    PlayerStateRow.shuffle,
+    PlayerStateRow.auto_shuffle,
+    PlayerStateRow.auto_play,
+    PlayerStateRow.playing,
+    PlayerStateRow.effect_enabled,
+    PlayerStateRow.self_deaf,
+    PlayerStateRow.current,
+    PlayerStateRow.effects,
+    PlayerStateRow.extras,
+]
+# Only overwritten when the queue or history changed
+QUEUE_COLUMNS = [
+    PlayerStateRow.queue,
+    PlayerStateRow.history,
+    PlayerStateRow.queue_packed,
+    PlayerStateRow.history_packed,
+]
+# BULK_BATCH_SIZE is sized for 9 bind parameters per row, a player state row has 26
+SAVE_BATCH_SIZE = max(1, BULK_BATCH_SIZE * 9 // 26)
+
 
 @dataclass(eq=True)
 class PlayerState(CachedModel):
@@ -38,6 +71,8 @@ class PlayerState(CachedModel):
     effects: JSON_DICT_TYPE
     extras: JSON_DICT_TYPE
     pk: None = None
+    queue_packed: bytes | None = None
+    history_packed: bytes | None = None
 
     def get_cache_key(self) -> str:
         """Get the cache key for the player state."""
@@ -61,60 +96,57 @@ class PlayerState(CachedModel):
 
     async def save(self) -> None:
         """Save the player state to the database"""
-        await PlayerStateRow.insert(
-            PlayerStateRow(
-                id=self.id,
-                bot=self.bot,
-                channel_id=self.channel_id,
-                volume=self.volume,
-                position=self.position,
-                auto_play_playlist_id=self.auto_play_playlist_id,
-                forced_channel_id=self.forced_channel_id,
-                text_channel_id=self.text_channel_id,
-                notify_channel_id=self.notify_channel_id,
-                paused=self.paused,
-                repeat_current=self.repeat_current,
-                repeat_queue=self.repeat_queue,
-                shuffle=self.shuffle,
-                auto_shuffle=self.auto_shuffle,
-                auto_play=self.auto_play,
-                playing=self.playing,
-                effect_enabled=self.effect_enabled,
-                self_deaf=self.self_deaf,
-                current=self.current,
-                queue=self.queue,
-                history=self.history,
-                effects=self.effects,
-                extras=self.extras,
-            )
-        ).on_conflict(
-            action="DO UPDATE",
-            target=(PlayerStateRow.id, PlayerStateRow.bot),
-            values=[
-                PlayerStateRow.channel_id,
-                PlayerStateRow.volume,
-                PlayerStateRow.position,
-                PlayerStateRow.auto_play_playlist_id,
-                PlayerStateRow.forced_channel_id,
-                PlayerStateRow.text_channel_id,
-                PlayerStateRow.notify_channel_id,
-                PlayerStateRow.paused,
-                PlayerStateRow.repeat_current,
-                PlayerStateRow.repeat_queue,
-                PlayerStateRow.shuffle,
-                PlayerStateRow.auto_shuffle,
-                PlayerStateRow.auto_play,
-                PlayerStateRow.playing,
-                PlayerStateRow.effect_enabled,
-                PlayerStateRow.self_deaf,
-                PlayerStateRow.current,
-                PlayerStateRow.queue,
-                PlayerStateRow.history,
-                PlayerStateRow.effects,
-                PlayerStateRow.extras,
-            ],
+        await self.save_many([self])
+
+    def to_row(self) -> PlayerStateRow:
+        """Build the database row for the player state"""
+        return PlayerStateRow(
+            id=self.id,
+            bot=self.bot,
+            channel_id=self.channel_id,
+            volume=self.volume,
+            position=self.position,
+            auto_play_playlist_id=self.auto_play_playlist_id,
+            forced_channel_id=self.forced_channel_id,
+            text_channel_id=self.text_channel_id,
+            notify_channel_id=self.notify_channel_id,
+            paused=self.paused,
+            repeat_current=self.repeat_current,
+            repeat_queue=self.repeat_queue,
+            shuffle=self.shuffle,
+            auto_shuffle=self.auto_shuffle,
+            auto_play=self.auto_play,
+            playing=self.playing,
+            effect_enabled=self.effect_enabled,
+            self_deaf=self.self_deaf,
+            current=self.current,
+            queue=self.queue,
+            history=self.history,
+            effects=self.effects,
+            extras=self.extras,
+            queue_packed=self.queue_packed,
+            history_packed=self.history_packed,
         )
 
+    @classmethod
+    async def save_many(cls, states: list[PlayerState], queues: bool = True) -> None:
+        """Save many player states to the database with one upsert per batch.
+
+        Parameters
+        ----------
+        states : list[PlayerState]
+            The player states to save.
+        queues : bool
+            Whether to overwrite the queue and history of existing rows, if False only new rows get them.
+        """
+        values = UPSERT_COLUMNS + QUEUE_COLUMNS if queues else UPSERT_COLUMNS
+        for start in range(0, len(states), SAVE_BATCH_SIZE):
+            await PlayerStateRow.insert(*(s.to_row() for s in states[start : start + SAVE_BATCH_SIZE])).on_conflict(
+                action="DO UPDATE",
+                target=(PlayerStateRow.id, PlayerStateRow.bot),
+                values=values,
+            )
+
     @classmethod
     async def get(cls, bot_id: int, guild_id: int) -> PlayerState | None:
         """Get the player state from the database.
@@ -156,6 +188,8 @@ class PlayerState(CachedModel):
                 PlayerStateRow.history,
                 PlayerStateRow.effects,
                 PlayerStateRow.extras,
+                PlayerStateRow.queue_packed,
+                PlayerStateRow.history_packed,
             )
             .where((PlayerStateRow.id == guild_id) & (PlayerStateRow.bot == bot_id))
             .first()
@@ -6,27 +6,29 @@ import io
 import pathlib
 import random
 import sys
-from collections import defaultdict
-from collections.abc import Iterator
+from collections.abc import AsyncIterator, Iterator
 from dataclasses import dataclass
 
 import aiohttp
 import brotli  # type: ignore
 import discord
 import yaml
-from dacite import from_dict
 
 from pylav.compat import json
-from pylav.constants.config import BROTLI_ENABLED, READ_CACHING_ENABLED
+from pylav.constants.config import BROTLI_ENABLED
 from pylav.constants.playlists import BUNDLED_PLAYLIST_IDS
 from pylav.constants.regex import SQUARE_BRACKETS
 from pylav.core.context import PyLavContext
 from pylav.exceptions.playlist import InvalidPlaylistException
 from pylav.helpers.singleton import SingletonCachedByKey
+from pylav.helpers.trigram import TrigramIndex
 from pylav.logging import getLogger
 from pylav.nodes.api.responses.track import Track
+from pylav.players.tracks.decoder import resolve_tracks
+from pylav.storage.database.cache.backend import COLLECTION_TTL, LOW_PRIORITY
 from pylav.storage.database.cache.decodators import maybe_cached
 from pylav.storage.database.cache.model import CachedModel
+from pylav.storage.database.tables.m2m import TrackToPlaylists
 from pylav.storage.database.tables.playlists import PlaylistRow
 from pylav.storage.database.tables.tracks import TrackRow
 from pylav.type_hints.bot import DISCORD_BOT_TYPE
@@ -46,6 +48,42 @@ except ImportError:
         return string
 
 
+# In-process name index used to rank playlist searches when the database can't do it (SQLite)
+SEARCH_INDEX = TrigramIndex()
+
+
+def _can_manage_playlist(
+    playlist_id: int, scope: int | None, author: int | None, bot: DISCORD_BOT_TYPE, requester: discord.abc.User
+) -> bool:
+    """Check if the requester can manage the playlist with the given id, scope and author.
+
+    Parameters
+    ----------
+    playlist_id : int
+        The id of the playlist.
+    scope : int | None
+        The scope of the playlist.
+    author : int | None
+        The author of the playlist.
+    bot : DISCORD_BOT_TYPE
+        The bot instance.
+    requester : discord.abc.User
+        The requester.
+
+    Returns
+    -------
+    bool
+        Whether the requester can manage the playlist.
+    """
+    if playlist_id in BUNDLED_PLAYLIST_IDS:
+        return False
+    if requester.id in (getattr(bot, "owner_ids", None) or ()) or requester.id == bot.owner_id:
+        return True
+    if scope == bot.user.id:
+        return False
+    return author == requester.id
+
+
 @dataclass(eq=True, slots=True, unsafe_hash=True, order=True, kw_only=True, frozen=True)
 class Playlist(CachedModel, metaclass=SingletonCachedByKey):
     id: int
@@ -65,7 +103,7 @@ class Playlist(CachedModel, metaclass=SingletonCachedByKey):
 
         return await PlaylistRow.exists().where(PlaylistRow.id == self.id)
 
-    @maybe_cached
+    @maybe_cached(ttl=COLLECTION_TTL, priority=LOW_PRIORITY)
     async def fetch_all(self) -> JSON_DICT_TYPE:
         """Fetch all playlists from the database.
 
@@ -78,7 +116,6 @@ class Playlist(CachedModel, metaclass=SingletonCachedByKey):
             await PlaylistRow.select(
                 PlaylistRow.id,
                 PlaylistRow.name,
-                PlaylistRow.tracks(TrackRow.encoded, TrackRow.info, TrackRow.pluginInfo, load_json=True),
                 PlaylistRow.scope,
                 PlaylistRow.author,
                 PlaylistRow.url,
@@ -87,13 +124,22 @@ class Playlist(CachedModel, metaclass=SingletonCachedByKey):
             .first()
             .output(load_json=True, nested=True)
         )
-        return data or {
-            "id": self.id,
-            "name": PlaylistRow.name.default,
-            "tracks": [],
-            "scope": PlaylistRow.scope.default,
-            "author": PlaylistRow.author.default,
-            "url": PlaylistRow.url.default,
+        if not data:
+            return {
+                "id": self.id,
+                "name": PlaylistRow.name.default,
+                "tracks": [],
+                "scope": PlaylistRow.scope.default,
+                "author": PlaylistRow.author.default,
+                "url": PlaylistRow.url.default,
+            }
+        return {
+            "id": data["id"],
+            "name": data["name"],
+            "tracks": await TrackToPlaylists.fetch_range(self.id),
+            "scope": data["scope"],
+            "author": data["author"],
+            "url": data["url"],
         }
 
     @maybe_cached
@@ -157,6 +203,7 @@ class Playlist(CachedModel, metaclass=SingletonCachedByKey):
         )
         await self.update_cache((self.fetch_author, author), (self.exists, True))
         await self.invalidate_cache(self.fetch_all)
+        SEARCH_INDEX.invalidate()
 
     @maybe_cached
     async def fetch_name(self) -> str | None:
@@ -188,6 +235,7 @@ class Playlist(CachedModel, metaclass=SingletonCachedByKey):
         )
         await self.update_cache((self.fetch_name, name), (self.exists, True))
         await self.invalidate_cache(self.fetch_all)
+        SEARCH_INDEX.invalidate()
 
     @maybe_cached
     async def fetch_url(self) -> str | None:
@@ -220,7 +268,7 @@ class Playlist(CachedModel, metaclass=SingletonCachedByKey):
         await self.update_cache((self.fetch_url, url), (self.exists, True))
         await self.invalidate_cache(self.fetch_all)
 
-    @maybe_cached
+    @maybe_cached(ttl=COLLECTION_TTL, priority=LOW_PRIORITY)
     async def fetch_tracks(self) -> list[str | JSON_DICT_TYPE]:
         """Fetch the tracks of the playlist.
 
@@ -229,16 +277,7 @@ class Playlist(CachedModel, metaclass=SingletonCachedByKey):
         list[str]
             The tracks of the playlist.
         """
-        response = (
-            await PlaylistRow.select(
-                PlaylistRow.tracks(TrackRow.encoded, TrackRow.info, TrackRow.pluginInfo, load_json=True)
-            )
-            .where(PlaylistRow.id == self.id)
-            .first()
-            .output(load_json=True, nested=True)
-        )
-        data = response["tracks"] if response else []
-        return data
+        return await TrackToPlaylists.fetch_range(self.id)
 
     async def update_tracks(self, tracks: list[str | JSON_DICT_TYPE | Track]) -> None:
         """Update the tracks of the playlist.
@@ -248,36 +287,14 @@ class Playlist(CachedModel, metaclass=SingletonCachedByKey):
         tracks : list[str]
             The new tracks of the playlist.
         """
-        playlist_row = await PlaylistRow.objects().get_or_create(PlaylistRow.id == self.id)
-        try:
-            old_tracks = await playlist_row.get_m2m(PlaylistRow.tracks)
-        except ValueError:
-            old_tracks = []
-        new_tracks = []
-        # TODO: Optimize this, after https://github.com/piccolo-orm/piccolo/discussions/683 is answered or fixed
-        _temp = defaultdict(list)
-        for x in tracks:
-            _temp[type(x)].append(x)
-        for entry_type, entry_list in _temp.items():
-            if entry_type == str:
-                for track_object in await self.client.decode_tracks(entry_list, raise_on_failure=False):
-                    new_tracks.append(await TrackRow.get_or_create(track_object))
-            elif entry_type == dict:
-                for track_object in entry_list:
-                    new_tracks.append(await TrackRow.get_or_create(from_dict(data_class=Track, data=track_object)))
-            else:
-                for track_object in entry_list:
-                    new_tracks.append(await TrackRow.get_or_create(track_object))
-
-        if old_tracks:
-            await playlist_row.remove_m2m(*old_tracks, m2m=PlaylistRow.tracks)
-        if new_tracks:
-            await playlist_row.add_m2m(*new_tracks, m2m=PlaylistRow.tracks)
+        await PlaylistRow.insert(PlaylistRow(id=self.id)).on_conflict(action="DO NOTHING")
+        new_tracks = await TrackRow.bulk_upsert(await resolve_tracks(self.client, tracks))
+        await TrackToPlaylists.replace(self.id, new_tracks)
 
         await self.invalidate_cache(self.fetch_tracks, self.fetch_first)
         await self.update_cache(
             (self.exists, True),
-            (self.size, len(tracks)),
+            (self.size, len(new_tracks)),
         )
         await self.invalidate_cache(self.fetch_all)
 
@@ -290,8 +307,7 @@ class Playlist(CachedModel, metaclass=SingletonCachedByKey):
         int
             The number of tracks in the playlist.
         """
-        tracks = await self.fetch_tracks()
-        return len(tracks) if tracks else 0
+        return await TrackToPlaylists.size(self.id)
 
     async def add_track(self, tracks: list[str | Track | JSON_DICT_TYPE]) -> None:
         """Add a track to the playlist.
@@ -301,24 +317,10 @@ class Playlist(CachedModel, metaclass=SingletonCachedByKey):
         tracks : list[str | Track]
             The tracks to add.
         """
-        playlist_row = await PlaylistRow.objects().get_or_create(PlaylistRow.id == self.id)
-        new_tracks = []
-        # TODO: Optimize this, after https://github.com/piccolo-orm/piccolo/discussions/683 is answered or fixed
-        _temp = defaultdict(list)
-        for x in tracks:
-            _temp[type(x)].append(x)
-        for entry_type, entry_list in _temp.items():
-            if entry_type == str:
-                for track_object in await self.client.decode_tracks(entry_list, raise_on_failure=False):
-                    new_tracks.append(await TrackRow.get_or_create(track_object))
-            elif entry_type == dict:
-                for track_object in entry_list:
-                    new_tracks.append(await TrackRow.get_or_create(from_dict(data_class=Track, data=track_object)))
-            else:
-                for track_object in entry_list:
-                    new_tracks.append(await TrackRow.get_or_create(track_object))
+        await PlaylistRow.insert(PlaylistRow(id=self.id)).on_conflict(action="DO NOTHING")
+        new_tracks = await TrackRow.bulk_upsert(await resolve_tracks(self.client, tracks))
         if new_tracks:
-            await playlist_row.add_m2m(*new_tracks, m2m=PlaylistRow.tracks)
+            await TrackToPlaylists.link(self.id, new_tracks)
         await self.invalidate_cache(self.fetch_tracks, self.fetch_all, self.size, self.fetch_first, self.exists)
 
     async def bulk_remove_tracks(self, tracks: list[str]) -> None:
@@ -331,10 +333,7 @@ class Playlist(CachedModel, metaclass=SingletonCachedByKey):
         """
         if not tracks:
             return
-        playlist = await PlaylistRow.objects().where(PlaylistRow.id == self.id).first()
-        tracks = await TrackRow.objects().where(TrackRow.encoded.is_in(tracks))
-        if tracks:
-            await playlist.remove_m2m(*tracks, m2m=PlaylistRow.tracks)
+        await TrackToPlaylists.unlink(self.id, tracks)
         await self.invalidate_cache(self.fetch_tracks, self.fetch_all, self.size, self.fetch_first, self.exists)
 
     async def remove_track(self, track: str) -> None:
@@ -349,13 +348,7 @@ class Playlist(CachedModel, metaclass=SingletonCachedByKey):
 
     async def remove_all_tracks(self) -> None:
         """Remove all tracks from the playlist."""
-        playlist = await PlaylistRow.objects().where(PlaylistRow.id == self.id).first()
-        try:
-            tracks = await playlist.get_m2m(PlaylistRow.tracks)
-        except ValueError:
-            tracks = []
-        if tracks:
-            await playlist.remove_m2m(*tracks, m2m=PlaylistRow.tracks)
+        await TrackToPlaylists.unlink(self.id)
         await self.update_cache((self.fetch_tracks, []), (self.size, 0), (self.exists, True), (self.fetch_first, None))
         await self.invalidate_cache(self.fetch_all)
 
@@ -363,6 +356,7 @@ class Playlist(CachedModel, metaclass=SingletonCachedByKey):
         """Delete the playlist from the database"""
         await PlaylistRow.delete().where(PlaylistRow.id == self.id)
         await self.invalidate_cache()
+        SEARCH_INDEX.invalidate()
 
     async def can_manage(self, bot: DISCORD_BOT_TYPE, requester: discord.abc.User) -> bool:  # noqa
         """Check if the requester can manage the playlist.
@@ -379,13 +373,9 @@ class Playlist(CachedModel, metaclass=SingletonCachedByKey):
         bool
             Whether the requester can manage the playlist.
         """
-        if self.id in BUNDLED_PLAYLIST_IDS:
-            return False
-        if requester.id in ((ids := getattr(bot, "owner_ids")) or ()) or requester.id == bot.owner_id:  # noqa
-            return True
-        if await self.fetch_scope() == bot.user.id:
-            return False
-        return await self.fetch_author() == requester.id
+        return _can_manage_playlist(
+            self.id, await self.fetch_scope(), await self.fetch_author(), bot=bot, requester=requester
+        )
 
     async def get_scope_name(self, bot: DISCORD_BOT_TYPE, mention: bool = True, guild: discord.Guild = None) -> str:
         """Get the name of the scope of the playlist.
@@ -527,30 +517,10 @@ class Playlist(CachedModel, metaclass=SingletonCachedByKey):
         # noinspection PyProtectedMember
         if not playlist_row._was_created:
             await PlaylistRow.update(defaults).where(PlaylistRow.id == self.id)
-        try:
-            old_tracks = await playlist_row.get_m2m(PlaylistRow.tracks)
-        except ValueError:
-            old_tracks = []
-        new_tracks = []
-        # TODO: Optimize this, after https://github.com/piccolo-orm/piccolo/discussions/683 is answered or fixed
-        _temp = defaultdict(list)
-        for x in tracks:
-            _temp[type(x)].append(x)
-        for entry_type, entry_list in _temp.items():
-            if entry_type == str:
-                for track_object in await self.client.decode_tracks(entry_list, raise_on_failure=False):
-                    new_tracks.append(await TrackRow.get_or_create(track_object))
-            elif entry_type == dict:
-                for track_object in entry_list:
-                    new_tracks.append(await TrackRow.get_or_create(from_dict(data_class=Track, data=track_object)))
-            else:
-                for track_object in entry_list:
-                    new_tracks.append(await TrackRow.get_or_create(track_object))
-        if old_tracks:
-            await playlist_row.remove_m2m(*old_tracks, m2m=PlaylistRow.tracks)
-        if new_tracks:
-            await playlist_row.add_m2m(*new_tracks, m2m=PlaylistRow.tracks)
+        new_tracks = await TrackRow.bulk_upsert(await resolve_tracks(self.client, tracks))
+        await TrackToPlaylists.replace(self.id, new_tracks)
         await self.invalidate_cache()
+        SEARCH_INDEX.invalidate()
 
     @classmethod
     async def from_yaml(cls, context: PyLavContext, scope: int, url: str) -> Playlist:
@@ -602,13 +572,42 @@ class Playlist(CachedModel, metaclass=SingletonCachedByKey):
         str
             The track at the index
         """
-        if READ_CACHING_ENABLED:
-            tracks = await self.fetch_tracks()
-            return tracks[index] if index < len(tracks) else None
-        else:
-            tracks = await self.fetch_tracks()
-            if tracks and len(tracks) > index:
-                return tracks[index]
+        if index < 0:
+            return None
+        return await TrackToPlaylists.fetch_index(self.id, index)
+
+    async def fetch_range(self, start: int, stop: int | None = None) -> list[JSON_DICT_TYPE]:
+        """Get the tracks between two indexes.
+
+        Parameters
+        ----------
+        start: int
+            The index of the first track
+        stop: int | None
+            The index to stop at (exclusive), if not provided all remaining tracks are returned
+
+        Returns
+        -------
+        list[JSON_DICT_TYPE]
+            The tracks between the indexes
+        """
+        return await TrackToPlaylists.fetch_range(self.id, max(start, 0), stop)
+
+    async def iter_tracks(self, batch_size: int = 100) -> AsyncIterator[JSON_DICT_TYPE]:
+        """Iterate over the tracks in order without loading all of them at once.
+
+        Parameters
+        ----------
+        batch_size: int
+            The number of tracks to fetch from the database at a time
+
+        Yields
+        ------
+        JSON_DICT_TYPE
+            The tracks
+        """
+        async for track in TrackToPlaylists.iter_tracks(self.id, batch_size=batch_size):
+            yield track
 
     @maybe_cached
     async def fetch_first(self) -> JSON_DICT_TYPE | None:
@@ -630,4 +629,53 @@ class Playlist(CachedModel, metaclass=SingletonCachedByKey):
             A random track
         """
 
-        return await self.fetch_index(random.randint(0, await self.size()))
+        return await self.fetch_index(random.randrange(size)) if (size := await self.size()) else None
+
+
+@dataclass(eq=True, slots=True, unsafe_hash=True, order=True, kw_only=True, frozen=True)
+class PlaylistMatch:
+    """A playlist returned by a name search, with how closely its name matched the search (0 to 1)"""
+
+    id: int
+    name: str
+    author: int | None
+    score: float
+
+    @property
+    def playlist(self) -> Playlist:
+        """The playlist that matched"""
+        return Playlist(id=self.id)
+
+
+@dataclass(eq=True, slots=True, unsafe_hash=True, order=True, kw_only=True, frozen=True)
+class PlaylistListing:
+    """A row of a playlist listing, with the number of tracks counted by the database"""
+
+    id: int
+    name: str | None
+    scope: int | None
+    author: int | None
+    url: str | None
+    size: int
+
+    @property
+    def playlist(self) -> Playlist:
+        """The playlist this listing describes"""
+        return Playlist(id=self.id)
+
+    def can_manage(self, bot: DISCORD_BOT_TYPE, requester: discord.abc.User) -> bool:  # noqa
+        """Check if the requester can manage the playlist, without querying the database.
+
+        Parameters
+        ----------
+        bot : DISCORD_BOT_TYPE
+            The bot instance.
+        requester : discord.abc.User
+            The requester.
+
+        Returns
+        -------
+        bool
+            Whether the requester can manage the playlist.
+        """
+        return _can_manage_playlist(self.id, self.scope, self.author, bot=bot, requester=requester)
@@ -1,17 +1,17 @@
 from __future__ import annotations
 
 import random
-from collections import defaultdict
+from collections.abc import AsyncIterator
 from dataclasses import dataclass
 from datetime import datetime
 
-from dacite import from_dict
-
-from pylav.constants.config import READ_CACHING_ENABLED
 from pylav.helpers.singleton import SingletonCachedByKey
 from pylav.nodes.api.responses.track import Track
+from pylav.players.tracks.decoder import resolve_tracks
+from pylav.storage.database.cache.backend import COLLECTION_TTL, LOW_PRIORITY
 from pylav.storage.database.cache.decodators import maybe_cached
 from pylav.storage.database.cache.model import CachedModel
+from pylav.storage.database.tables.m2m import TrackToQueries
 from pylav.storage.database.tables.queries import QueryRow
 from pylav.storage.database.tables.tracks import TrackRow
 from pylav.type_hints.dict_typing import JSON_DICT_TYPE
@@ -49,10 +49,9 @@ class Query(CachedModel, metaclass=SingletonCachedByKey):
         int
             The number of tracks in the playlist.
         """
-        tracks = await self.fetch_tracks()
-        return len(tracks) if tracks else 0
+        return await TrackToQueries.size(self.id)
 
-    @maybe_cached
+    @maybe_cached(ttl=COLLECTION_TTL, priority=LOW_PRIORITY)
     async def fetch_tracks(self) -> list[str | JSON_DICT_TYPE]:
         """Get the tracks of the playlist.
 
@@ -61,14 +60,7 @@ class Query(CachedModel, metaclass=SingletonCachedByKey):
         list[str]
             The tracks of the playlist.
         """
-        response = (
-            await QueryRow.select(QueryRow.tracks(TrackRow.encoded, TrackRow.info, TrackRow.pluginInfo, load_json=True))
-            .where(QueryRow.identifier == self.id)
-            .first()
-            .output(load_json=True, nested=True)
-        )
-        data = response["tracks"] if response else []
-        return data
+        return await TrackToQueries.fetch_range(self.id)
 
     async def update_tracks(self, tracks: list[str | Track]):
         """Update the tracks of the playlist.
@@ -78,34 +70,12 @@ class Query(CachedModel, metaclass=SingletonCachedByKey):
         tracks: list[str | Track]
             The tracks of the playlist.
         """
-        query_row = await QueryRow.objects().get_or_create(QueryRow.identifier == self.id)
-        try:
-            old_tracks = await query_row.get_m2m(QueryRow.tracks)
-        except ValueError:
-            old_tracks = []
-        new_tracks = []
-        # TODO: Optimize this, after https://github.com/piccolo-orm/piccolo/discussions/683 is answered or fixed
-        _temp = defaultdict(list)
-        for x in tracks:
-            _temp[type(x)].append(x)
-        for entry_type, entry_list in _temp.items():
-            if entry_type == str:
-                for track_object in await self.client.decode_tracks(entry_list, raise_on_failure=False):
-                    new_tracks.append(await TrackRow.get_or_create(track_object))
-            elif entry_type == dict:
-                for track_object in entry_list:
-                    new_tracks.append(await TrackRow.get_or_create(from_dict(data_class=Track, data=track_object)))
-            else:
-                for track_object in entry_list:
-                    new_tracks.append(await TrackRow.get_or_create(track_object))
-
-        if old_tracks:
-            await query_row.remove_m2m(*old_tracks, m2m=QueryRow.tracks)
-        if new_tracks:
-            await query_row.add_m2m(*new_tracks, m2m=QueryRow.tracks)
+        await QueryRow.insert(QueryRow(identifier=self.id)).on_conflict(action="DO NOTHING")
+        new_tracks = await TrackRow.bulk_upsert(await resolve_tracks(self.client, tracks))
+        await TrackToQueries.replace(self.id, new_tracks)
         await self.invalidate_cache(self.fetch_tracks, self.fetch_first)
         await self.update_cache(
-            (self.size, len(tracks)),
+            (self.size, len(new_tracks)),
             (self.exists, True),
         )
 
@@ -253,32 +223,11 @@ class Query(CachedModel, metaclass=SingletonCachedByKey):
         # noinspection PyProtectedMember
         if not query_row._was_created:
             await QueryRow.update(defaults).where(QueryRow.identifier == self.id)
-        try:
-            old_tracks = await query_row.get_m2m(QueryRow.tracks)
-        except ValueError:
-            old_tracks = []
-        new_tracks = []
-        # TODO: Optimize this, after https://github.com/piccolo-orm/piccolo/discussions/683 is answered or fixed
-        _temp = defaultdict(list)
-        for x in tracks:
-            _temp[type(x)].append(x)
-        for entry_type, entry_list in _temp.items():
-            if entry_type == str:
-                for track_object in await self.client.decode_tracks(entry_list, raise_on_failure=False):
-                    new_tracks.append(await TrackRow.get_or_create(track_object))
-            elif entry_type == dict:
-                for track_object in entry_list:
-                    new_tracks.append(await TrackRow.get_or_create(from_dict(data_class=Track, data=track_object)))
-            else:
-                for track_object in entry_list:
-                    new_tracks.append(await TrackRow.get_or_create(track_object))
-        if old_tracks:
-            await query_row.remove_m2m(*old_tracks, m2m=QueryRow.tracks)
-        if new_tracks:
-            await query_row.add_m2m(*new_tracks, m2m=QueryRow.tracks)
+        new_tracks = await TrackRow.bulk_upsert(await resolve_tracks(self.client, tracks))
+        await TrackToQueries.replace(self.id, new_tracks)
         await self.invalidate_cache(self.fetch_tracks, self.fetch_first)
         await self.update_cache(
-            (self.size, len(tracks)),
+            (self.size, len(new_tracks)),
             (self.fetch_name, name),
             (self.fetch_last_updated, QueryRow.last_updated.default.python()),
             (self.exists, True),
@@ -297,13 +246,42 @@ class Query(CachedModel, metaclass=SingletonCachedByKey):
         str
             The track at the index
         """
-        if READ_CACHING_ENABLED:
-            tracks = await self.fetch_tracks()
-            return tracks[index] if index < len(tracks) else None
-        else:
-            tracks = await self.fetch_tracks()
-            if tracks and len(tracks) > index:
-                return tracks[index]
+        if index < 0:
+            return None
+        return await TrackToQueries.fetch_index(self.id, index)
+
+    async def fetch_range(self, start: int, stop: int | None = None) -> list[JSON_DICT_TYPE]:
+        """Get the tracks between two indexes.
+
+        Parameters
+        ----------
+        start: int
+            The index of the first track
+        stop: int | None
+            The index to stop at (exclusive), if not provided all remaining tracks are returned
+
+        Returns
+        -------
+        list[JSON_DICT_TYPE]
+            The tracks between the indexes
+        """
+        return await TrackToQueries.fetch_range(self.id, max(start, 0), stop)
+
+    async def iter_tracks(self, batch_size: int = 100) -> AsyncIterator[JSON_DICT_TYPE]:
+        """Iterate over the tracks in order without loading all of them at once.
+
+        Parameters
+        ----------
+        batch_size: int
+            The number of tracks to fetch from the database at a time
+
+        Yields
+        ------
+        JSON_DICT_TYPE
+            The tracks
+        """
+        async for track in TrackToQueries.iter_tracks(self.id, batch_size=batch_size):
+            yield track
 
     @maybe_cached
     async def fetch_first(self) -> JSON_DICT_TYPE | None:
@@ -324,7 +302,7 @@ class Query(CachedModel, metaclass=SingletonCachedByKey):
         str
             A random track
         """
-        return await self.fetch_index(random.randint(0, await self.size()))
+        return await self.fetch_index(random.randrange(size)) if (size := await self.size()) else None
 
     async def fetch_bulk(
         self, info: bool = False, name: bool = False, pluginInfo: bool = False, tracks: bool = False
@@ -343,12 +321,14 @@ class Query(CachedModel, metaclass=SingletonCachedByKey):
             columns.append(QueryRow.info)
         if pluginInfo:
             columns.append(QueryRow.pluginInfo)
-        if tracks:
-            columns.append(QueryRow.tracks(TrackRow.encoded, TrackRow.info, TrackRow.pluginInfo, load_json=True))
         response = (
             await QueryRow.select(*columns)
             .where(QueryRow.identifier == self.id)
             .first()
             .output(load_json=True, nested=True)
         )
-        return response if response else None
+        if not response:
+            return None
+        if tracks:
+            response["tracks"] = await TrackToQueries.fetch_range(self.id)
+        return response
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import hashlib
+import os
 import pathlib
 from typing import TYPE_CHECKING
 
@@ -12,9 +14,12 @@ from watchfiles import Change, awatch
 
 from pylav.constants.config import POSTGRES_CONNECTIONS
 from pylav.logging import getLogger
+from pylav.nodes.api.responses import rest_api
 from pylav.nodes.api.responses.track import Track
 from pylav.players.query.local_files import ALL_EXTENSIONS
 from pylav.players.query.obj import Query
+from pylav.players.tracks.decoder import decode_tracks_local
+from pylav.storage.controllers.local_tracks import LocalTrackController, LocalTrackEntry
 
 if TYPE_CHECKING:
     from pylav.core.client import Client
@@ -22,6 +27,35 @@ if TYPE_CHECKING:
 LOGGER = getLogger("PyLav.LocalTrackCache")
 
 
+def _scan(root: pathlib.Path) -> tuple[dict[str, tuple[int, int]], list[str]]:
+    """Walk the folder and return the size and modification time of every audio file, and every sub folder"""
+    files: dict[str, tuple[int, int]] = {}
+    folders: list[str] = []
+    pending = [f"{root}"]
+    while pending:
+        with contextlib.suppress(OSError), os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                # A single unreadable entry (dangling symlink, no permission, ...) must not hide the rest of the folder
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        folders.append(entry.path)
+                        pending.append(entry.path)
+                    elif os.path.splitext(entry.name)[1].lower() in ALL_EXTENSIONS:
+                        stat = entry.stat()
+                        files[entry.path] = (stat.st_size, stat.st_mtime_ns)
+                except OSError:
+                    continue
+    return files, folders
+
+
+def _stat(path: pathlib.Path) -> tuple[int, int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
 class LocalTrackCache:
     """A cache for local tracks."""
 
@@ -37,6 +71,7 @@ class LocalTrackCache:
         "__track_lock",
         "__path_to_query_cache",
         "__counter",
+        "__index",
     )
 
     def __init__(self, client: Client, root: str | pathlib.Path | aiopath.Path) -> None:
@@ -51,6 +86,7 @@ class LocalTrackCache:
         self.__ready = asyncio.Event()
         self.__monitor = asyncio.create_task(self.file_watcher())
         self.__counter = ExpiringDict(max_len=float("inf"), max_age_seconds=5)
+        self.__index = LocalTrackController(client)
 
     def __bool__(self) -> bool:
         return not self.__shutdown
@@ -138,22 +174,41 @@ class LocalTrackCache:
             await self._process_changes(changes)
 
     async def _process_changes(self, changes: set[tuple[Change, str]]) -> None:
+        probed: list[LocalTrackEntry] = []
+        deleted: list[str] = []
         for change, path in changes:
             path_obj = pathlib.Path(path)
             if (not path_obj.is_dir()) and path_obj.suffix.lower() not in ALL_EXTENSIONS:
                 continue
             match change:
                 case Change.added:
-                    await self._process_added(path, path_obj)
+                    encoded = await self._process_added(path, path_obj)
                     LOGGER.trace(f"Added {path}")
                 case Change.modified:
-                    await self._process_modified(path, path_obj, modified=True)
+                    encoded = await self._process_modified(path, path_obj, modified=True)
                     LOGGER.trace(f"Modified {path}")
                 case Change.deleted:
                     await self._process_deleted(path, path_obj)
+                    deleted.append(path)
                     LOGGER.trace(f"Deleted {path}")
+                    continue
+                case __:
+                    continue
+            if path_obj.is_dir():
+                continue
+            if encoded and (stat := _stat(path_obj)) is not None:
+                probed.append(LocalTrackEntry(path, *stat, encoded))
+            else:
+                # Files that failed to load are left out of the index so that they are probed again on startup
+                deleted.append(path)
+        if self.__shutdown:
+            return
+        if probed:
+            await self.__index.save_many(probed)
+        if deleted:
+            await self.__index.delete_many(deleted)
 
-    async def _process_added(self, path: str, path_obj: pathlib.Path, modified: bool = False) -> None:
+    async def _process_added(self, path: str, path_obj: pathlib.Path, modified: bool = False) -> str | None:
         if self.__shutdown:
             return
         query = await Query.from_string(path_obj)
@@ -167,19 +222,9 @@ class LocalTrackCache:
         else:
             should_sleep = False
         track = await self.__pylav.search_query(query, bypass_cache=modified, sleep=should_sleep)
-        if track.loadType in {"track", "playlist", "search"}:
-            await self._add_to_query_cache(query, path)
-            match track.loadType:
-                case "track":
-                    await self._add_to_track_cache(track.data, path_obj)
-                case "playlist":
-                    for track in track.data.tracks:
-                        await self._add_to_track_cache(track, path_obj)
-                case "search":
-                    for track in track.data:
-                        await self._add_to_track_cache(track, path_obj)
-
-    async def _process_modified(self, path: str, path_obj: pathlib.Path, modified: bool = True) -> None:
+        return await self._process_response(track, query, path, path_obj)
+
+    async def _process_modified(self, path: str, path_obj: pathlib.Path, modified: bool = True) -> str | None:
         if self.__shutdown:
             return
         query = await Query.from_string(path_obj)
@@ -189,17 +234,25 @@ class LocalTrackCache:
             await self._add_to_query_cache(query, path)
             return
         track = await self.__pylav.search_query(query, bypass_cache=modified, sleep=True)
-        if track.loadType in {"track", "playlist", "search"}:
-            await self._add_to_query_cache(query, path)
-            match track.loadType:
-                case "track":
-                    await self._add_to_track_cache(track.data, path_obj)
-                case "playlist":
-                    for track in track.data.tracks:
-                        await self._add_to_track_cache(track, path_obj)
-                case "search":
-                    for track in track.data:
-                        await self._add_to_track_cache(track, path_obj)
+        return await self._process_response(track, query, path, path_obj)
+
+    async def _process_response(
+        self, response: rest_api.LoadTrackResponses, query: Query, path: str, path_obj: pathlib.Path
+    ) -> str | None:
+        if response.loadType not in {"track", "playlist", "search"}:
+            return None
+        await self._add_to_query_cache(query, path)
+        match response.loadType:
+            case "track":
+                tracks = [response.data]
+            case "playlist":
+                tracks = response.data.tracks
+            case __:
+                tracks = response.data
+        for track in tracks:
+            await self._add_to_track_cache(track, path_obj)
+        # Every track is cached under the same path, so the last one is the one served for it
+        return tracks[-1].encoded if tracks else None
 
     async def _process_deleted(self, path: str, path_obj: pathlib.Path) -> None:
         if self.__shutdown:
@@ -209,22 +262,58 @@ class LocalTrackCache:
         await self._remove_from_track_cache(path_obj)
 
     async def update(self) -> None:
-        """Update the local track cache."""
+        """Update the local track cache.
+
+        Files whose size and modification time match the persisted index are restored from it, only new and
+        changed files are probed by the node.
+        """
         if self.__shutdown:
             return
         await self.__pylav.wait_until_ready()
         chunk_size = min(POSTGRES_CONNECTIONS, 50)
         LOGGER.debug("Updating cache")
         start = utcnow()
-        chunk = []
-        for entry in self.__root_folder.rglob("*"):
-            if (not entry.is_dir()) and entry.suffix.lower() not in ALL_EXTENSIONS:
+        index = await self.__index.fetch_index()
+        files, folders = await asyncio.to_thread(_scan, self.__root_folder)
+        for folder in folders:
+            await self._add_to_query_cache(await Query.from_string(pathlib.Path(folder)), folder)
+
+        unchanged = {
+            path: entry
+            for path, stat in files.items()
+            if (entry := index.get(path)) is not None and (entry.size, entry.mtime) == stat
+        }
+        restorable = list(unchanged.values())
+        for entry, track in zip(restorable, await decode_tracks_local([entry.encoded for entry in restorable])):
+            if track is None:
+                # Could not be decoded locally, probe it again
+                del unchanged[entry.path]
                 continue
-            chunk.append(entry)
-            if len(chunk) == chunk_size:
-                await asyncio.gather(*[self._process_added(f"{entry}", entry) for entry in chunk])
-                chunk = []
-        if chunk:
-            await asyncio.gather(*[self._process_added(f"{entry}", entry) for entry in chunk])
-
-        LOGGER.debug("Finished updating cache in %s", utcnow() - start)
+            path_obj = pathlib.Path(entry.path)
+            await self._add_to_query_cache(await Query.from_string(path_obj), entry.path)
+            await self._add_to_track_cache(track, path_obj)
+
+        to_probe = [path for path in files if path not in unchanged]
+        removed: set[str] = set()
+        for i in range(0, len(to_probe), chunk_size):
+            chunk = to_probe[i : i + chunk_size]
+            encoded = await asyncio.gather(
+                *[self._process_added(path, pathlib.Path(path), modified=path in index) for path in chunk]
+            )
+            if self.__shutdown:
+                return
+            # Files that failed to load are left out of the index so that they are probed again next time
+            await self.__index.save_many(
+                [LocalTrackEntry(path, *files[path], e) for path, e in zip(chunk, encoded) if e]
+            )
+            removed.update(path for path, e in zip(chunk, encoded) if not e and path in index)
+        removed.update(index.keys() - files.keys())
+        if removed:
+            await self.__index.delete_many(removed)
+
+        LOGGER.debug(
+            "Finished updating cache in %s, %s files restored from the index and %s probed",
+            utcnow() - start,
+            len(unchanged),
+            len(to_probe),
+        )